@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import io
 import sys
 import os
@@ -267,21 +266,26 @@ hr { border-color: rgba(255,255,255,0.07) !important; }
 
 # ── Imports ──────────────────────────────────────────────────────────────────
 try:
-    from src.lexer import tokenize
+    from src.lexer import TokenTable
+    from src.incremental_lexer import IncrementalLexer
     from src.myparser import parser
     from src.semantic_analyzer import semantic_analysis
     from src.icg_generator import generate_icg
     from src.interpreter import Interpreter
+    from src.limits import Limits
     from src.utils import ASTVisualizer
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.stop()
 
+# Budgets of each run of a user's program, which runs inside the script:
+# a program that never ends would hold up every other session
+EXEC_LIMITS = dict(steps=2_000_000, seconds=5, output_bytes=1_000_000, allocation=10_000_000)
+
 # ── Complexity Analyzer ───────────────────────────────────────────────────────
 def analyze_complexity(tokens):
     """Estimate Big-O Time and Space complexity from token stream."""
     loop_kws   = {"FOR", "WHILE"}
-    types      = [t['type'] for t in tokens]
     
     # Time Complexity calculation
     max_depth  = 0
@@ -290,17 +294,17 @@ def analyze_complexity(tokens):
     func_names = []
 
     for i, t in enumerate(tokens):
-        if t['type'] == 'DEF' and i+1 < len(tokens):
-            func_names.append(tokens[i+1]['value'])
+        if t.type == 'DEF' and i+1 < len(tokens):
+            func_names.append(tokens[i+1].value)
 
     for i, t in enumerate(tokens):
-        if t['type'] in loop_kws:
+        if t.type in loop_kws:
             depth += 1
             max_depth = max(max_depth, depth)
-        elif t['type'] == 'DEDENT':
+        elif t.type == 'DEDENT':
             depth = max(0, depth - 1)
-        if t['type'] == 'IDENTIFIER' and t['value'] in func_names:
-            if i+1 < len(tokens) and tokens[i+1]['type'] == 'LPAREN':
+        if t.type == 'IDENTIFIER' and t.value in func_names:
+            if i+1 < len(tokens) and tokens[i+1].type == 'LPAREN':
                 has_recur = True
 
     if has_recur and max_depth == 0:
@@ -317,7 +321,7 @@ def analyze_complexity(tokens):
         time_o = f"O(n^{max_depth})"; time_d = f"{max_depth} nested loops — high complexity"
 
     # Space Complexity calculation
-    has_lists = 'LBRACKET' in types
+    has_lists = 'LBRACKET' in tokens.type_counts()
     
     if has_recur:
         space_o = "O(n)"
@@ -338,10 +342,12 @@ def analyze_complexity(tokens):
 def run_compiler_pipeline(code):
     results = {}
     try:
-        results['tokens'] = tokenize(code)
+        # Reruns re-lex only the lines changed since the previous run
+        lexer_state = st.session_state.setdefault('incremental_lexer', IncrementalLexer())
+        results['tokens'] = lexer_state.update(code)
         results['lexer_error'] = None
     except Exception as e:
-        results['tokens'] = []
+        results['tokens'] = TokenTable(code)
         results['lexer_error'] = str(e)
         return results
 
@@ -373,8 +379,9 @@ def run_compiler_pipeline(code):
 
     try:
         buf = io.StringIO()
-        interp = Interpreter(output_buffer=buf)
-        interp.execute(code)
+        interp = Interpreter(output_buffer=buf, limits=Limits(**EXEC_LIMITS))
+        # Reuse the AST parsed above instead of parsing the source again
+        interp.run(results['ast'])
         results['exec_output'] = buf.getvalue()
         results['exec_error'] = None
     except Exception as e:
@@ -389,13 +396,13 @@ KEYWORDS = {"IF","ELSE","WHILE","FOR","IN","DEF","RETURN","BREAK","CONTINUE",
 OPERATORS = {"PLUS","MINUS","TIMES","DIVIDE","MODULO","EQUALS","GT","LT","GE","LE","EQ","NE"}
 
 def compute_stats(tokens, code):
-    types = [t['type'] for t in tokens]
+    counts = tokens.type_counts()
     return {
         "total":       len(tokens),
-        "keywords":    sum(1 for t in types if t in KEYWORDS),
-        "identifiers": sum(1 for t in types if t == "IDENTIFIER"),
-        "operators":   sum(1 for t in types if t in OPERATORS),
-        "literals":    sum(1 for t in types if t in ("NUMBER","STRING")),
+        "keywords":    sum(counts.get(t, 0) for t in KEYWORDS),
+        "identifiers": counts.get("IDENTIFIER", 0),
+        "operators":   sum(counts.get(t, 0) for t in OPERATORS),
+        "literals":    counts.get("NUMBER", 0) + counts.get("STRING", 0),
         "lines":       len([l for l in code.splitlines() if l.strip()]),
     }
 
@@ -483,8 +490,7 @@ def main():
             if r.get('icg_output'):
                 st.download_button("⬇ ICG (.txt)", r['icg_output'], "icg.txt", "text/plain", use_container_width=True)
             if r.get('tokens'):
-                df = pd.DataFrame(r['tokens'])
-                st.download_button("⬇ Tokens (.csv)", df.to_csv(index=False).encode(), "tokens.csv", "text/csv", use_container_width=True)
+                st.download_button("⬇ Tokens (.csv)", r['tokens'].to_csv().encode(), "tokens.csv", "text/csv", use_container_width=True)
             if r.get('exec_output'):
                 st.download_button("⬇ Output (.txt)", r['exec_output'], "output.txt", "text/plain", use_container_width=True)
 
@@ -583,9 +589,9 @@ def main():
                 if results.get('lexer_error'):
                     st.error(f"Lexical Error: {results['lexer_error']}")
                 elif results.get('tokens'):
-                    df = pd.DataFrame(results['tokens'])
+                    df = results['tokens'].to_frame()
                     st.dataframe(df, use_container_width=True, height=380)
-                    csv = df.to_csv(index=False).encode()
+                    csv = results['tokens'].to_csv().encode()
                     st.download_button("📥 Download CSV", csv, "tokens.csv", "text/csv")
                 else:
                     st.info("No tokens produced.")
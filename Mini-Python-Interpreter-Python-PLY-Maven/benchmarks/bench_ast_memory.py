@@ -0,0 +1,108 @@
+"""Measure the memory held by the AST of a 100K-line program with tracemalloc.
+
+"before" builds the tree from plain __dict__ classes with the same fields,
+as the node classes were defined before they used __slots__; "after" uses
+src.ast_nodes. Both trees come from the same parser.
+Run from the project root:
+    python benchmarks/bench_ast_memory.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import ast_nodes, myparser
+from src.lexer import lexer
+
+LINES = 100000
+
+
+def legacy_class(cls):
+    """A __dict__ based class with the fields of a node class."""
+    fields = cls._fields
+
+    def __init__(self, *args):
+        for name, value in zip(fields, args):
+            setattr(self, name, value)
+        for name in fields[len(args):]:
+            setattr(self, name, None)
+    return type(cls.__name__, (), {'__init__': __init__})
+
+
+def node_classes():
+    return [cls for cls in vars(ast_nodes).values()
+            if isinstance(cls, type) and issubclass(cls, ast_nodes.Node) and cls._fields]
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = a * {i} + b",
+            "    if x > 10 and not b:",
+            "        return x % 7",
+            "    return [a, b, len(\"abc\")][0]",
+            f"total = f{i}(total, {i}) - 1",
+            f"for k in range({i % 5}):",
+            "    print(k, label.upper())",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def measure(code):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    ast = myparser._parser.parse(code, lexer=lexer)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ast, size, elapsed
+
+
+def count_nodes(ast):
+    count = 0
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif hasattr(node, '__dict__') or isinstance(node, ast_nodes.Node):
+            count += 1
+            fields = node._fields if isinstance(node, ast_nodes.Node) else vars(node)
+            stack.extend(getattr(node, name) for name in fields)
+    return count
+
+
+def main():
+    code = make_program(LINES)
+    classes = node_classes()
+    saved = {cls.__name__: cls for cls in classes}
+
+    for cls in classes:
+        setattr(myparser, cls.__name__, legacy_class(cls))
+    try:
+        ast, before, _ = measure(code)
+        nodes = count_nodes(ast)
+        del ast
+    finally:
+        for name, cls in saved.items():
+            setattr(myparser, name, cls)
+    ast, after, _ = measure(code)
+    assert count_nodes(ast) == nodes
+
+    print(f"AST of {LINES} lines, {nodes} nodes")
+    print(f"  before (__dict__): {before / 2**20:8.1f} MiB  {before / nodes:6.1f} bytes/node")
+    print(f"  after (__slots__): {after / 2**20:8.1f} MiB  {after / nodes:6.1f} bytes/node")
+    print(f"  saved: {(1 - after / before) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Measure function call cost of the tree-walker's slot-indexed frames.
+
+The baseline is the previous calling convention, which copied the whole
+environment into a fresh dict on every call. Run from the project root:
+    python benchmarks/bench_calls.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.ast_nodes import FunctionDef
+from src.interpreter import Interpreter
+from src.myparser import parser
+
+
+class DictScopeInterpreter(Interpreter):
+    """Tree-walker with the old dict-copying function calls."""
+    def evaluate_Identifier(self, node):
+        if node.name in self.environment:
+            return self.environment[node.name]
+        elif node.name in self.functions:
+            return self.functions[node.name]
+        raise Exception(f"Undefined variable or function: {node.name}")
+
+    def _store(self, target, value):
+        self.environment[target.name] = value
+
+    def evaluate_FunctionCall(self, node):
+        func_name = node.name.name
+        func = self.functions[func_name]
+        if not isinstance(func, FunctionDef):
+            raise Exception(f"{func_name} is not a function")
+        args = [self.evaluate(arg) for arg in node.args]
+        old_env = self.environment.copy()
+        self.environment = {}
+        for param, arg in zip(func.params, args):
+            self.environment[param.name] = arg
+        old_return = self.return_value
+        self.return_value = None
+        self.evaluate(func.body)
+        result = self.return_value
+        self.return_value = old_return
+        self.environment = old_env
+        return result
+
+
+GLOBALS = "".join(f"g{i} = {i}\n" for i in range(1000))
+
+WORKLOADS = {
+    "deep recursion (depth 800)": """
+def depth(n):
+    if n == 0:
+        return 0
+    return 1 + depth(n - 1)
+print(depth(800))
+""",
+    "call loop, 1000 globals": GLOBALS + """
+def add(a, b):
+    return a + b
+total = 0
+for i in range(5000):
+    total = add(total, i)
+print(total)
+""",
+    "recursive fib(16)": GLOBALS + """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(16))
+""",
+}
+
+
+def best_time(cls, ast, repeat=3):
+    best = float("inf")
+    output = None
+    for _ in range(repeat):
+        buf = io.StringIO()
+        interp = cls(output_buffer=buf)
+        start = time.perf_counter()
+        interp.interpret(ast)
+        best = min(best, time.perf_counter() - start)
+        output = buf.getvalue()
+    return best, output
+
+
+def main():
+    sys.setrecursionlimit(20000)
+    print(f"{'workload':<28}{'dict copy':>12}{'slots':>12}{'speedup':>10}")
+    print("-" * 62)
+    for name, code in WORKLOADS.items():
+        ast = parser.parse(code)
+        old, old_out = best_time(DictScopeInterpreter, ast)
+        new, new_out = best_time(Interpreter, ast)
+        assert old_out == new_out, name
+        print(f"{name:<28}{old * 1000:>10.1f}ms{new * 1000:>10.1f}ms{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare the execution engines on the samples and on loop-heavy workloads.
+
+Run from the project root:  python benchmarks/bench_engines.py
+"""
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.interpreter import Interpreter
+
+ENGINES = ["tree", "vm", "closure", "native"]
+
+SAMPLE_FILES = sorted(glob.glob(os.path.join(ROOT, "samples", "*.py"))) + [
+    os.path.join(ROOT, name)
+    for name in ("example.py", "simple_example.py", "hello.py", "input.py")
+]
+
+WORKLOADS = {
+    "nested loops": """
+total = 0
+for i in range(300):
+    for j in range(100):
+        total = total + i * j % 7
+print(total)
+""",
+    "list iteration": """
+numbers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+count = 0
+sum = 0
+while count < 3000:
+    for n in numbers:
+        sum = sum + n
+    count = count + 1
+print(sum)
+""",
+    "recursion": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(18))
+""",
+    "factorial": """
+def factorial(n):
+    if n <= 1:
+        return 1
+    else:
+        return n * factorial(n - 1)
+k = 0
+while k < 400:
+    f = factorial(25)
+    k = k + 1
+print(f)
+""",
+}
+
+
+def run(code, engine):
+    buf = io.StringIO()
+    try:
+        Interpreter(output_buffer=buf).execute(code, engine=engine)
+    except Exception as e:
+        buf.write(f"Error: {e}\n")
+    return buf.getvalue()
+
+
+def best_time(code, engine, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(code, engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_samples():
+    print("Output parity on samples")
+    ok = True
+    for path in SAMPLE_FILES:
+        with open(path) as f:
+            code = f.read()
+        expected = run(code, "tree")
+        for engine in ENGINES[1:]:
+            same = run(code, engine) == expected
+            ok = ok and same
+            print(f"  {os.path.relpath(path, ROOT):<24} {engine:<8} {'ok' if same else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    ok = check_samples()
+    print()
+    header = f"{'workload':<16}" + "".join(f"{engine:>12}" for engine in ENGINES)
+    print(header + "   speedup vs tree")
+    print("-" * (len(header) + 18))
+    for name, code in WORKLOADS.items():
+        times = {engine: best_time(code, engine) for engine in ENGINES}
+        row = f"{name:<16}" + "".join(f"{times[e] * 1000:>10.1f}ms" for e in ENGINES)
+        speedups = ", ".join(f"{e} {times['tree'] / times[e]:.1f}x" for e in ENGINES[1:])
+        print(f"{row}   {speedups}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Compare the throughput of the PLY lexer and the hand-written FastLexer.
+
+Both produce the same token stream, INDENT and DEDENT included. Figures
+are tokens per second over a generated program, best of a few runs, for
+the lexer alone and for a full parse through each.
+Run from the project root:
+    python benchmarks/bench_fastlexer.py
+"""
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.fastlexer import FastLexer
+from src.lexer import IndentLexer, outer_lexer
+from src.myparser import _parser
+
+LINES = 50000
+RUNS = 3
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = a * {i} + b  # scale",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    return x % 7",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def drain(lexer, code):
+    lexer.input(code)
+    token = lexer.token
+    count = 0
+    while token():
+        count += 1
+    return count
+
+
+def best(func):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    code = make_program(LINES)
+    count = drain(FastLexer(), code)
+    assert count == drain(IndentLexer(outer_lexer.clone()), code)
+    print(f"{LINES} lines, {count} tokens")
+    with redirect_stdout(io.StringIO()):
+        results = {
+            "PLY lex": best(lambda: drain(IndentLexer(outer_lexer.clone()), code)),
+            "FastLexer": best(lambda: drain(FastLexer(), code)),
+            "parse, PLY lex": best(lambda: _parser.parse(code, lexer=IndentLexer(outer_lexer.clone()))),
+            "parse, FastLexer": best(lambda: _parser.parse(code, lexer=FastLexer())),
+        }
+    for name, seconds in results.items():
+        print(f"  {name:<18} {count / seconds / 1e6:6.2f} M tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measure what hash-consing saves in AST memory, and what it costs.
+
+Each program is parsed as usual and with CustomParser(hash_cons=True).
+Memory is the size estimate the parser's cache charges for a tree, node
+counts are of distinct nodes. The time of the sharing pass is shown next
+to the parse time, and the time of taking the structural hash of every
+node of the plain tree next to that.
+Run from the project root:
+    python benchmarks/bench_hashcons.py
+"""
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.ast_nodes import iter_child_nodes, structural_hash
+from src.hashcons import share_subtrees
+from src.myparser import CustomParser, estimate_size
+
+SIZES = [1000, 10000]
+RUNS = 3
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = (a * {i} + b) % 7",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    for k in range(x):",
+            "        x = x - len(\"abc\")",
+            "    return x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def count_nodes(ast):
+    seen = set()
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(iter_child_nodes(node))
+    return len(seen)
+
+
+def best(func):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    programs = [(os.path.basename(path), open(path).read())
+                for path in sorted(glob.glob(os.path.join(ROOT, "samples", "*.py")))
+                + [os.path.join(ROOT, "example.py")]]
+    programs += [(f"{n} lines", make_program(n)) for n in SIZES]
+    parser = CustomParser(cache_size=0)
+    print(f"{'program':>16} {'nodes':>8} {'shared':>8} {'memory':>10} {'shared':>10} {'saved':>6}"
+          f" {'parse':>9} {'share':>9} {'hash':>9}")
+    for name, code in programs:
+        plain = parser.parse(code)
+        shared = share_subtrees(parser.parse(code))
+        parse_time = best(lambda: parser.parse(code))
+        share_time = best(lambda: share_subtrees(parser.parse(code))) - parse_time
+
+        def hash_all():
+            for statement in parser.parse(code):
+                structural_hash(statement)
+        hash_time = best(hash_all) - parse_time
+        before, after = estimate_size(plain), estimate_size(shared)
+        print(f"{name:>16} {count_nodes(plain):>8} {count_nodes(shared):>8} {before:>9}B {after:>9}B"
+              f" {(1 - after / before) * 100:>5.0f}% {parse_time * 1000:>7.1f}ms"
+              f" {share_time * 1000:>7.1f}ms {hash_time * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
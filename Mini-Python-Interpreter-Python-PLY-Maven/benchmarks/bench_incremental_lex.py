@@ -0,0 +1,79 @@
+"""Time single-character edits in a 10K-line file, full vs incremental lexing.
+
+Each edit types or deletes one character at a random position, as an
+editor rerun would see it. "full" lexes the whole new buffer into a
+TokenTable; "incremental" passes it to IncrementalLexer.update, which
+diffs against the previous buffer. Figures are medians over the edits.
+Run from the project root:
+    python benchmarks/bench_incremental_lex.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.incremental_lexer import IncrementalLexer
+from src.lexer import TokenTable
+
+LINES = 10000
+EDITS = 50
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = a * {i} + b  # scale",
+            "    if x > 10:",
+            "        return [x, \"done\"][0]",
+            "    return x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def edits(code, count, rng):
+    """Yield successive buffers, each one character away from the last."""
+    for _ in range(count):
+        pos = rng.randrange(len(code))
+        if rng.random() < 0.5:
+            code = code[:pos] + rng.choice("abc1 +(") + code[pos:]
+        else:
+            code = code[:pos] + code[pos + 1:]
+        yield code
+
+
+def main():
+    code = make_program(LINES)
+    buffers = list(edits(code, EDITS, random.Random(42)))
+
+    full = []
+    for buf in buffers:
+        start = time.perf_counter()
+        TokenTable.from_source(buf)
+        full.append(time.perf_counter() - start)
+
+    lexer = IncrementalLexer(code)
+    incremental, relexed = [], []
+    for buf in buffers:
+        start = time.perf_counter()
+        lexer.update(buf)
+        incremental.append(time.perf_counter() - start)
+        relexed.append(lexer.last_relexed)
+
+    tokens = len(lexer.table)
+    print(f"{LINES} lines, {tokens} tokens, {EDITS} single-character edits")
+    print(f"  full:        {statistics.median(full) * 1000:8.2f} ms")
+    print(f"  incremental: {statistics.median(incremental) * 1000:8.2f} ms"
+          f"  (median {statistics.median(relexed):.0f} tokens re-lexed)")
+    print(f"  speedup: {statistics.median(full) / statistics.median(incremental):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Measure the tree-walker's inline caches on function calls.
+
+The baseline is the previous lookup, which found the callee by name and
+checked it on every call. Each workload runs on the generic and on the
+adaptive tree-walker; the lookups left are a larger share of the time
+once the operator sites are quickened. The lookup is a few hundred
+nanoseconds of a call, so the per-call table times single calls of
+functions that do little else, in paired batches (see per_call).
+
+Run from the project root:
+    python benchmarks/bench_inline_cache.py
+"""
+import io
+import os
+import statistics
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.ast_nodes import FunctionCall, FunctionDef
+from src.interpreter import _UNBOUND, Interpreter
+from src.myparser import CustomParser
+from src.optimizer import clone
+from src.resolver import resolve_function
+from src.visitor import walk
+
+RUNS = 15
+
+
+class UncachedInterpreter(Interpreter):
+    """Tree-walker that looks every callee up by name."""
+    def evaluate_Identifier(self, node):
+        if node.slot is not None:
+            value = self.frame[node.slot]
+            if value is not _UNBOUND:
+                return value
+        elif node.name in self.environment:
+            return self.environment[node.name]
+        if node.name in self.functions:
+            return self.functions[node.name]
+        raise Exception(f"Undefined variable or function: {node.name}")
+
+    def evaluate_FunctionCall(self, node):
+        func_name = node.name.name if hasattr(node.name, 'name') else node.name
+        if func_name not in self.functions:
+            raise Exception(f"Undefined function: {func_name}")
+        func = self.functions[func_name]
+        if not isinstance(func, FunctionDef):
+            raise Exception(f"{func_name} is not a function")
+        args = [self.evaluate(arg) for arg in node.args]
+        frame_size = len(func.varnames or resolve_function(func))
+        del args[len(func.params):]
+        if frame_size > len(args):
+            args.extend([_UNBOUND] * (frame_size - len(args)))
+        self.frame_stack.append(self.frame)
+        self.frame = args
+        old_return = self.return_value
+        self.return_value = None
+        try:
+            self.evaluate(func.body)
+            result = self.return_value
+        finally:
+            self.return_value = old_return
+            self.frame = self.frame_stack.pop()
+        return result
+
+
+WORKLOADS = {
+    "recursive fib(18)": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(18))
+""",
+    "call loop": """
+def add(a, b):
+    return a + b
+def twice(x):
+    return add(x, x)
+total = 0
+for i in range(10000):
+    total = add(total, twice(i))
+print(total)
+""",
+    "mutual recursion": """
+def even(n):
+    if n == 0:
+        return True
+    return odd(n - 1)
+def odd(n):
+    if n == 0:
+        return False
+    return even(n - 1)
+hits = 0
+for i in range(300):
+    if even(i % 40):
+        hits = hits + 1
+print(hits)
+""",
+}
+
+# Programs ending in the call that is timed
+CALLS = {
+    "f()": "def f():\n    return 0\nf()\n",
+    "add(1, 2)": "def add(a, b):\n    return a + b\nadd(1, 2)\n",
+}
+BATCHES = 400
+CALLS_PER_BATCH = 2000
+
+
+def run(cls, ast, adaptive):
+    buf = io.StringIO()
+    cls(output_buffer=buf, adaptive=adaptive).run(clone(ast), "tree")
+    return buf.getvalue()
+
+
+def best(ast, adaptive):
+    """Best times of the uncached and the cached tree-walker.
+
+    Their runs alternate, so that drift in the machine's speed falls on both.
+    """
+    times = {UncachedInterpreter: [], Interpreter: []}
+    for _ in range(RUNS):
+        for cls, runs in times.items():
+            start = time.perf_counter()
+            run(cls, ast, adaptive)
+            runs.append(time.perf_counter() - start)
+    return min(times[UncachedInterpreter]), min(times[Interpreter])
+
+
+def per_call(code):
+    """ns per call of the last call in code: uncached, cached and saved.
+
+    Short batches of the two alternate and the medians are taken, the
+    saving as the median of the differences of paired batches, so that
+    drift in the machine's speed cancels out.
+    """
+    ast = CustomParser().parse(code)
+    timers = []
+    for cls in (UncachedInterpreter, Interpreter):
+        interpreter = cls(output_buffer=io.StringIO())
+        program = clone(ast)
+        interpreter.run(program, "tree")
+        call = [node for node in walk(program) if isinstance(node, FunctionCall)][-1]
+        timers.append(timeit.Timer(lambda interpreter=interpreter, call=call: interpreter.evaluate(call)))
+    old, new = [], []
+    for _ in range(BATCHES):
+        old.append(timers[0].timeit(CALLS_PER_BATCH) / CALLS_PER_BATCH)
+        new.append(timers[1].timeit(CALLS_PER_BATCH) / CALLS_PER_BATCH)
+    saved = statistics.median(a - b for a, b in zip(old, new))
+    return statistics.median(old), statistics.median(new), saved
+
+
+def main():
+    parser = CustomParser()
+    ok = True
+    print(f"{'workload':<20} {'mode':<9} {'uncached':>9} {'cached':>9} {'speedup':>8}")
+    for name, code in WORKLOADS.items():
+        ast = parser.parse(code)
+        for adaptive in (False, True):
+            same = run(UncachedInterpreter, ast, adaptive) == run(Interpreter, ast, adaptive)
+            ok = ok and same
+            old, new = best(ast, adaptive)
+            mode = "adaptive" if adaptive else "generic"
+            print(f"{name:<20} {mode:<9} {old * 1000:>7.1f}ms {new * 1000:>7.1f}ms {old / new:>7.2f}x"
+                  f"{'' if same else '  MISMATCH'}")
+    print()
+    print(f"{'call':<20} {'uncached':>9} {'cached':>9} {'saved':>8}")
+    for name, code in CALLS.items():
+        old, new, saved = per_call(code)
+        print(f"{name:<20} {old * 1e9:>7.0f}ns {new * 1e9:>7.0f}ns {saved * 1e9:>6.0f}ns")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Measure what resource limits cost the tree-walker when they are generous.
+
+Each workload runs with no limits and with budgets it stays well inside,
+so the difference is the cost of the checks alone: a step on every loop
+iteration and call, the clock every few hundred steps, as there is an
+allocation budget, and the charges of string, list and int building. Runs of the two alternate and the overhead
+is the median of the ratios of paired runs, so that drift in the
+machine's speed cancels out. Limits also shadow the generic evaluate of
+operators with a table lookup, which can come out faster than the
+generic chain of operator tests.
+
+Run from the project root:
+    python benchmarks/bench_limits.py
+"""
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.interpreter import Interpreter
+from src.limits import Limits
+from src.myparser import CustomParser
+
+RUNS = 15
+GENEROUS = dict(steps=10 ** 8, seconds=600, output_bytes=10 ** 8, allocation=10 ** 9)
+
+WORKLOADS = {
+    "loop arithmetic": """
+total = 0
+i = 0
+while i < 30000:
+    total = total + ((i * 3) % 7) - (i % 5)
+    i = i + 1
+print(total)
+""",
+    "recursion": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(18))
+""",
+    "string building": """
+s = ""
+for i in range(5000):
+    s = s + "ab"
+    t = s.upper()
+print(len(s), len(t))
+""",
+    "list building": """
+xs = []
+for i in range(3000):
+    xs = xs + [i, i * 2]
+print(len(xs))
+""",
+    "printing": """
+for i in range(5000):
+    print("line", i)
+""",
+}
+
+
+def run(ast, limits):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, limits=Limits(**limits) if limits else None)
+    interpreter.run(ast, "tree")
+    return buf.getvalue()
+
+
+def measure(ast):
+    """Best times without and with generous limits, and the overhead."""
+    times = ([], [])
+    for _ in range(RUNS):
+        for limits, runs in zip((None, GENEROUS), times):
+            start = time.perf_counter()
+            run(ast, limits)
+            runs.append(time.perf_counter() - start)
+    overhead = statistics.median(limited / plain for plain, limited in zip(*times)) - 1
+    return min(times[0]), min(times[1]), overhead
+
+
+def main():
+    parser = CustomParser()
+    ok = True
+    print(f"{'workload':<16} {'no limits':>10} {'limits':>9} {'overhead':>9}")
+    for name, code in WORKLOADS.items():
+        ast = parser.parse(code)
+        same = run(ast, None) == run(ast, GENEROUS)
+        ok = ok and same
+        plain, limited, overhead = measure(ast)
+        print(f"{name:<16} {plain * 1000:>8.1f}ms {limited * 1000:>7.1f}ms {overhead:>8.1%}"
+              f"{'' if same else '  MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Compare the tree-walker with and without memoization of pure functions.
+
+Each recursion runs for growing n: the calls of the plain tree-walker grow
+exponentially with n, those of the memoized one, the misses of its memo
+tables, linearly. Every run is on a fresh Interpreter, so its tables start
+empty.
+
+Run from the project root:
+    python benchmarks/bench_memo.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+
+RUNS = 3
+
+RECURSIONS = {
+    "fib": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib({n}))
+""",
+    "stairs": """
+def ways(n):
+    if n < 0:
+        return 0
+    if n == 0:
+        return 1
+    return ways(n - 1) + ways(n - 2) + ways(n - 3)
+print(ways({n}))
+""",
+    "binomial": """
+def choose(n, k):
+    if (k == 0) or (k == n):
+        return 1
+    return choose(n - 1, k - 1) + choose(n - 1, k)
+print(choose({n}, {half}))
+""",
+}
+SIZES = {"fib": [10, 14, 18, 22], "stairs": [7, 10, 13, 16], "binomial": [8, 11, 14, 17]}
+
+
+def run(ast, memoize):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, memoize=memoize)
+    interpreter.run(ast, "tree")
+    return buf.getvalue(), interpreter.memo
+
+
+def best(ast, memoize):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        run(ast, memoize)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = CustomParser()
+    ok = True
+    print(f"{'recursion':<10} {'n':>3} {'plain':>10} {'memoized':>9} {'speedup':>9} {'calls':>6} {'hit rate':>9}")
+    for name, template in RECURSIONS.items():
+        for n in SIZES[name]:
+            ast = parser.parse(template.replace("{n}", str(n)).replace("{half}", str(n // 2)))
+            expected, _ = run(ast, False)
+            output, memo = run(ast, True)
+            same = output == expected
+            ok = ok and same
+            plain, memoized = best(ast, False), best(ast, True)
+            print(f"{name:<10} {n:>3} {plain * 1000:>8.1f}ms {memoized * 1000:>7.2f}ms {plain / memoized:>8.1f}x "
+                  f"{memo.misses:>6} {memo.hit_rate:>8.1%}{'' if same else '  MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Compare a cold parse with a warm load from the .mpyc cache.
+
+Cold is what a fresh process does without a cache: lex, parse with the
+LALR parser and compile to VM bytecode. Warm is MpycCache.load of the
+entry a cold run stored: one read of the file and a decode of the tree
+and the code objects. Each run uses a fresh parser so its memory cache
+does not hide the work. Figures are the best of a few runs for the
+samples/ scripts and for generated programs of several sizes, with the
+size of the entry next to the size of the source.
+Run from the project root:
+    python benchmarks/bench_mpyc.py
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.compiler import Compiler
+from src.mpyc import MpycCache, source_key
+from src.myparser import CustomParser
+
+SIZES = [100, 1000, 10000]
+RUNS = 5
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = (a * {i} + b) % 7",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    for k in range(x):",
+            "        x = x - len(\"abc\")",
+            "    return x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def best(func):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def cold(code):
+    Compiler().compile_module(CustomParser(cache_size=0).parse(code))
+
+
+def main():
+    programs = [(os.path.basename(path), open(path).read())
+                for path in sorted(glob.glob(os.path.join(ROOT, "samples", "*.py")))]
+    programs += [(f"{n} lines", make_program(n)) for n in SIZES]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = MpycCache(directory)
+        print(f"{'program':>18} {'source':>9} {'entry':>9} {'cold':>10} {'warm':>10} {'speedup':>8}")
+        for name, code in programs:
+            CustomParser(cache_size=0, disk_cache=cache).parse(code)
+            entry = os.path.getsize(cache.path(source_key(code)))
+            cold_time = best(lambda: cold(code))
+            warm_time = best(lambda: cache.load(code))
+            print(f"{name:>18} {len(code):>8}B {entry:>8}B {cold_time * 1000:>8.2f}ms"
+                  f" {warm_time * 1000:>8.2f}ms {cold_time / warm_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare running programs as written and as src/optimizer.py rewrites them.
+
+Each workload is parsed once and optimized once; the times are the best
+of a few runs of the parsed tree on each engine, so they leave out the
+parse and the optimize time, which is shown on its own.
+
+Run from the project root:
+    python benchmarks/bench_optimizer.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from src.optimizer import optimize
+
+ENGINES = ["tree", "vm", "closure", "native"]
+RUNS = 5
+
+WORKLOADS = {
+    "constants": """
+width = 64
+height = 48
+area = width * height
+total = 0
+for i in range(20000):
+    total = total + ((area % 7) * (width - height)) + i
+print(total)
+""",
+    "invariants": """
+words = []
+for i in range(50):
+    words = words + [i]
+n = len(words)
+t = "  Some Text  "
+total = 0
+k = 0
+while k < 20000:
+    k = k + 1
+    total = total + (n * n) - (n % 4) + len(t.strip()) + len(words + [n]) + (k % 3)
+print(total)
+""",
+    "dead code": """
+def step(x):
+    debug = False
+    level = 2
+    trace = x * 3
+    if debug:
+        print(trace)
+    scaled = x * level
+    return scaled + 1
+total = 0
+for i in range(10000):
+    if total < 0:
+        print("negative", i)
+    total = total + step(i)
+print(total)
+""",
+    "recursion": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(18))
+""",
+}
+
+
+def run(ast, engine):
+    buf = io.StringIO()
+    try:
+        Interpreter(output_buffer=buf).run(ast, engine)
+    except Exception as e:
+        buf.write(f"Error: {e}\n")
+    return buf.getvalue()
+
+
+def best(func, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = CustomParser()
+    ok = True
+    print(f"{'workload':<12} {'engine':<8} {'plain':>9} {'optimized':>10} {'speedup':>8}")
+    for name, code in WORKLOADS.items():
+        ast = parser.parse(code)
+        optimized = optimize(ast)
+        for engine in ENGINES:
+            same = run(ast, engine) == run(optimized, engine)
+            ok = ok and same
+            plain, fast = best(run, ast, engine), best(run, optimized, engine)
+            print(f"{name:<12} {engine:<8} {plain * 1000:>7.1f}ms {fast * 1000:>8.1f}ms "
+                  f"{plain / fast:>7.2f}x{'' if same else '  MISMATCH'}")
+        print(f"{name:<12} {'optimize':<8} {best(optimize, ast) * 1000:>7.2f}ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
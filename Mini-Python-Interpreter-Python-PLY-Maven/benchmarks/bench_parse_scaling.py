@@ -0,0 +1,76 @@
+"""Show that parse time grows linearly with the number of statements.
+
+The baseline parser is built from the same grammar with the old list
+productions, which copied the accumulated list on every reduction.
+Run from the project root:
+    python benchmarks/bench_parse_scaling.py
+"""
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ply import yacc
+
+from src import myparser
+from src.lexer import lexer
+
+SIZES = [1000, 10000, 100000]
+
+
+def p_statements(p):
+    '''statements : statement
+                  | statements statement'''
+    if len(p) == 2:
+        p[0] = [p[1]] if p[1] is not None else []
+    else:
+        p[0] = p[1] + ([p[2]] if p[2] is not None else [])
+
+
+def build_copying_parser():
+    grammar = types.SimpleNamespace(**{
+        name: value for name, value in vars(myparser).items()
+        if name.startswith('p_') or name in ('tokens', 'precedence')
+    })
+    grammar.__file__ = __file__
+    grammar.p_statements = p_statements
+    return yacc.yacc(module=grammar, start='program', write_tables=False, debug=False,
+                     errorlog=yacc.NullLogger())
+
+
+def make_program(n):
+    lines = []
+    for i in range(n):
+        lines.append(f"x{i % 50} = {i} + y * 2" if i % 2 else f"print(x{i % 50}, {i})")
+    return "\n".join(lines) + "\n"
+
+
+def measure(parse, code):
+    start = time.perf_counter()
+    ast = parse(code, lexer=lexer)
+    return time.perf_counter() - start, len(ast)
+
+
+def main():
+    parsers = [("append", myparser._parser), ("copying", build_copying_parser())]
+    print(f"{'statements':>10}" + "".join(f"{name:>14}{'us/stmt':>10}" for name, _ in parsers))
+    print("-" * 58)
+    for n in SIZES:
+        code = make_program(n)
+        row = f"{n:>10}"
+        for name, parser in parsers:
+            if name == "copying" and n > 10000:
+                # Quadratic: 100K statements would spend about a minute copying lists
+                row += f"{'skipped':>14}{'':>10}"
+                continue
+            elapsed, count = measure(parser.parse, code)
+            assert count == n
+            row += f"{elapsed * 1000:>12.1f}ms{elapsed / n * 1e6:>10.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
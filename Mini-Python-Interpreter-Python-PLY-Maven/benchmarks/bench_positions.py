@@ -0,0 +1,100 @@
+"""Measure what recording source positions on AST nodes costs the parser.
+
+Every grammar rule gives its node a span through myparser._locate, or
+_token for a single token. The baseline swaps both for functions that
+return the node untouched, which is the parser as it was before
+positions; PLY's own tracking=True mode, which maintains line and
+position spans on every symbol instead, is shown for comparison. Each
+variant fully parses a generated program through both lexers, with the
+garbage collector off. Runs of the variants alternate and an overhead
+is the median of the ratios of paired runs against the baseline, so
+that drift in the machine's speed cancels out; times are medians.
+
+Run from the project root:
+    python benchmarks/bench_positions.py
+"""
+import gc
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import myparser
+from src.fastlexer import FastLexer
+from src.lexer import IndentLexer, outer_lexer
+
+LINES = 3000
+RUNS = 15
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = (a * {i} + b) % 7",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    return len(\"abc\") - x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def located(parse):
+    return parse()
+
+
+def unlocated(parse, **kwargs):
+    locate, token = myparser._locate, myparser._token
+    myparser._locate = lambda node, p, first, last: node
+    myparser._token = lambda node, p, n: node
+    try:
+        return parse(**kwargs)
+    finally:
+        myparser._locate, myparser._token = locate, token
+
+
+def tracked(parse):
+    return unlocated(parse, tracking=True)
+
+
+def measure(variants, parse):
+    """Median times of the variants, and the overheads of all but the first."""
+    # Positions add no objects for the collector to track, so it is kept
+    # out of the timings, where it would only add noise.
+    times = {variant: [] for variant in variants}
+    for _ in range(RUNS):
+        for variant in variants:
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            variant(parse)
+            times[variant].append(time.perf_counter() - start)
+            gc.enable()
+    baseline = times[variants[0]]
+    medians = [statistics.median(times[variant]) for variant in variants]
+    overheads = [statistics.median(t / b for b, t in zip(baseline, times[variant])) - 1
+                 for variant in variants[1:]]
+    return medians, overheads
+
+
+def main():
+    code = make_program(LINES)
+    print(f"{LINES} lines")
+    print(f"{'lexer':>10} {'no positions':>14} {'positions':>14} {'overhead':>9}"
+          f" {'tracking=True':>14} {'overhead':>9}")
+    for name, make_lexer in (("PLY", lambda: IndentLexer(outer_lexer.clone())), ("FastLexer", FastLexer)):
+        parse = lambda **kwargs: myparser._parser.parse(code, lexer=make_lexer(), **kwargs)
+        (plain, positions, tracking), (overhead, tracking_overhead) = measure(
+            (unlocated, located, tracked), parse)
+        print(f"{name:>10} {plain * 1000:>12.0f}ms {positions * 1000:>12.0f}ms {overhead:>8.1%}"
+              f" {tracking * 1000:>12.0f}ms {tracking_overhead:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare the parse throughput of the PLY LALR parser and the Pratt parser.
+
+Both backends build the same tree, positions included. Figures are lines
+per second of a full parse, best of a few runs, at several program
+sizes. Both read tokens from the FastLexer, so the parsers themselves
+make most of the difference.
+Run from the project root:
+    python benchmarks/bench_pratt.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.fastlexer import FastLexer
+from src.myparser import CompilerContext
+
+SIZES = [100, 1000, 10000, 50000]
+RUNS = 3
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = (a * {i} + b) % 7",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    for k in range(x):",
+            "        x = x - len(\"abc\")",
+            "    return x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def best(func):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    context = CompilerContext(FastLexer)
+    print(f"{'lines':>8} {'lalr lines/s':>14} {'pratt lines/s':>14} {'speedup':>8}")
+    for n in SIZES:
+        code = make_program(n)
+        lalr = best(lambda: context.parse(code))
+        pratt = best(lambda: context.parse(code, backend="pratt"))
+        print(f"{n:>8} {n / lalr:>14,.0f} {n / pratt:>14,.0f} {lalr / pratt:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Compare the tree-walker with and without quickening of operator sites.
+
+Every run is on a fresh copy of the parsed program, so the adaptive
+times include the warm-up of each site. The hit rate is that of the last
+adaptive run, over the runs of sites with guarded handlers.
+
+A second table times guarded handlers of ints, which src/quicken.py
+does not have, against the operator functions that take any types that
+it installs instead, in a loop that runs the operator on ints. Runs of the two alternate and the gain of the guard is
+the median of the ratios of paired runs, so that drift in the machine's
+speed cancels out.
+
+Run from the project root:
+    python benchmarks/bench_quicken.py
+"""
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import quicken
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from src.optimizer import clone
+
+RUNS = 5
+PAIRED_RUNS = 15
+
+WORKLOADS = {
+    "loop arithmetic": """
+total = 0
+i = 0
+while i < 30000:
+    total = total + ((i * 3) % 7) - (i % 5)
+    i = i + 1
+print(total)
+""",
+    "nested loops": """
+total = 0
+for i in range(200):
+    for j in range(100):
+        if (i < j) and not (j == 50):
+            total = total + ((i * j) % 7)
+print(total)
+""",
+    "list indexing": """
+xs = [3, 1, 4, 1, 5, 9, 2, 6]
+s = "abcdefgh"
+hits = 0
+for i in range(20000):
+    if (xs[i % 8] > 3) or (s[i % 8] == "a"):
+        hits = hits + 1
+print(hits)
+""",
+    "recursion": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(18))
+""",
+}
+
+
+def run(ast, adaptive):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, adaptive=adaptive)
+    interpreter.run(clone(ast), "tree")
+    return buf.getvalue(), interpreter.quickener
+
+
+def best(ast, adaptive):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        run(ast, adaptive)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# Guarded handlers of ints, each written out as its own function as those
+# of src/quicken.py are, by (operator, *types)
+GUARDED_INT = {}
+for op in ['+', '-', '*', '%', '<', '>', '<=', '>=', '==', '!=']:
+    check = " and right" if op == '%' else ""
+    namespace = {'MISS': quicken.MISS}
+    exec(f"def handler(left, right):\n"
+         f"    if type(left) is int and type(right) is int{check}:\n"
+         f"        return left {op} right\n"
+         f"    return MISS\n", namespace)
+    GUARDED_INT[(op, int, int)] = namespace['handler']
+namespace = {'MISS': quicken.MISS}
+exec("def handler(operand):\n    if type(operand) is int:\n        return -operand\n    return MISS\n", namespace)
+GUARDED_INT[('-', int)] = namespace['handler']
+
+
+def guard_gain(ast, key):
+    """Median ratio of the times without and with the guarded handler of key."""
+    times = ([], [])
+    try:
+        for _ in range(PAIRED_RUNS):
+            for guarded, runs in zip((False, True), times):
+                if guarded:
+                    quicken.SPECIALIZED[key] = GUARDED_INT[key]
+                else:
+                    quicken.SPECIALIZED.pop(key, None)
+                start = time.perf_counter()
+                run(ast, True)
+                runs.append(time.perf_counter() - start)
+    finally:
+        quicken.SPECIALIZED.pop(key, None)
+    return statistics.median(plain / guarded for plain, guarded in zip(*times)) - 1
+
+
+def operators(parser):
+    print(f"\n{'operator':<10} {'guard gain':>10}")
+    for key in GUARDED_INT:
+        op = key[0]
+        name, expr = (f"int {op} int", f"i {op} 3") if len(key) == 3 else (f"{op}int", f"{op}i")
+        ast = parser.parse(f"x = 0\ni = 0\nwhile i < 20000:\n    x = {expr}\n    i = i + 1\n")
+        print(f"{name:<10} {guard_gain(ast, key):>9.1%}")
+
+
+def main():
+    parser = CustomParser()
+    ok = True
+    print(f"{'workload':<16} {'generic':>9} {'adaptive':>9} {'speedup':>8} {'hit rate':>9} {'sites':>6}")
+    for name, code in WORKLOADS.items():
+        ast = parser.parse(code)
+        expected, _ = run(ast, False)
+        output, quickener = run(ast, True)
+        same = output == expected
+        ok = ok and same
+        generic, adaptive = best(ast, False), best(ast, True)
+        hit_rate = f"{quickener.hit_rate:.1%}" if quickener.guarded_runs else "-"
+        print(f"{name:<16} {generic * 1000:>7.1f}ms {adaptive * 1000:>7.1f}ms {generic / adaptive:>7.2f}x "
+              f"{hit_rate:>9} {sum(quickener.specialized.values()):>6}"
+              f"{'' if same else '  MISMATCH'}")
+    operators(parser)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Deep recursion and per-call overhead of the execution engines.
+
+The "vm" engine keeps Mini-Python frames on its own stack, so its depth is
+limited by the interpreter's stack budget rather than Python's recursion
+limit. Run from the project root:  python benchmarks/bench_recursion.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.compiler import compile_program
+from src.interpreter import Interpreter
+from src.myparser import parser
+from src.vm import VirtualMachine
+
+DEPTH = """
+def depth(n):
+    if n == 0:
+        return 0
+    return 1 + depth(n - 1)
+print(depth(N))
+"""
+
+TAIL = """
+def count(n, acc):
+    if n == 0:
+        return acc
+    return count(n - 1, acc + n)
+print(count(N, 0))
+"""
+
+ENGINES = ["tree", "closure", "vm"]
+
+
+def run(code, engine):
+    buf = io.StringIO()
+    Interpreter(output_buffer=buf, engine=engine).execute(code)
+    return buf.getvalue()
+
+
+def max_depth(engine, limit=1 << 20):
+    """Largest power-of-two recursion depth the engine completes."""
+    n = 64
+    while n <= limit:
+        try:
+            run(DEPTH.replace("N", str(n)), engine)
+        except (Exception, RecursionError):
+            return n // 2
+        n *= 2
+    return limit
+
+
+def per_call(engine, n=100, repeat=40):
+    ast = parser.parse(DEPTH.replace("N", str(n)))
+    interp = Interpreter(output_buffer=io.StringIO(), engine=engine)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        interp.run(ast)
+    return (time.perf_counter() - start) / (n * repeat)
+
+
+def vm_frames(code):
+    interp = Interpreter(output_buffer=io.StringIO())
+    vm = VirtualMachine(interp, stack_budget=1 << 30)
+    start = time.perf_counter()
+    vm.run(compile_program(parser.parse(code)))
+    return vm.max_depth, time.perf_counter() - start
+
+
+def main():
+    print(f"Python recursion limit: {sys.getrecursionlimit()}\n")
+    print(f"{'engine':<10}{'max depth':>12}{'per call':>12}")
+    print("-" * 34)
+    for engine in ENGINES:
+        print(f"{engine:<10}{max_depth(engine):>12}{per_call(engine) * 1e9:>10.0f}ns")
+
+    print("\nvm call stack for 200,000 nested calls")
+    for name, code in (("tail call", TAIL), ("non-tail call", DEPTH)):
+        depth, elapsed = vm_frames(code.replace("N", "200000"))
+        print(f"  {name:<14} peak frames {depth:>8}   {elapsed * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Time position lookups on a multi-megabyte source.
+
+"scan" is what p_error used to do for each error: rfind for the column
+and split the whole source for the line text. "index" builds a
+SourceIndex once and then bisects. Lookups are spread over the source.
+Run from the project root:
+    python benchmarks/bench_source_index.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.source_index import SourceIndex
+
+LINES = 200000
+LOOKUPS = 200
+
+
+def scan(source, offset):
+    col = offset - source.rfind('\n', 0, offset)
+    line = source.count('\n', 0, offset) + 1
+    return line, col, source.split('\n')[line - 1]
+
+
+def main():
+    source = "\n".join(f"x{i} = [{i}, \"value {i}\"] * {i % 7}" for i in range(LINES)) + "\n"
+    offsets = [random.Random(i).randrange(len(source)) for i in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    expected = [scan(source, offset) for offset in offsets]
+    scanned = (time.perf_counter() - start) / LOOKUPS
+
+    start = time.perf_counter()
+    index = SourceIndex(source)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [index.position(offset) + (index.line_text(index.line_of(offset)),) for offset in offsets]
+    looked_up = (time.perf_counter() - start) / LOOKUPS
+    assert got == expected
+
+    print(f"{len(source) / 2**20:.1f} MiB, {LINES} lines")
+    print(f"  scan per error:    {scanned * 1000:9.3f} ms")
+    print(f"  index build:       {built * 1000:9.3f} ms (once per source)")
+    print(f"  index per lookup:  {looked_up * 1000:9.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
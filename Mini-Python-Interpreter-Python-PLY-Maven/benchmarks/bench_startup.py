@@ -0,0 +1,82 @@
+"""Measure the import time of src.myparser (lexer and parser construction).
+
+"before" runs a copy of src/ that builds the lexer and parser the old way,
+with lex.lex() reflection and yacc.yacc() signature checks. "cold" deletes
+the tables before every run, as on a fresh checkout when they were not
+shipped. Each figure is the median of fresh interpreter processes.
+Run from the project root:
+    python benchmarks/bench_startup.py
+"""
+import compileall
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 9
+
+MEASURE = ("import time; start = time.perf_counter(); import src.myparser; "
+           "print(time.perf_counter() - start)")
+
+
+def copy_tree(dest, before):
+    src = os.path.join(dest, "src")
+    shutil.copytree(os.path.join(ROOT, "src"), src,
+                    ignore=shutil.ignore_patterns("__pycache__", "parser.out"))
+    if before:
+        # The tables were not shipped: the first run generates parsetab.py
+        remove_tables(src)
+        for name, old, new in (
+                ("lexer.py", "tables.build_lexer(sys.modules[__name__])", "lex.lex()"),
+                ("myparser.py", "tables.build_parser(sys.modules[__name__])",
+                 "__import__('ply.yacc').yacc.yacc()")):
+            path = os.path.join(src, name)
+            with open(path) as f:
+                code = f.read()
+            with open(path, "w") as f:
+                f.write(code.replace(old, new))
+    compileall.compile_dir(src, quiet=1)
+    return src
+
+
+def remove_tables(src):
+    for path in glob.glob(os.path.join(src, "*tab.py")) + glob.glob(os.path.join(src, "parser.out")):
+        os.remove(path)
+
+
+def measure(dest, src, cold):
+    times = []
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    for _ in range(RUNS + 1):
+        if cold:
+            remove_tables(src)
+        out = subprocess.run([sys.executable, "-c", MEASURE], cwd=dest, env=env,
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout))
+    # The first run may have generated the tables
+    return statistics.median(times[1:])
+
+
+def main():
+    results = []
+    for label, before, cold in (("before, cold", True, True),
+                                ("before, warm", True, False),
+                                ("after, shipped tables", False, False)):
+        with tempfile.TemporaryDirectory() as dest:
+            src = copy_tree(dest, before)
+            elapsed = measure(dest, src, cold)
+            results.append((label, elapsed))
+            files = sorted(os.path.basename(p) for p in glob.glob(os.path.join(src, "*tab.py"))
+                           + glob.glob(os.path.join(src, "parser.out")))
+            print(f"{label:<24}{elapsed * 1000:>9.1f}ms   files: {', '.join(files) or '-'}")
+    after = results[2][1]
+    print(f"\nspeedup over a fresh checkout: {results[0][1] / after:.1f}x, "
+          f"over a warm start: {results[1][1] / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
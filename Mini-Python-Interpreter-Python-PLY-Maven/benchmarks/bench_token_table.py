@@ -0,0 +1,73 @@
+"""Compare the memory of token dicts from tokenize() with a TokenTable.
+
+Memory is what tracemalloc sees retained after building each form from the
+same source, divided by the number of tokens; the source text itself is
+excluded from both. The DataFrame and CSV timings build the exports app.py
+offers from each form.
+Run from the project root (pandas required):
+    python benchmarks/bench_token_table.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.lexer import TokenTable, tokenize
+
+LINES = 50000
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = a * {i} + b  # scale",
+            "    return [x, \"done\"][0]",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def retained(build, code):
+    gc.collect()
+    tracemalloc.start()
+    result = build(code)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    code = make_program(LINES)
+    dicts, dict_bytes = retained(tokenize, code)
+    table, table_bytes = retained(TokenTable.from_source, code)
+    n = len(table)
+    assert n == len(dicts)
+
+    print(f"{LINES} lines, {n} tokens")
+    print(f"  dicts:      {dict_bytes / 2**20:7.1f} MiB  {dict_bytes / n:6.1f} bytes/token")
+    print(f"  TokenTable: {table_bytes / 2**20:7.1f} MiB  {table_bytes / n:6.1f} bytes/token")
+    print(f"  ratio: {dict_bytes / table_bytes:.1f}x")
+    print(f"  DataFrame: dicts {timed(lambda: pd.DataFrame(dicts)) * 1000:6.0f} ms"
+          f"   table {timed(table.to_frame) * 1000:6.0f} ms")
+    print(f"  CSV:       dicts {timed(lambda: pd.DataFrame(dicts).to_csv(index=False)) * 1000:6.0f} ms"
+          f"   table {timed(table.to_csv) * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the peak memory of tokenize() with streaming through iter_tokens().
+
+tokenize() materializes every token as a dict; iter_tokens() yields one
+record at a time, so its peak is the source text plus a constant. The
+"file" column streams the program from disk through read_source (mmap), so
+it includes the decoded source. Peaks are measured with tracemalloc.
+Run from the project root:
+    python benchmarks/bench_tokens.py
+"""
+import gc
+import os
+import pathlib
+import sys
+import tempfile
+import tracemalloc
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.lexer import iter_tokens, tokenize
+
+SIZES = [1000, 10000, 100000]
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = a * {i} + b  # scale",
+            "    return [x, \"done\"][0]",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def peak(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def drain(source):
+    deque(iter_tokens(source), maxlen=0)
+
+
+def main():
+    print(f"{'lines':>8} {'source':>10} {'tokenize':>12} {'iter_tokens':>12} {'file (mmap)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            code = make_program(n)
+            path = pathlib.Path(tmp, f"prog{n}.py")
+            path.write_text(code)
+            listed = peak(tokenize, code)
+            streamed = peak(drain, code)
+            from_file = peak(drain, path)
+            print(f"{n:>8} {len(code) / 2**20:>8.2f}Mi {listed / 2**20:>10.2f}Mi"
+                  f" {streamed / 2**20:>10.2f}Mi {from_file / 2**20:>10.2f}Mi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Measure the dispatch of the NodeVisitor passes over whole programs.
+
+The pipeline is the one the GUI runs on a program: semantic analysis,
+intermediate code, constant folding and unparsing. Each pass runs with
+three ways of finding the visit method for a node: the dispatch table of
+src/visitor.py, a getattr of "visit_" + class name per node as
+ast.NodeVisitor does, and the chain of class-name comparisons the passes
+were written as before they became visitors, tested in the order the
+methods are defined.
+Run from the project root:
+    python benchmarks/bench_visitor.py
+"""
+import copy
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.icg_generator import ICGGenerator
+from src.myparser import CustomParser
+from src.optimizer import ConstantFolder
+from src.semantic_analyzer import SemanticAnalyzer
+from src.unparse import Unparser
+
+SIZES = [1000, 5000]
+RUNS = 5
+PASSES = [SemanticAnalyzer, ICGGenerator, ConstantFolder, Unparser]
+
+
+class GetattrDispatch:
+    def visit(self, node):
+        method = getattr(self, "visit_" + type(node).__name__, None)
+        if method is None:
+            if isinstance(node, list):
+                return self.visit_list(node) if hasattr(self, "visit_list") else self.generic_visit(node)
+            return self.generic_visit(node)
+        return method(node)
+
+
+class ChainDispatch:
+    def visit(self, node):
+        if isinstance(node, list):
+            return self._chain_list(node)
+        cname = node.__class__.__name__
+        for name, method in self._chain:
+            if cname == name:
+                return method(self, node)
+        return self.generic_visit(node)
+
+
+def with_dispatch(mixin, cls):
+    variant = type(f"{mixin.__name__}{cls.__name__}", (mixin, cls), {})
+    methods = {}
+    for klass in reversed(cls.__mro__):
+        methods.update((name, method) for name, method in vars(klass).items()
+                       if name.startswith("visit_"))
+    variant._chain = [(name[6:], method) for name, method in methods.items() if name != "visit_list"]
+    variant._chain_list = methods.get("visit_list", cls.generic_visit)
+    return variant
+
+
+def make_program(n):
+    lines = []
+    while len(lines) < n:
+        i = len(lines)
+        lines += [
+            f"def f{i}(a, b):",
+            f"    x = (a * {i} + 2 * 3) - b",
+            "    if x >= 10 and not b:",
+            "        return [x, \"done\"][0]",
+            "    for k in range(x):",
+            "        x = x - len(a.upper())",
+            "    return x",
+            f"print(f{i}(1, 2))",
+        ]
+    return "\n".join(lines[:n]) + "\n"
+
+
+def best(func, tree):
+    times = []
+    for _ in range(RUNS):
+        # The folder changes the tree in place, so every run gets a copy
+        ast = copy.deepcopy(tree)
+        start = time.perf_counter()
+        func(ast)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = CustomParser()
+    variants = {"table": PASSES,
+                "getattr": [with_dispatch(GetattrDispatch, cls) for cls in PASSES],
+                "chain": [with_dispatch(ChainDispatch, cls) for cls in PASSES]}
+    print(f"{'lines':>6} {'pass':>17} " + " ".join(f"{name:>9}" for name in variants) + f" {'speedup':>8}")
+    for n in SIZES:
+        ast = parser.parse(make_program(n))
+        totals = dict.fromkeys(variants, 0.0)
+        for index, cls in enumerate(PASSES):
+            times = {}
+            for name, passes in variants.items():
+                times[name] = best(lambda tree: passes[index]().visit(tree), ast)
+                totals[name] += times[name]
+            print(f"{n:>6} {cls.__name__:>17} "
+                  + " ".join(f"{t * 1000:>7.1f}ms" for t in times.values())
+                  + f" {times['chain'] / times['table']:>7.2f}x")
+        print(f"{n:>6} {'pipeline':>17} "
+              + " ".join(f"{t * 1000:>7.1f}ms" for t in totals.values())
+              + f" {totals['chain'] / totals['table']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,9 +25,10 @@ try:
             for item in node:
                 print_recursive(item, indent + 1)
             print(f"{prefix}]")
-        elif hasattr(node, "__dict__"):
+        elif hasattr(node, "_fields"):
             print(f"{prefix}{type(node).__name__}:")
-            for k, v in node.__dict__.items():
+            for k in node._fields:
+                v = getattr(node, k)
                 print(f"{prefix}  {k}:", end=" ")
                 if isinstance(v, (list, object)) and not isinstance(v, (str, int, float, bool)):
                     print()
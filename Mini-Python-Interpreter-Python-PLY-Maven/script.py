@@ -3,11 +3,14 @@ from tkinter import ttk, font, filedialog, PhotoImage
 import base64
 import sys
 import io
-from lexer import lexer, tokenize, format_token_output
+from lexer import lexer, format_token_output
+from incremental_lexer import IncrementalLexer
 from myparser import parser
 from interpreter import Interpreter
 from semantic_analyzer import semantic_analysis
 from icg_generator import generate_icg
+from optimizer import optimize
+from unparse import unparse
 import re
 from ast_nodes import *  # Import all AST node classes at the top of script.py
 
@@ -99,138 +102,6 @@ def execute_code():
         sys.stdout = old_stdout
     output_box.config(state=tk.DISABLED)
 
-def optimize_ast(node):
-    # Recursively optimize AST nodes (constant folding, etc.)
-    if isinstance(node, BinaryOp):
-        left = optimize_ast(node.left)
-        right = optimize_ast(node.right)
-        if isinstance(left, Number) and isinstance(right, Number):
-            if node.op == '+': return Number(left.value + right.value)
-            if node.op == '-': return Number(left.value - right.value)
-            if node.op == '*': return Number(left.value * right.value)
-            if node.op == '/': return Number(left.value / right.value)
-        return BinaryOp(left, node.op, right)
-    elif isinstance(node, UnaryOp):
-        expr = optimize_ast(node.expr)
-        if isinstance(expr, Number):
-            if node.op == '-': return Number(-expr.value)
-        return UnaryOp(node.op, expr)
-    elif isinstance(node, Assign):
-        return Assign(node.name, optimize_ast(node.expr))
-    elif isinstance(node, Print):
-        return Print(optimize_ast(node.expr))
-    elif isinstance(node, IfElse):
-        cond = optimize_ast(node.condition)
-        if isinstance(cond, Boolean):
-            if cond.value:
-                return [optimize_ast(stmt) for stmt in node.if_body]
-            elif node.else_body:
-                return [optimize_ast(stmt) for stmt in node.else_body]
-            else:
-                return []
-        return IfElse(cond, [optimize_ast(stmt) for stmt in node.if_body], [optimize_ast(stmt) for stmt in node.else_body] if node.else_body else None)
-    elif isinstance(node, WhileLoop):
-        return WhileLoop(optimize_ast(node.condition), [optimize_ast(stmt) for stmt in node.body])
-    elif isinstance(node, ForLoop):
-        return ForLoop(node.var, optimize_ast(node.iterable), [optimize_ast(stmt) for stmt in node.body])
-    elif isinstance(node, FunctionDef):
-        return FunctionDef(node.name, node.params, [optimize_ast(stmt) for stmt in node.body])
-    elif isinstance(node, FunctionCall):
-        return FunctionCall(node.name, [optimize_ast(arg) for arg in node.args])
-    elif isinstance(node, ListNode):
-        return ListNode([optimize_ast(elem) for elem in node.elements])
-    elif isinstance(node, IndexNode):
-        return IndexNode(optimize_ast(node.expr), optimize_ast(node.index))
-    elif isinstance(node, StringMethod):
-        return StringMethod(optimize_ast(node.expr), node.method, [optimize_ast(arg) for arg in node.args])
-    elif isinstance(node, LenFunction):
-        return LenFunction(optimize_ast(node.expr))
-    elif isinstance(node, RangeCall):
-        return RangeCall(optimize_ast(node.start) if node.start else None, optimize_ast(node.stop) if node.stop else None, optimize_ast(node.step) if node.step else None)
-    else:
-        return node
-
-def ast_to_code(node):
-    # Recursively convert AST back to code
-    if isinstance(node, Assign):
-        return f"{ast_to_code(node.name)} = {ast_to_code(node.expr)}"
-    elif isinstance(node, BinaryOp):
-        return f"({ast_to_code(node.left)} {node.op} {ast_to_code(node.right)})"
-    elif isinstance(node, UnaryOp):
-        return f"{node.op}{ast_to_code(node.expr)}"
-    elif isinstance(node, Number):
-        return str(node.value)
-    elif isinstance(node, String):
-        return repr(node.value)
-    elif isinstance(node, Boolean):
-        return str(node.value)
-    elif isinstance(node, Identifier):
-        return node.name
-    elif isinstance(node, Print):
-        return f"print({ast_to_code(node.expr)})"
-    elif isinstance(node, IfElse):
-        code = f"if {ast_to_code(node.condition)}:\n"
-        for stmt in node.if_body:
-            code += f"    {ast_to_code(stmt)}\n"
-        if node.else_body:
-            code += f"else:\n"
-            for stmt in node.else_body:
-                code += f"    {ast_to_code(stmt)}\n"
-        return code.rstrip()
-    elif isinstance(node, WhileLoop):
-        code = f"while {ast_to_code(node.condition)}:\n"
-        for stmt in node.body:
-            code += f"    {ast_to_code(stmt)}\n"
-        return code.rstrip()
-    elif isinstance(node, ForLoop):
-        code = f"for {ast_to_code(node.var)} in {ast_to_code(node.iterable)}:\n"
-        for stmt in node.body:
-            code += f"    {ast_to_code(stmt)}\n"
-        return code.rstrip()
-    elif isinstance(node, FunctionDef):
-        # Handle parameters properly - they might be Identifier objects or strings
-        param_strs = []
-        for param in node.params:
-            if isinstance(param, Identifier):
-                param_strs.append(param.name)
-            else:
-                param_strs.append(str(param))
-        
-        code = f"def {node.name}({', '.join(param_strs)}):\n"
-        for stmt in node.body:
-            code += f"    {ast_to_code(stmt)}\n"
-        return code.rstrip()
-    elif isinstance(node, FunctionCall):
-        func_name = ast_to_code(node.name) if hasattr(node.name, 'name') else node.name
-        return f"{func_name}({', '.join(ast_to_code(arg) for arg in node.args)})"
-    elif isinstance(node, ListNode):
-        return f"[{', '.join(ast_to_code(elem) for elem in node.elements)}]"
-    elif isinstance(node, IndexNode):
-        return f"{ast_to_code(node.expr)}[{ast_to_code(node.index)}]"
-    elif isinstance(node, StringMethod):
-        return f"{ast_to_code(node.expr)}.{node.method}({', '.join(ast_to_code(arg) for arg in node.args)})"
-    elif isinstance(node, LenFunction):
-        return f"len({ast_to_code(node.expr)})"
-    elif isinstance(node, RangeCall):
-        args = [ast_to_code(arg) for arg in [node.start, node.stop, node.step] if arg is not None]
-        return f"range({', '.join(args)})"
-    elif isinstance(node, Return):
-        return f"return {ast_to_code(node.expr)}"
-    elif isinstance(node, Break):
-        return "break"
-    elif isinstance(node, Continue):
-        return "continue"
-    elif isinstance(node, TryExcept):
-        code = f"try:\n"
-        for stmt in node.try_body:
-            code += f"    {ast_to_code(stmt)}\n"
-        code += f"except:\n"
-        for stmt in node.except_body:
-            code += f"    {ast_to_code(stmt)}\n"
-        return code.rstrip()
-    else:
-        return ""
-
 def optimize_code():
     raw_code = optimizer_input.get("1.0", tk.END).strip()
     optimizer_output.config(state=tk.NORMAL)
@@ -245,16 +116,8 @@ def optimize_code():
         ast = parser.parse(raw_code)
         if ast is None:
             raise Exception("Failed to parse code")
-        # Optimize each statement in the AST
-        optimized_ast = []
-        for node in ast:
-            opt = optimize_ast(node)
-            if isinstance(opt, list):
-                optimized_ast.extend(opt)
-            else:
-                optimized_ast.append(opt)
-        # Convert optimized AST back to code
-        optimized_code = "\n".join(ast_to_code(node) for node in optimized_ast if node)
+        # Optimize and convert the optimized AST back to code
+        optimized_code = unparse(optimize(ast))
         optimizer_output.insert(tk.END, optimized_code)
     except Exception as e:
         optimizer_output.insert(tk.END, f"❌ Error during optimization:\n{str(e)}")
@@ -783,6 +646,9 @@ def generate_code(optimized_code):
         
     return "\n".join(output)
 
+# Keeps the previous buffer's tokens so reruns re-lex only the edited lines
+incremental_lexer = IncrementalLexer()
+
 def analyze_phases():
     code = code_input.get("1.0", tk.END).strip()
     if not code:
@@ -796,7 +662,7 @@ def analyze_phases():
 
     try:
         # Lexical Analysis
-        tokens = tokenize(code)
+        tokens = incremental_lexer.update(code)
         if tokens:
             update_phase_output("Lexical Analysis", format_token_output(tokens))
         else:
@@ -1,142 +1,284 @@
-class Statement:
-    pass
+import hashlib
+
+
+class Node:
+    """Base class of all AST nodes.
+
+    Nodes use __slots__ to keep large trees small. _fields names the child
+    attributes in constructor order. The parser sets the source position of
+    each node: lineno (from 1) and col_offset (from 0) of its first token,
+    and end, the offset in the source just past its last token. As in the
+    ast module, nodes built elsewhere have no position until one is copied
+    to them; there is no __getattr__ fallback, which would slow down every
+    attribute read. _hash holds the structural hash once it is taken.
+    _values names the fields that hold plain values, such as an operator
+    or a name, rather than child nodes.
+    """
+    _positions = ('lineno', 'col_offset', 'end')
+    __slots__ = _positions + ('_hash',)
+    _fields = ()
+    _values = ()
+
+
+class Statement(Node):
+    __slots__ = ()
+
+class Expression(Node):
+    __slots__ = ()
+
+
+def iter_fields(node):
+    """Yield (name, value) for each field of a node."""
+    for name in node._fields:
+        yield name, getattr(node, name)
+
+def copy_location(new_node, old_node):
+    """Copy the source position of old_node, if it has one, to new_node."""
+    for name in Node._positions:
+        if hasattr(old_node, name):
+            setattr(new_node, name, getattr(old_node, name))
+    return new_node
+
+def structural_hash(node):
+    """Merkle hash of the subtree at node, as 16 bytes.
+
+    Structurally equal subtrees, same node types and field values, hash
+    alike wherever they are; positions and resolver state are left out.
+    Each node's hash is built from its children's, computed once and kept
+    on the node, so a tree must not be changed in place once hashed.
+    """
+    try:
+        return node._hash
+    except AttributeError:
+        pass
+    stack = [node]
+    while stack:
+        top = stack[-1]
+        pending = [child for child in iter_child_nodes(top) if not hasattr(child, '_hash')]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if hasattr(top, '_hash'):
+            # A shared child, pushed more than once
+            continue
+        digest = hashlib.blake2b(type(top).__name__.encode(), digest_size=16)
+        for name in top._fields:
+            _hash_value(digest, getattr(top, name))
+        top._hash = digest.digest()
+    return node._hash
+
+def _hash_value(digest, value):
+    if isinstance(value, Node):
+        digest.update(b'n' + value._hash)
+    elif isinstance(value, list):
+        digest.update(b'[')
+        for item in value:
+            _hash_value(digest, item)
+        digest.update(b']')
+    else:
+        # repr escapes NUL, so it cannot run into the next value
+        digest.update(f"v{type(value).__name__}:{value!r}\0".encode('utf-8', 'surrogatepass'))
+
+def iter_child_nodes(node):
+    """Yield the direct child nodes of a node, looking inside list fields."""
+    for name in node._fields:
+        value = getattr(node, name)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+
+
+# Expressions
+class Number(Expression):
+    _fields = ('value',)
+    _values = _fields
+    __slots__ = _fields
 
-class Number:
     def __init__(self, value):
         self.value = value
 
-class String:
+class String(Expression):
+    _fields = ('value',)
+    _values = _fields
+    __slots__ = _fields
+
     def __init__(self, value):
         self.value = value
 
-class Boolean:
+class Boolean(Expression):
+    _fields = ('value',)
+    _values = _fields
+    __slots__ = _fields
+
     def __init__(self, value):
         self.value = value
 
-class Identifier:
+class Identifier(Expression):
+    _fields = ('name',)
+    _values = _fields
+    __slots__ = ('name', 'slot', 'cache')
+
     def __init__(self, name):
         self.name = name
+        self.slot = None  # frame slot of a function local, set by the resolver
+        self.cache = None  # inline cache of a function read by name
 
-class Assign:
-    def __init__(self, name, expr):
-        self.name = name
-        self.expr = expr
+class ListNode(Expression):
+    _fields = ('elements',)
+    __slots__ = _fields
 
-class Print:
-    def __init__(self, expr):
-        self.expr = expr
-        
-class ListNode:
     def __init__(self, elements):
         self.elements = elements
-        
-class IndexNode:
+
+class IndexNode(Expression):
+    _fields = ('expr', 'index')
+    __slots__ = _fields + ('site',)
+
     def __init__(self, expr, index):
         self.expr = expr
         self.index = index
-        
-class StringMethod:
+        self.site = 0  # run count or handler, for the adaptive tree-walker
+
+class StringMethod(Expression):
+    _fields = ('expr', 'method', 'args')
+    _values = ('method',)
+    __slots__ = _fields
+
     def __init__(self, expr, method, args):
         self.expr = expr
         self.method = method
         self.args = args
-        
-class LenFunction:
+
+class LenFunction(Expression):
+    _fields = ('expr',)
+    __slots__ = _fields
+
     def __init__(self, expr):
         self.expr = expr
-        
-class ListAssign:
-    def __init__(self, name, index, value):
-        self.name = name
-        self.index = index
-        self.value = value
-        
-class TryExcept:
-    def __init__(self, try_body, except_body):
-        self.try_body = try_body
-        self.except_body = except_body
-        
-class ListNode:
-    def __init__(self, elements):
-        self.elements = elements
-        
-class IndexNode:
-    def __init__(self, expr, index):
-        self.expr = expr
-        self.index = index
-        
-class StringMethod:
-    def __init__(self, expr, method, args):
+
+class BinaryOp(Expression):
+    _fields = ('left', 'op', 'right')
+    _values = ('op',)
+    __slots__ = _fields + ('site',)
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+        self.site = 0  # run count or handler, for the adaptive tree-walker
+
+class UnaryOp(Expression):
+    _fields = ('op', 'expr')
+    _values = ('op',)
+    __slots__ = _fields + ('site',)
+
+    def __init__(self, op, expr):
+        self.op = op
         self.expr = expr
-        self.method = method
+        self.site = 0  # run count or handler, for the adaptive tree-walker
+
+class FunctionCall(Expression):
+    _fields = ('name', 'args')
+    __slots__ = _fields + ('cache',)
+
+    def __init__(self, name, args):
+        self.name = name
         self.args = args
-        
-class LenFunction:
+        self.cache = None  # inline cache of the callee, for the tree-walker
+
+class RangeCall(Expression):
+    _fields = ('start', 'stop', 'step')
+    __slots__ = _fields
+
+    def __init__(self, start, stop, step):
+        self.start = start
+        self.stop = stop
+        self.step = step
+
+
+# Statements
+class Assign(Statement):
+    _fields = ('name', 'expr')
+    __slots__ = _fields
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+class Print(Statement):
+    _fields = ('expr',)
+    __slots__ = _fields
+
     def __init__(self, expr):
         self.expr = expr
-        
-class ListAssign:
+
+class ListAssign(Statement):
+    _fields = ('name', 'index', 'value')
+    __slots__ = _fields
+
     def __init__(self, name, index, value):
         self.name = name
         self.index = index
         self.value = value
-        
-class TryExcept:
+
+class TryExcept(Statement):
+    _fields = ('try_body', 'except_body')
+    __slots__ = _fields
+
     def __init__(self, try_body, except_body):
         self.try_body = try_body
         self.except_body = except_body
 
-class Return:
+class Return(Statement):
+    _fields = ('expr',)
+    __slots__ = _fields
+
     def __init__(self, expr):
         self.expr = expr
 
-class BinaryOp:
-    def __init__(self, left, op, right):
-        self.left = left
-        self.op = op
-        self.right = right
-
-class UnaryOp:
-    def __init__(self, op, expr):
-        self.op = op
-        self.expr = expr
+class IfElse(Statement):
+    _fields = ('condition', 'if_body', 'else_body')
+    __slots__ = _fields
 
-class IfElse:
     def __init__(self, condition, if_body, else_body=None):
         self.condition = condition
         self.if_body = if_body
         self.else_body = else_body
 
-class WhileLoop:
+class WhileLoop(Statement):
+    _fields = ('condition', 'body')
+    __slots__ = _fields
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
-class ForLoop:
+class ForLoop(Statement):
+    _fields = ('var', 'iterable', 'body')
+    __slots__ = _fields
+
     def __init__(self, var, iterable, body):
         self.var = var
         self.iterable = iterable
         self.body = body
 
-class FunctionDef:
+class FunctionDef(Statement):
+    _fields = ('name', 'params', 'body')
+    _values = ('name',)
+    __slots__ = ('name', 'params', 'body', 'varnames')
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
-
-class FunctionCall:
-    def __init__(self, name, args):
-        self.name = name
-        self.args = args
-
-class RangeCall:
-    def __init__(self, start, stop, step):
-        self.start = start
-        self.stop = stop
-        self.step = step
+        self.varnames = None  # frame slot layout, set by the resolver
 
 class Break(Statement):
-    pass
+    __slots__ = ()
 
 class Continue(Statement):
-    pass
\ No newline at end of file
+    __slots__ = ()
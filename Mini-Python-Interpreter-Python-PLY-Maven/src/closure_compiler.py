@@ -0,0 +1,394 @@
+from .ast_nodes import *
+from .resolver import resolve_function
+from .runtime import (binary_function, index_value, length_of, string_method,
+                      check_iterable)
+
+# Signals returned by statement closures; a return is signalled by a 1-tuple
+BREAK = object()
+CONTINUE = object()
+
+# Marks a local slot that has not been assigned yet
+_UNBOUND = object()
+
+
+def _load_function(rt, name):
+    if name in rt.functions:
+        return rt.functions[name]
+    raise Exception(f"Undefined variable or function: {name}")
+
+
+# Inline versions of the hottest operators, saving a call per evaluation
+def _add(left, right):
+    return lambda rt, fast: left(rt, fast) + right(rt, fast)
+
+def _sub(left, right):
+    return lambda rt, fast: left(rt, fast) - right(rt, fast)
+
+def _mul(left, right):
+    return lambda rt, fast: left(rt, fast) * right(rt, fast)
+
+def _eq(left, right):
+    return lambda rt, fast: left(rt, fast) == right(rt, fast)
+
+def _ne(left, right):
+    return lambda rt, fast: left(rt, fast) != right(rt, fast)
+
+def _lt(left, right):
+    return lambda rt, fast: left(rt, fast) < right(rt, fast)
+
+def _gt(left, right):
+    return lambda rt, fast: left(rt, fast) > right(rt, fast)
+
+def _le(left, right):
+    return lambda rt, fast: left(rt, fast) <= right(rt, fast)
+
+def _ge(left, right):
+    return lambda rt, fast: left(rt, fast) >= right(rt, fast)
+
+_INLINE_BINARY = {
+    '+': _add, '-': _sub, '*': _mul,
+    '==': _eq, '!=': _ne, '<': _lt, '>': _gt, '<=': _le, '>=': _ge,
+}
+
+
+class CompiledFunction:
+    __slots__ = ('node', 'nparams', 'nlocals', 'body')
+
+    def __init__(self, node, nparams, nlocals, body):
+        self.node = node
+        self.nparams = nparams
+        self.nlocals = nlocals
+        self.body = body
+
+
+class ClosureProgram:
+    """A program compiled to closures; run() may be called any number of times."""
+    def __init__(self, body, compiler):
+        self.body = body
+        self.compiler = compiler
+
+    def run(self, interpreter):
+        """Run against an Interpreter's state and return a top-level return value."""
+        result = self.body(interpreter, None)
+        if isinstance(result, tuple):
+            return result[0]
+        return None
+
+
+class ClosureCompiler:
+    """Turn each AST node into a Python closure taking (runtime, locals).
+
+    The runtime is the Interpreter, which provides environment, functions
+    and _print. Locals is a list of slots inside functions and None at
+    module level.
+    """
+    def __init__(self):
+        self.varnames = None
+        self.loop_depth = 0
+        self.functions = {}
+
+    def compile_program(self, ast):
+        return ClosureProgram(self.block(ast), self)
+
+    def function(self, node):
+        """Return the CompiledFunction for a FunctionDef, compiling it once."""
+        compiled = self.functions.get(id(node))
+        if compiled is not None and compiled.node is node:
+            return compiled
+        varnames = resolve_function(node)
+        saved = (self.varnames, self.loop_depth)
+        self.varnames, self.loop_depth = varnames, 0
+        body = self.block(node.body)
+        self.varnames, self.loop_depth = saved
+        compiled = CompiledFunction(node, len(node.params), len(varnames), body)
+        self.functions[id(node)] = compiled
+        return compiled
+
+    # Statements
+    def block(self, statements):
+        if not isinstance(statements, list):
+            statements = [statements]
+        compiled = tuple(self.statement(s) for s in statements if s is not None)
+        if not compiled:
+            return lambda rt, fast: None
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run_block(rt, fast):
+            for statement in compiled:
+                signal = statement(rt, fast)
+                if signal is not None:
+                    return signal
+        return run_block
+
+    def statement(self, node):
+        method = getattr(self, f'statement_{node.__class__.__name__}', None)
+        if method is not None:
+            return method(node)
+        expr = self.expr(node)
+
+        def expression_statement(rt, fast):
+            expr(rt, fast)
+        return expression_statement
+
+    def statement_Assign(self, node):
+        value = self.expr(node.expr)
+        name = node.name.name
+        if self.varnames is not None:
+            slot = self.varnames.index(name)
+
+            def assign_local(rt, fast):
+                fast[slot] = value(rt, fast)
+            return assign_local
+
+        def assign_global(rt, fast):
+            rt.environment[name] = value(rt, fast)
+        return assign_global
+
+    def statement_Print(self, node):
+        if isinstance(node.expr, ListNode):
+            values = tuple(self.expr(e) for e in node.expr.elements)
+
+            def print_values(rt, fast):
+                rt._print(*[value(rt, fast) for value in values])
+            return print_values
+        value = self.expr(node.expr)
+
+        def print_value(rt, fast):
+            rt._print(value(rt, fast))
+        return print_value
+
+    def statement_IfElse(self, node):
+        condition = self.expr(node.condition)
+        if_body = self.block(node.if_body)
+        if node.else_body:
+            else_body = self.block(node.else_body)
+
+            def if_else(rt, fast):
+                if condition(rt, fast):
+                    return if_body(rt, fast)
+                return else_body(rt, fast)
+            return if_else
+
+        def if_only(rt, fast):
+            if condition(rt, fast):
+                return if_body(rt, fast)
+        return if_only
+
+    def loop_body(self, statements):
+        self.loop_depth += 1
+        body = self.block(statements)
+        self.loop_depth -= 1
+        return body
+
+    def statement_WhileLoop(self, node):
+        condition = self.expr(node.condition)
+        body = self.loop_body(node.body)
+
+        def while_loop(rt, fast):
+            while condition(rt, fast):
+                signal = body(rt, fast)
+                if signal is not None:
+                    if signal is BREAK:
+                        break
+                    if signal is CONTINUE:
+                        continue
+                    return signal
+        return while_loop
+
+    def statement_ForLoop(self, node):
+        iterable = self.expr(node.iterable)
+        body = self.loop_body(node.body)
+        name = node.var.name
+        if self.varnames is not None:
+            slot = self.varnames.index(name)
+
+            def for_local(rt, fast):
+                for item in check_iterable(iterable(rt, fast)):
+                    fast[slot] = item
+                    signal = body(rt, fast)
+                    if signal is not None:
+                        if signal is BREAK:
+                            break
+                        if signal is CONTINUE:
+                            continue
+                        return signal
+            return for_local
+
+        def for_global(rt, fast):
+            env = rt.environment
+            for item in check_iterable(iterable(rt, fast)):
+                env[name] = item
+                signal = body(rt, fast)
+                if signal is not None:
+                    if signal is BREAK:
+                        break
+                    if signal is CONTINUE:
+                        continue
+                    return signal
+        return for_global
+
+    def statement_FunctionDef(self, node):
+        compiled = self.function(node)
+        name = node.name
+
+        def define(rt, fast):
+            rt.functions[name] = compiled.node
+        return define
+
+    def statement_Return(self, node):
+        if node.expr is None:
+            return lambda rt, fast: (None,)
+        value = self.expr(node.expr)
+        return lambda rt, fast: (value(rt, fast),)
+
+    def statement_Break(self, node):
+        if not self.loop_depth:
+            return self.raise_error("Break statement outside loop")
+        return lambda rt, fast: BREAK
+
+    def statement_Continue(self, node):
+        if not self.loop_depth:
+            return self.raise_error("Continue statement outside loop")
+        return lambda rt, fast: CONTINUE
+
+    def statement_TryExcept(self, node):
+        try_body = self.block(node.try_body)
+        except_body = self.block(node.except_body)
+
+        def try_except(rt, fast):
+            try:
+                return try_body(rt, fast)
+            except Exception:
+                return except_body(rt, fast)
+        return try_except
+
+    def raise_error(self, message):
+        def fail(rt, fast):
+            raise Exception(message)
+        return fail
+
+    # Expressions
+    def expr(self, node):
+        if node is None:
+            return lambda rt, fast: None
+        method = getattr(self, f'expr_{node.__class__.__name__}', None)
+        if method is None:
+            # Mirror the tree-walker, which only fails once the node is reached
+            return self.raise_error(f'No evaluate_{node.__class__.__name__} method')
+        return method(node)
+
+    def expr_Number(self, node):
+        value = node.value
+        return lambda rt, fast: value
+
+    expr_String = expr_Boolean = expr_Number
+
+    def expr_Identifier(self, node):
+        name = node.name
+        if self.varnames is not None and name in self.varnames:
+            slot = self.varnames.index(name)
+
+            def load_local(rt, fast):
+                value = fast[slot]
+                if value is _UNBOUND:
+                    return _load_function(rt, name)
+                return value
+            return load_local
+
+        def load_global(rt, fast):
+            value = rt.environment.get(name, _UNBOUND)
+            if value is _UNBOUND:
+                return _load_function(rt, name)
+            return value
+        return load_global
+
+    def expr_BinaryOp(self, node):
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        inline = _INLINE_BINARY.get(node.op)
+        if inline is not None:
+            return inline(left, right)
+        try:
+            func = binary_function(node.op)
+        except Exception as e:
+            return self.raise_error(str(e))
+        return lambda rt, fast: func(left(rt, fast), right(rt, fast))
+
+    def expr_UnaryOp(self, node):
+        operand = self.expr(node.expr)
+        if node.op == '-':
+            return lambda rt, fast: -operand(rt, fast)
+        elif node.op == 'not':
+            return lambda rt, fast: not operand(rt, fast)
+        return self.raise_error(f"Unknown unary operator: {node.op}")
+
+    def expr_FunctionCall(self, node):
+        name = node.name.name if hasattr(node.name, 'name') else node.name
+        args = tuple(self.expr(arg) for arg in node.args)
+        function = self.function
+
+        def call(rt, fast):
+            functions = rt.functions
+            if name not in functions:
+                raise Exception(f"Undefined function: {name}")
+            func = functions[name]
+            if not isinstance(func, FunctionDef):
+                raise Exception(f"{name} is not a function")
+            compiled = function(func)
+            frame = [arg(rt, fast) for arg in args]
+            if len(frame) != compiled.nlocals:
+                # Extra arguments are dropped and missing ones left unbound, like zip()
+                del frame[compiled.nparams:]
+                frame.extend([_UNBOUND] * (compiled.nlocals - len(frame)))
+            signal = compiled.body(rt, frame)
+            if isinstance(signal, tuple):
+                return signal[0]
+            return None
+        return call
+
+    def expr_ListNode(self, node):
+        elements = tuple(self.expr(e) for e in node.elements)
+        return lambda rt, fast: [element(rt, fast) for element in elements]
+
+    def expr_IndexNode(self, node):
+        expr = self.expr(node.expr)
+        index = self.expr(node.index)
+        return lambda rt, fast: index_value(expr(rt, fast), index(rt, fast))
+
+    def expr_LenFunction(self, node):
+        expr = self.expr(node.expr)
+        return lambda rt, fast: length_of(expr(rt, fast))
+
+    def expr_StringMethod(self, node):
+        expr = self.expr(node.expr)
+        args = tuple(self.expr(arg) for arg in node.args)
+        method = node.method
+        return lambda rt, fast: string_method(expr(rt, fast), method,
+                                              [arg(rt, fast) for arg in args])
+
+    def expr_RangeCall(self, node):
+        if node.stop is None:
+            start = lambda rt, fast: 0
+            stop = self.expr(node.start)
+        else:
+            start = self.expr(node.start) if node.start is not None else (lambda rt, fast: 0)
+            stop = self.expr(node.stop)
+        step = self.expr(node.step) if node.step is not None else (lambda rt, fast: 1)
+        return lambda rt, fast: range(start(rt, fast), stop(rt, fast), step(rt, fast))
+
+
+# Compiled programs keyed by AST identity so repeated runs skip compilation
+_program_cache = {}
+_PROGRAM_CACHE_SIZE = 32
+
+def compile_program(ast):
+    """Compile a parsed program to closures, reusing earlier results for the same AST."""
+    entry = _program_cache.get(id(ast))
+    if entry is not None and entry[0] is ast:
+        return entry[1]
+    program = ClosureCompiler().compile_program(ast)
+    if len(_program_cache) >= _PROGRAM_CACHE_SIZE:
+        _program_cache.pop(next(iter(_program_cache)))
+    _program_cache[id(ast)] = (ast, program)
+    return program
@@ -0,0 +1,368 @@
+from .ast_nodes import *
+from .resolver import resolve_function
+from .runtime import BINARY_OP_INDEX
+
+# Opcodes. Every instruction is two integers: the opcode and its argument.
+LOAD_CONST = 0
+LOAD_FAST = 1
+STORE_FAST = 2
+LOAD_GLOBAL = 3
+STORE_GLOBAL = 4
+BINARY_OP = 5
+UNARY_NEG = 6
+UNARY_NOT = 7
+POP_TOP = 8
+JUMP = 9
+POP_JUMP_IF_FALSE = 10
+GET_ITER = 11
+FOR_ITER = 12
+CALL = 13
+RETURN_VALUE = 14
+PRINT = 15
+BUILD_LIST = 16
+INDEX = 17
+LEN = 18
+STRING_METHOD = 19
+MAKE_RANGE = 20
+MAKE_FUNCTION = 21
+SETUP_EXCEPT = 22
+POP_BLOCK = 23
+RAISE = 24
+TAIL_CALL = 25
+
+OPNAMES = {value: name for name, value in list(globals().items())
+           if name.isupper() and isinstance(value, int)}
+
+
+class CodeObject:
+    """Compiled form of a module or function body."""
+    def __init__(self, name, varnames=(), nparams=0, node=None):
+        self.name = name
+        self.code = []
+        self.consts = []
+        self.names = []
+        self._const_index = {}
+        self._name_index = {}
+        self.varnames = list(varnames)
+        self.nparams = nparams
+        self.node = node
+
+    @property
+    def nlocals(self):
+        return len(self.varnames)
+
+    def disassemble(self):
+        """Return a human readable listing of the instructions."""
+        lines = [f"Code object {self.name}:"]
+        for pc in range(0, len(self.code), 2):
+            op, arg = self.code[pc], self.code[pc + 1]
+            name = OPNAMES[op]
+            if op in (LOAD_CONST, MAKE_FUNCTION, CALL, TAIL_CALL, STRING_METHOD, RAISE):
+                detail = f"({self.consts[arg]!r})"
+            elif op in (LOAD_FAST, STORE_FAST):
+                detail = f"({self.varnames[arg]})"
+            elif op in (LOAD_GLOBAL, STORE_GLOBAL):
+                detail = f"({self.names[arg]})"
+            else:
+                detail = ""
+            lines.append(f"{pc:5d} {name:<18} {arg} {detail}".rstrip())
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<code {self.name}>"
+
+
+class _Loop:
+    def __init__(self, is_for, start, try_depth):
+        self.is_for = is_for
+        self.start = start
+        self.try_depth = try_depth
+        self.breaks = []
+
+
+class Compiler:
+    """Lower the AST into CodeObjects for the stack VM in vm.py."""
+    def __init__(self):
+        self.code = None
+        self.loops = []
+        self.try_depth = 0
+
+    def compile_module(self, ast):
+        self.code = CodeObject("<module>")
+        self.compile(ast)
+        self.emit(LOAD_CONST, self.const(None))
+        self.emit(RETURN_VALUE)
+        return self.code
+
+    def compile_function(self, node):
+        code = CodeObject(node.name, resolve_function(node), len(node.params), node)
+
+        saved = (self.code, self.loops, self.try_depth)
+        self.code, self.loops, self.try_depth = code, [], 0
+        self.compile(node.body)
+        self.emit(LOAD_CONST, self.const(None))
+        self.emit(RETURN_VALUE)
+        self.code, self.loops, self.try_depth = saved
+        return code
+
+    # Emission helpers
+    def emit(self, op, arg=0):
+        self.code.code.extend((op, arg))
+        return len(self.code.code) - 1
+
+    def patch(self, position, target=None):
+        self.code.code[position] = len(self.code.code) if target is None else target
+
+    def here(self):
+        return len(self.code.code)
+
+    def const(self, value):
+        # Keyed on the type too so that 1, 1.0 and True stay distinct, and
+        # floats on their hex so that 0.0 and -0.0 do
+        key = (type(value), value.hex() if type(value) is float else value)
+        index = self.code._const_index.get(key)
+        if index is None:
+            index = self.code._const_index[key] = len(self.code.consts)
+            self.code.consts.append(value)
+        return index
+
+    def name(self, name):
+        index = self.code._name_index.get(name)
+        if index is None:
+            index = self.code._name_index[name] = len(self.code.names)
+            self.code.names.append(name)
+        return index
+
+    def in_function(self):
+        return self.code.node is not None
+
+    def load_name(self, name):
+        if self.in_function() and name in self.code.varnames:
+            self.emit(LOAD_FAST, self.code.varnames.index(name))
+        else:
+            self.emit(LOAD_GLOBAL, self.name(name))
+
+    def store_name(self, name):
+        if self.in_function():
+            self.emit(STORE_FAST, self.code.varnames.index(name))
+        else:
+            self.emit(STORE_GLOBAL, self.name(name))
+
+    # Dispatch
+    def compile(self, node):
+        """Compile a statement or a list of statements."""
+        if isinstance(node, list):
+            for item in node:
+                self.compile(item)
+            return
+        if node is None:
+            return
+        self.expression(node)
+        if not isinstance(node, Statement):
+            # Expression statement: discard its value
+            self.emit(POP_TOP)
+
+    def expression(self, node):
+        """Compile a node, leaving its value on the stack."""
+        if node is None:
+            self.emit(LOAD_CONST, self.const(None))
+            return
+        method = getattr(self, f'compile_{node.__class__.__name__}', self.generic_compile)
+        method(node)
+
+    def generic_compile(self, node):
+        # Mirror the tree-walker, which only fails once the node is reached
+        self.emit(RAISE, self.const(f'No evaluate_{node.__class__.__name__} method'))
+
+    # Statements
+    def compile_Assign(self, node):
+        self.expression(node.expr)
+        self.store_name(node.name.name)
+
+    def compile_Print(self, node):
+        if isinstance(node.expr, ListNode):
+            for expr in node.expr.elements:
+                self.expression(expr)
+            self.emit(PRINT, len(node.expr.elements))
+        else:
+            self.expression(node.expr)
+            self.emit(PRINT, 1)
+
+    def compile_IfElse(self, node):
+        self.expression(node.condition)
+        jump_else = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.if_body)
+        if node.else_body:
+            jump_end = self.emit(JUMP)
+            self.patch(jump_else)
+            self.compile(node.else_body)
+            self.patch(jump_end)
+        else:
+            self.patch(jump_else)
+
+    def compile_WhileLoop(self, node):
+        start = self.here()
+        self.expression(node.condition)
+        jump_end = self.emit(POP_JUMP_IF_FALSE)
+        loop = _Loop(False, start, self.try_depth)
+        self.loops.append(loop)
+        self.compile(node.body)
+        self.loops.pop()
+        self.emit(JUMP, start)
+        self.patch(jump_end)
+        for position in loop.breaks:
+            self.patch(position)
+
+    def compile_ForLoop(self, node):
+        self.expression(node.iterable)
+        self.emit(GET_ITER)
+        start = self.here()
+        jump_end = self.emit(FOR_ITER)
+        self.store_name(node.var.name)
+        loop = _Loop(True, start, self.try_depth)
+        self.loops.append(loop)
+        self.compile(node.body)
+        self.loops.pop()
+        self.emit(JUMP, start)
+        self.patch(jump_end)
+        for position in loop.breaks:
+            self.patch(position)
+
+    def compile_FunctionDef(self, node):
+        self.emit(MAKE_FUNCTION, self.const(self.compile_function(node)))
+
+    def compile_Return(self, node):
+        if (isinstance(node.expr, FunctionCall) and self.in_function()
+                and not self.try_depth):
+            # The caller's frame has nothing left to do, so the callee replaces it
+            self.compile_FunctionCall(node.expr, TAIL_CALL)
+            return
+        self.expression(node.expr)
+        self.emit(RETURN_VALUE)
+
+    def _exit_trys(self, loop):
+        for _ in range(self.try_depth - loop.try_depth):
+            self.emit(POP_BLOCK)
+
+    def compile_Break(self, node):
+        if not self.loops:
+            self.emit(RAISE, self.const("Break statement outside loop"))
+            return
+        loop = self.loops[-1]
+        self._exit_trys(loop)
+        if loop.is_for:
+            self.emit(POP_TOP)
+        loop.breaks.append(self.emit(JUMP))
+
+    def compile_Continue(self, node):
+        if not self.loops:
+            self.emit(RAISE, self.const("Continue statement outside loop"))
+            return
+        loop = self.loops[-1]
+        self._exit_trys(loop)
+        self.emit(JUMP, loop.start)
+
+    def compile_TryExcept(self, node):
+        setup = self.emit(SETUP_EXCEPT)
+        self.try_depth += 1
+        self.compile(node.try_body)
+        self.try_depth -= 1
+        self.emit(POP_BLOCK)
+        jump_end = self.emit(JUMP)
+        self.patch(setup)
+        self.compile(node.except_body)
+        self.patch(jump_end)
+
+    # Expressions
+    def compile_Number(self, node):
+        self.emit(LOAD_CONST, self.const(node.value))
+
+    compile_String = compile_Boolean = compile_Number
+
+    def compile_Identifier(self, node):
+        self.load_name(node.name)
+
+    def compile_BinaryOp(self, node):
+        index = BINARY_OP_INDEX.get(node.op)
+        if index is None:
+            self.emit(RAISE, self.const(f"Unknown operator: {node.op}"))
+            return
+        self.expression(node.left)
+        self.expression(node.right)
+        self.emit(BINARY_OP, index)
+
+    def compile_UnaryOp(self, node):
+        self.expression(node.expr)
+        if node.op == '-':
+            self.emit(UNARY_NEG)
+        elif node.op == 'not':
+            self.emit(UNARY_NOT)
+        else:
+            self.emit(RAISE, self.const(f"Unknown unary operator: {node.op}"))
+            return
+
+    def compile_FunctionCall(self, node, op=CALL):
+        name = node.name.name if hasattr(node.name, 'name') else node.name
+        for arg in node.args:
+            self.expression(arg)
+        self.emit(op, self.const((name, len(node.args))))
+
+    def compile_ListNode(self, node):
+        for elem in node.elements:
+            self.expression(elem)
+        self.emit(BUILD_LIST, len(node.elements))
+
+    def compile_IndexNode(self, node):
+        self.expression(node.expr)
+        self.expression(node.index)
+        self.emit(INDEX)
+
+    def compile_LenFunction(self, node):
+        self.expression(node.expr)
+        self.emit(LEN)
+
+    def compile_StringMethod(self, node):
+        self.expression(node.expr)
+        for arg in node.args:
+            self.expression(arg)
+        self.emit(STRING_METHOD, self.const((node.method, len(node.args))))
+
+    def compile_RangeCall(self, node):
+        if node.stop is None:
+            self.emit(LOAD_CONST, self.const(0))
+            self.expression(node.start)
+        else:
+            if node.start is not None:
+                self.expression(node.start)
+            else:
+                self.emit(LOAD_CONST, self.const(0))
+            self.expression(node.stop)
+        if node.step is not None:
+            self.expression(node.step)
+        else:
+            self.emit(LOAD_CONST, self.const(1))
+        self.emit(MAKE_RANGE)
+
+
+# Module CodeObjects keyed by AST identity. The VM does not modify code
+# objects, so a program run again, or loaded from an .mpyc cache (see
+# mpyc.py), is compiled at most once.
+_program_cache = {}
+_PROGRAM_CACHE_SIZE = 32
+
+
+def cache_program(ast, code):
+    """Remember code as the compiled form of ast."""
+    if len(_program_cache) >= _PROGRAM_CACHE_SIZE:
+        _program_cache.pop(next(iter(_program_cache)))
+    _program_cache[id(ast)] = (ast, code)
+
+
+def compile_program(ast):
+    """Compile a parsed program into the module CodeObject."""
+    entry = _program_cache.get(id(ast))
+    if entry is not None and entry[0] is ast:
+        return entry[1]
+    code = Compiler().compile_module(ast)
+    cache_program(ast, code)
+    return code
@@ -0,0 +1,127 @@
+"""Hand-written single-pass scanner, an alternative to the PLY lexer.
+
+FastLexer produces exactly the token stream of lexer.IndentLexer over the
+PLY lexer, INDENT and DEDENT included, through the same input()/token()
+interface, so the parser can use either. It makes one finditer pass of a
+single precompiled pattern over the source, built from the lexer's own
+rules in PLY's order, and maps each match to its token through tables.
+Text no rule matches is passed over just as t_error skips it. There is no
+LexToken per match, no token rule call and no token queue; indentation is
+handled as each NEWLINE is met, with levels cached per indentation string.
+"""
+import re
+from functools import partial
+
+from .lexer import reserved, t_NEWLINE, t_NUMBER, t_STRING, t_IDENTIFIER, t_COMMENT
+from .source_index import index_for
+
+# Two-character operators come first, as PLY orders its string rules
+_OPERATORS = {
+    '>=': 'GE', '<=': 'LE', '==': 'EQ', '!=': 'NE',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '%': 'MODULO',
+    '=': 'EQUALS', '(': 'LPAREN', ')': 'RPAREN', '[': 'LBRACKET', ']': 'RBRACKET',
+    ':': 'COLON', ',': 'COMMA', '.': 'DOT', '>': 'GT', '<': 'LT',
+}
+
+# The token rules of the PLY lexer in its order, with the flags PLY uses
+_PATTERN = re.compile('|'.join([
+    f'(?P<NEWLINE>{t_NEWLINE.__doc__})',
+    f'(?P<NUMBER>{t_NUMBER.__doc__})',
+    f'(?P<STRING>{t_STRING.__doc__})',
+    f'(?P<IDENTIFIER>{t_IDENTIFIER.__doc__})',
+    f'(?P<COMMENT>{t_COMMENT.__doc__})',
+    '(?P<OPERATOR>' + '|'.join(re.escape(op) for op in _OPERATORS) + ')',
+]), re.VERBOSE)
+
+
+class FastToken:
+    """A token with the attributes of ply.lex.LexToken."""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class FastLexer:
+    """Drop-in replacement for lexer.IndentLexer."""
+    def __init__(self):
+        self.input('')
+
+    def input(self, text):
+        self.lexdata = text
+        self._tokens = self._scan(text)
+        # token() returns the next token, or None at the end of the input
+        self.token = partial(next, self._tokens, None)
+
+    def __iter__(self):
+        return self._tokens
+
+    @property
+    def source_index(self):
+        """The shared SourceIndex of the input."""
+        return index_for(self.lexdata)
+
+    def _scan(self, data):
+        operators = _OPERATORS
+        keywords = reserved
+        levels = {}
+        stack = [0]
+        lineno = 1
+        # The final DEDENTs carry the line number of the last token
+        last_lineno = 1
+
+        for m in _PATTERN.finditer(data):
+            kind = m.lastgroup
+            if kind == 'IDENTIFIER':
+                value = m.group()
+                yield FastToken(keywords.get(value, 'IDENTIFIER'), value, lineno, m.start())
+            elif kind == 'OPERATOR':
+                value = m.group()
+                yield FastToken(operators[value], value, lineno, m.start())
+            elif kind == 'NEWLINE':
+                text = m.group()
+                pos = m.start()
+                tok = FastToken('NEWLINE', text, lineno, pos)
+                indent = text[text.rfind('\n') + 1:]
+                level = levels.get(indent)
+                if level is None:
+                    # For simplicity, treat tabs as 4 spaces
+                    level = levels[indent] = len(indent) + 3 * indent.count('\t')
+                if level > stack[-1]:
+                    stack.append(level)
+                    yield tok
+                    yield FastToken('INDENT', indent, lineno, pos)
+                elif level < stack[-1]:
+                    dedents = 0
+                    while len(stack) > 1 and level < stack[-1]:
+                        stack.pop()
+                        dedents += 1
+                    if level != stack[-1]:
+                        print(f"IndentationError at line {lineno}")
+                    yield tok
+                    for _ in range(dedents):
+                        yield FastToken('DEDENT', '', lineno, pos)
+                else:
+                    yield tok
+                last_lineno = lineno
+                lineno += len(text) - len(indent)
+                continue
+            elif kind == 'NUMBER':
+                yield FastToken('NUMBER', int(m.group()), lineno, m.start())
+            elif kind == 'STRING':
+                value = m.group()[1:-1].encode().decode('unicode_escape')
+                yield FastToken('STRING', value, lineno, m.start())
+            else:
+                # Comments produce no token
+                continue
+            last_lineno = lineno
+
+        while len(stack) > 1:
+            stack.pop()
+            yield FastToken('DEDENT', '', last_lineno, len(data))
@@ -0,0 +1,60 @@
+"""Hash-consing of parsed programs.
+
+share_subtrees makes structurally equal expressions one node: every
+Number(1) of a program, every x + 1 of a function. A shared subtree is
+kept once, and node identity becomes a key for its structure, so passes
+can memoize per subtree with a dict on id(node).
+
+Expressions are immutable once parsed, with one exception: the resolver
+gives each Identifier the frame slot of its name in the enclosing
+function. Identifiers, and so the expressions holding them, are only
+shared within one function (or the module). A shared node keeps the
+source position of its first occurrence.
+"""
+from .ast_nodes import *
+
+
+def share_subtrees(ast):
+    """Hash-cons a program in place and return it."""
+    table = {}
+
+    def share(node, scope):
+        # node's children are already shared, so their identities stand for
+        # their structure. Values are keyed with their type to keep 1, 1.0
+        # and True apart.
+        kind = type(node)
+        key = [kind, scope if kind is Identifier else None]
+        for name in node._fields:
+            value = getattr(node, name)
+            if isinstance(value, Node):
+                key.append(id(value))
+            elif isinstance(value, list):
+                key.append(tuple(map(id, value)))
+            else:
+                key.append((type(value), value))
+        return table.setdefault(tuple(key), node)
+
+    # Every node with the scope of its children, in preorder. Walking it
+    # backwards visits children before their parents.
+    order = []
+    stack = [(ast, None)]
+    while stack:
+        node, scope = stack.pop()
+        if isinstance(node, FunctionDef):
+            scope = node
+        order.append((node, scope))
+        children = node if isinstance(node, list) else iter_child_nodes(node)
+        stack.extend((child, scope) for child in children)
+
+    for node, scope in reversed(order):
+        if isinstance(node, list):
+            node[:] = [share(item, scope) if isinstance(item, Expression) else item for item in node]
+            continue
+        for name in node._fields:
+            value = getattr(node, name)
+            if isinstance(value, Expression):
+                setattr(node, name, share(value, scope))
+            elif isinstance(value, list):
+                value[:] = [share(item, scope) if isinstance(item, Expression) else item
+                            for item in value]
+    return ast
@@ -0,0 +1,160 @@
+"""Incremental re-lexing for editors that rerun on every keystroke.
+
+IncrementalLexer keeps the TokenTable of the previous source plus one
+checkpoint per NEWLINE token: its position and the indentation stack in
+force before it. A NEWLINE always starts at a
+'\\n' the lexer reached between tokens, so lexing can resume there from
+the snapshot alone. After an edit the lexer resumes at the last
+checkpoint ahead of the change and stops at the first NEWLINE past it
+that lines up with an old checkpoint holding the same indentation stack;
+from there on the old tokens are reused, shifted by the change in length
+and line count.
+
+The one token rule that looks past the end of a line is STRING: a quote
+with no closing quote is scanned to the end of the source before being
+skipped as an error, so an edit anywhere after it can turn it into a
+string. The first such quote is remembered and lexing resumes before it.
+"""
+from array import array
+from bisect import bisect_left
+
+from .lexer import IndentLexer, TokenTable, outer_lexer, t_error
+
+
+def _common_prefix(a, b):
+    """Length of the longest common prefix of a and b."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a, b, limit):
+    """Length of the longest common suffix of a and b, at most limit."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _shifted(column, delta):
+    return column if not delta else array('i', [value + delta for value in column])
+
+
+class IncrementalLexer:
+    """Lexer that re-lexes only the part of the source an edit can change.
+
+    update(new_source) diffs against the previous source; edit(start, end,
+    text) applies a known replacement. Both return the TokenTable of the new
+    source, equal to TokenTable.from_source(new_source). last_relexed is the
+    number of tokens the last call actually lexed.
+    """
+    def __init__(self, source=''):
+        self.source = ''
+        self.table = TokenTable('')
+        self.checkpoints = array('i')
+        self.checkpoint_stacks = []
+        self.open_quote = None
+        self.last_relexed = 0
+        self._relex(source, 0, 0, len(source))
+
+    def update(self, new_source):
+        old = self.source
+        if new_source == old:
+            self.last_relexed = 0
+            return self.table
+        start = _common_prefix(old, new_source)
+        suffix = _common_suffix(old, new_source, min(len(old), len(new_source)) - start)
+        return self._relex(new_source, start, len(old) - suffix, len(new_source) - suffix)
+
+    def edit(self, start, end, text):
+        """Replace source[start:end] with text."""
+        new_source = self.source[:start] + text + self.source[end:]
+        return self._relex(new_source, start, end, start + len(text))
+
+    def _relex(self, source, start, old_end, new_end):
+        old = self.table
+        delta = new_end - old_end
+        table = TokenTable(source)
+        checkpoints = array('i')
+        stacks = []
+
+        # Resume at the last NEWLINE before the edit: no token ahead of it can change
+        if self.open_quote is not None:
+            start = min(start, self.open_quote)
+        k = bisect_left(self.checkpoints, start) - 1
+        inner = outer_lexer.clone()
+        open_quotes = []
+
+        def error(t):
+            if t.value[0] in '"\'':
+                open_quotes.append(t.lexpos)
+            return t_error(t)
+        inner.lexerrorf = error
+        indent_lexer = IndentLexer(inner)
+        indent_lexer.input(source)
+        if k >= 0:
+            n = self._token_index(self.checkpoints[k])
+            for name in ('types', 'lines', 'positions', 'lengths'):
+                getattr(table, name).extend(getattr(old, name)[:n])
+            checkpoints = self.checkpoints[:k]
+            stacks = self.checkpoint_stacks[:k]
+            indent_lexer.indent_stack = list(self.checkpoint_stacks[k])
+            indent_lexer.lexer.lexpos = self.checkpoints[k]
+            indent_lexer.lexer.lineno = old.lines[n]
+        before = tuple(indent_lexer.indent_stack)
+
+        relexed = 0
+        tail_quote = None
+        while True:
+            tok = indent_lexer.token()
+            if not tok:
+                break
+            if tok.type == 'NEWLINE':
+                if tok.lexpos >= new_end:
+                    j = bisect_left(self.checkpoints, tok.lexpos - delta)
+                    if (j < len(self.checkpoints) and self.checkpoints[j] == tok.lexpos - delta
+                            and self.checkpoint_stacks[j] == before):
+                        self._splice(table, checkpoints, stacks, j, delta, tok.lineno)
+                        if self.open_quote is not None and self.open_quote >= self.checkpoints[j]:
+                            tail_quote = self.open_quote + delta
+                        break
+                checkpoints.append(tok.lexpos)
+                stacks.append(before)
+                after = tuple(indent_lexer.indent_stack)
+                if after != before:
+                    before = after
+            table.append(tok)
+            relexed += 1
+
+        self.source = source
+        self.table = table
+        self.checkpoints = checkpoints
+        self.checkpoint_stacks = stacks
+        self.open_quote = open_quotes[0] if open_quotes else tail_quote
+        self.last_relexed = relexed
+        return table
+
+    def _token_index(self, position):
+        """Index in the table of the NEWLINE token at a checkpoint position."""
+        # INDENT and DEDENT tokens share the position but follow the NEWLINE
+        return bisect_left(self.table.positions, position)
+
+    def _splice(self, table, checkpoints, stacks, j, delta, lineno):
+        """Append the old tokens from checkpoint j on, shifted into the new source."""
+        old = self.table
+        m = self._token_index(self.checkpoints[j])
+        table.types.extend(old.types[m:])
+        table.lines.extend(_shifted(old.lines[m:], lineno - old.lines[m]))
+        table.positions.extend(_shifted(old.positions[m:], delta))
+        table.lengths.extend(old.lengths[m:])
+        checkpoints.extend(_shifted(self.checkpoints[j:], delta))
+        stacks.extend(self.checkpoint_stacks[j:])
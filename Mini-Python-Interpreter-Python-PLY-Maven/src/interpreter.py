@@ -1,18 +1,73 @@
+from types import MethodType
+
 from .ast_nodes import *
+from . import closure_compiler, memo, pyemit, quicken
+from .compiler import compile_program
+from .limits import LIMITED, ResourceLimitExceeded
+from .resolver import resolve_function
+from .runtime import FunctionTable
+from .vm import DEFAULT_STACK_BUDGET, VirtualMachine
+
+# Marks a frame slot that has not been assigned yet
+_UNBOUND = object()
 
 class Interpreter:
-    """Interpreter for the custom AST."""
-    def __init__(self, output_buffer=None):
+    """Interpreter for the custom AST.
+
+    engine picks the default execution strategy used by execute(): "tree"
+    walks the AST, "vm" runs bytecode on the stack machine and "closure"
+    runs the AST compiled to nested Python closures. "native" translates
+    the AST to Python source run as CPython bytecode, falling back to
+    "closure" for programs outside its subset. The "vm" engine keeps
+    its own call stack, so its recursion depth is limited by stack_budget
+    (bytes) instead of Python's recursion limit. With adaptive, "tree"
+    quickens the operator sites it runs often (see src/quicken.py) and
+    quickener counts how that went. Call sites of "tree" cache their
+    callee, checked against the version of the functions table. With
+    memoize, True or a table size, "tree" keeps the results of pure
+    functions (see src/memo.py) in the tables of memo. With limits, a
+    src/limits.py Limits, every run is held to its budgets; only "tree"
+    enforces them.
+    """
+    def __init__(self, output_buffer=None, engine="tree", stack_budget=DEFAULT_STACK_BUDGET,
+                 adaptive=False, memoize=False, limits=None):
+        # Module-level variables; function locals live in slot-indexed frames
         self.environment = {}
-        self.functions = {}
+        self.frame = None
+        self.frame_stack = []
+        self.functions = FunctionTable()
         self.return_value = None
         self.in_loop = False
         self.break_loop = False
         self.continue_loop = False
         self.output_buffer = output_buffer
+        self.engine = engine
+        self.stack_budget = stack_budget
+        self.quickener = None
+        if adaptive:
+            self.quickener = quicken.Quickener()
+            # The adaptive evaluate methods shadow the generic ones
+            for kind, evaluate in quicken.QUICKENED.items():
+                setattr(self, f'evaluate_{kind.__name__}', MethodType(evaluate, self))
+        self.memo = None
+        if memoize:
+            self.memo = memo.Memoizer(memo.MEMO_SIZE if memoize is True else memoize)
+        self.limits = limits
+        if limits is not None:
+            if adaptive:
+                # Quickened sites run operators without charging what they build
+                raise Exception("adaptive cannot be combined with limits")
+            for kind, evaluate in LIMITED.items():
+                setattr(self, f'evaluate_{kind}', MethodType(evaluate, self))
+
+    def report(self):
+        """What the adaptive sites and the memo tables did, one part each."""
+        return "\n".join(part.report() for part in (self.quickener, self.memo) if part is not None)
 
     def _print(self, *args):
         text = " ".join(map(str, args))
+        if self.limits is not None:
+            self.limits.write(text)
         if self.output_buffer:
             self.output_buffer.write(text + "\n")
         else:
@@ -46,12 +101,30 @@ class Interpreter:
         return node.value
 
     def evaluate_Identifier(self, node):
-        if node.name in self.environment:
+        # Only identifiers inside function bodies carry a slot
+        if node.slot is not None:
+            value = self.frame[node.slot]
+            if value is not _UNBOUND:
+                return value
+        elif node.name in self.environment:
             return self.environment[node.name]
-        elif node.name in self.functions:
-            return self.functions[node.name]
+        # A function read as a value, cached along with the table version
+        functions = self.functions
+        cache = node.cache
+        if cache is not None and cache[0] == functions.version:
+            return cache[1]
+        if node.name in functions:
+            func = functions[node.name]
+            node.cache = (functions.version, func)
+            return func
         raise Exception(f"Undefined variable or function: {node.name}")
 
+    def _store(self, target, value):
+        if target.slot is not None:
+            self.frame[target.slot] = value
+        else:
+            self.environment[target.name] = value
+
     def evaluate_BinaryOp(self, node):
         left = self.evaluate(node.left)
         right = self.evaluate(node.right)
@@ -99,7 +172,7 @@ class Interpreter:
 
     def evaluate_Assign(self, node):
         value = self.evaluate(node.expr)
-        self.environment[node.name.name] = value
+        self._store(node.name, value)
         return value
 
     def evaluate_Print(self, node):
@@ -125,7 +198,10 @@ class Interpreter:
     def evaluate_WhileLoop(self, node):
         self.in_loop = True
         result = None
+        limits = self.limits
         while self.evaluate(node.condition):
+            if limits is not None:
+                limits.tick()
             if self.break_loop:
                 self.break_loop = False
                 break
@@ -139,26 +215,31 @@ class Interpreter:
     def evaluate_ForLoop(self, node):
         self.in_loop = True
         result = None
+        limits = self.limits
         iterable = self.evaluate(node.iterable)
         if isinstance(iterable, range):
             for i in iterable:
+                if limits is not None:
+                    limits.tick()
                 if self.break_loop:
                     self.break_loop = False
                     break
                 if self.continue_loop:
                     self.continue_loop = False
                     continue
-                self.environment[node.var.name] = i
+                self._store(node.var, i)
                 result = self.evaluate(node.body)
         elif isinstance(iterable, (list, tuple)):
             for item in iterable:
+                if limits is not None:
+                    limits.tick()
                 if self.break_loop:
                     self.break_loop = False
                     break
                 if self.continue_loop:
                     self.continue_loop = False
                     continue
-                self.environment[node.var.name] = item
+                self._store(node.var, item)
                 result = self.evaluate(node.body)
         else:
             raise Exception(f"Cannot iterate over {type(iterable)}")
@@ -167,35 +248,58 @@ class Interpreter:
 
     def evaluate_FunctionDef(self, node):
         # Store the function definition in the functions dictionary
+        resolve_function(node)
         self.functions[node.name] = node
         return None
 
-    def evaluate_FunctionCall(self, node):
+    def _lookup_call(self, node):
+        """Find the callee of node and cache it in the node's inline cache."""
         func_name = node.name.name if hasattr(node.name, 'name') else node.name
-        if func_name not in self.functions:
+        functions = self.functions
+        if func_name not in functions:
             raise Exception(f"Undefined function: {func_name}")
-        func = self.functions[func_name]
+        func = functions[func_name]
         if not isinstance(func, FunctionDef):
             raise Exception(f"{func_name} is not a function")
+        frame_size = len(func.varnames or resolve_function(func))
+        node.cache = (functions.version, func, len(func.params), frame_size)
+        return node.cache
+
+    def evaluate_FunctionCall(self, node):
+        # The cache is valid while the functions table keeps its version,
+        # which changes whenever a function is defined
+        cache = node.cache
+        if cache is None or cache[0] != self.functions.version:
+            cache = self._lookup_call(node)
         args = [self.evaluate(arg) for arg in node.args]
-        
-        old_env = self.environment.copy()
-        self.environment = {}
-        
-        for param, arg in zip(func.params, args):
-            param_name = param.name if hasattr(param, 'name') else param
-            self.environment[param_name] = arg
-            
+        # Extra arguments are dropped like zip()
+        del args[cache[2]:]
+        if self.memo is not None:
+            return self.memo.call(self, cache, args)
+        return self._invoke(cache, args)
+
+    def _invoke(self, cache, args):
+        """Run the function of a call site's cache with its arguments."""
+        # The argument list becomes the frame: parameters fill the first
+        # slots and locals start unbound
+        _, func, _, frame_size = cache
+        if self.limits is not None:
+            self.limits.tick()
+        if frame_size > len(args):
+            args.extend([_UNBOUND] * (frame_size - len(args)))
+
+        self.frame_stack.append(self.frame)
+        self.frame = args
+
         # Store old return value to support nested calls
         old_return = self.return_value
         self.return_value = None
-        
-        self.evaluate(func.body)
-        
-        result = self.return_value
-        self.return_value = old_return
-        
-        self.environment = old_env
+        try:
+            self.evaluate(func.body)
+            result = self.return_value
+        finally:
+            self.return_value = old_return
+            self.frame = self.frame_stack.pop()
         return result
 
     def evaluate_Return(self, node):
@@ -231,6 +335,8 @@ class Interpreter:
     def evaluate_TryExcept(self, node):
         try:
             return self.evaluate(node.try_body)
+        except ResourceLimitExceeded:
+            raise
         except Exception:
             return self.evaluate(node.except_body)
 
@@ -285,10 +391,44 @@ class Interpreter:
                 return self.return_value
         return result
 
-    def execute(self, code):
-        """Execute code by parsing and interpreting it."""
+    def run(self, ast, engine=None):
+        """Run a parsed program with the given engine, or the default one."""
+        engine = engine or self.engine
+        if self.limits is not None:
+            if engine != "tree":
+                raise Exception(f"Resource limits are only enforced by the tree engine, not {engine}")
+            self.limits.start()
+        if engine == "tree":
+            return self.interpret(ast)
+        elif engine == "vm":
+            return VirtualMachine(self, self.stack_budget).run(compile_program(ast))
+        elif engine == "closure":
+            return closure_compiler.compile_program(ast).run(self)
+        elif engine == "native":
+            return pyemit.run(ast, self)
+        raise Exception(f"Unknown engine: {engine}")
+
+    def execute(self, code, engine=None, optimize=False):
+        """Execute code by parsing and interpreting it.
+
+        With optimize, the program runs as src/optimizer.py rewrites it.
+        """
         from .myparser import parser
         ast = parser.parse(code)
         if ast is None:
             raise Exception("Failed to parse code")
-        return self.interpret(ast)
+        if optimize:
+            from .optimizer import optimize_program
+            ast = optimize_program(ast)
+        return self.run(ast, engine)
+
+    def execute_file(self, path, engine=None, optimize=False):
+        """Execute a script, through the .mpyc cache beside it."""
+        from .mpyc import parse_file
+        ast = parse_file(path)
+        if ast is None:
+            raise Exception("Failed to parse code")
+        if optimize:
+            from .optimizer import optimize_program
+            ast = optimize_program(ast)
+        return self.run(ast, engine)
@@ -1,5 +1,16 @@
-from ply import lex
+import csv
+import io
 import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import Counter, namedtuple
+
+from ply import lex
+from . import tables
+from .source_index import index_for
 
 # List of token names
 tokens = (
@@ -93,21 +104,14 @@ reserved = {
     'not': 'NOT'
 }
 
-# Track indentation
-indent_stack = [0]
-
 def t_NEWLINE(t):
     r'\n+[ \t]*'
     t.lexer.lineno += t.value.count('\n')
     return t
 
-# Add a function to handle end of file
+# End of input. IndentLexer emits the closing DEDENTs from its own
+# indentation stack; having the rule keeps lexpos at the end of the input.
 def t_eof(t):
-    # Generate DEDENT tokens for any remaining indentation levels
-    while len(indent_stack) > 1:
-        indent_stack.pop()
-        t.type = 'DEDENT'
-        return t
     return None
 
 # Regular expression rules with some action code
@@ -142,7 +146,7 @@ def t_error(t):
     t.lexer.skip(1)
 
 # Build the inner lexer
-outer_lexer = lex.lex()
+outer_lexer = tables.build_lexer(sys.modules[__name__])
 
 class IndentLexer(object):
     def __init__(self, lexer):
@@ -152,11 +156,18 @@ class IndentLexer(object):
         self.lineno = 1
 
     def input(self, text):
+        self.lexdata = text
         self.lexer.input(text)
+        self.lexer.lineno = 1
         self.token_queue = []
         self.indent_stack = [0]
         self.lineno = 1
 
+    @property
+    def source_index(self):
+        """The shared SourceIndex of the input."""
+        return index_for(self.lexdata)
+
     def token(self):
         if self.token_queue:
             return self.token_queue.pop(0)
@@ -225,89 +236,254 @@ class IndentLexer(object):
 
         return tok
 
-# The main lexer used by parser
+# A shared lexer for single-threaded scripts. It is not safe to use from
+# several threads; CustomParser gives each thread a lexer of its own.
 lexer = IndentLexer(outer_lexer)
 
-def tokenize(code):
-    """Tokenize the input code and return a list of tokens with their details."""
-    # Reset the lexer state
-    lexer.lineno = 1
-    lexer.input(code)
-    tokens = []
-    
+# Lightweight token record yielded by iter_tokens; value is the token text
+Token = namedtuple('Token', 'type value line lexpos')
+
+def read_source(path):
+    """Read a source file through mmap, decoding it without an extra bytes copy."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return str(data, 'utf-8')
+
+def _lex(source):
+    """Yield the raw PLY tokens of source from a fresh clone of the lexer."""
+    if isinstance(source, os.PathLike):
+        source = read_source(source)
+    indent_lexer = IndentLexer(outer_lexer.clone())
+    indent_lexer.input(source)
+    next_token = indent_lexer.token
     while True:
-        tok = lexer.token()
+        tok = next_token()
         if not tok:
-            break
-        token_info = {
-            "type": tok.type,
-            "value": str(tok.value),
-            "line": tok.lineno,
-            "lexpos": tok.lexpos
-        }
-        tokens.append(token_info)
-    
-    return tokens
+            return
+        yield tok
+
+def iter_tokens(source):
+    """Yield Token records for source lazily.
+
+    source is the code itself, or an os.PathLike naming a file to read with
+    read_source. Each call lexes with its own clone of the lexer, so a
+    half-consumed generator does not disturb the parser's lexer.
+    """
+    for tok in _lex(source):
+        yield Token(tok.type, str(tok.value), tok.lineno, tok.lexpos)
+
+# Token types as small ints, in the order of the tokens tuple
+TYPE_CODES = {name: code for code, name in enumerate(tokens)}
+
+_NUMBER_RE = re.compile(t_NUMBER.__doc__)
+_STRING_RE = re.compile(t_STRING.__doc__)
+
+def token_length(source, tok):
+    """Length of a token's text in the source it was lexed from."""
+    if tok.type == 'STRING':
+        return _STRING_RE.match(source, tok.lexpos).end() - tok.lexpos
+    if tok.type == 'NUMBER':
+        # Only leading zeros make the text longer than the number's digits
+        if source[tok.lexpos] != '0':
+            return len(str(tok.value))
+        return _NUMBER_RE.match(source, tok.lexpos).end() - tok.lexpos
+    # DEDENT values are empty; an INDENT's is the tail of the NEWLINE
+    # before it; every other value is the matched text
+    return len(tok.value)
+
+class TokenTable:
+    """Columnar store of a token stream.
+
+    Types are kept as TYPE_CODES in an array('b'); lines, positions and the
+    length of each token's text in the source in array('i') columns. Values
+    are sliced out of the source (and unescaped for strings) only when asked
+    for, so a token costs 13 bytes instead of a dict and its strings.
+    Indexing and iteration yield the same Token records as iter_tokens.
+    """
+    COLUMNS = Token._fields
+
+    def __init__(self, source=''):
+        self.source = source
+        self.types = array('b')
+        self.lines = array('i')
+        self.positions = array('i')
+        self.lengths = array('i')
+
+    @classmethod
+    def from_source(cls, source):
+        """Lex source (code or an os.PathLike) into a new table."""
+        if isinstance(source, os.PathLike):
+            source = read_source(source)
+        table = cls(source)
+        for tok in _lex(source):
+            table.append(tok)
+        return table
+
+    def append(self, tok):
+        """Add a PLY token lexed from this table's source."""
+        self.types.append(TYPE_CODES[tok.type])
+        self.lines.append(tok.lineno)
+        self.positions.append(tok.lexpos)
+        self.lengths.append(token_length(self.source, tok))
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_name(self, i):
+        return tokens[self.types[i]]
+
+    @property
+    def source_index(self):
+        """The shared SourceIndex of the table's source."""
+        return index_for(self.source)
+
+    def column(self, i):
+        """Column of token i, counting from 1."""
+        return self.source_index.position(self.positions[i])[1]
+
+    def value(self, i):
+        """The value of token i, as str(tok.value) would give it."""
+        code = self.types[i]
+        start = self.positions[i]
+        if code == _INDENT:
+            end = start + self.lengths[i - 1]
+            return self.source[end - self.lengths[i]:end]
+        text = self.source[start:start + self.lengths[i]]
+        if code == _STRING:
+            return text[1:-1].encode().decode('unicode_escape')
+        if code == _NUMBER:
+            return str(int(text))
+        return text
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return Token(tokens[self.types[i]], self.value(i), self.lines[i], self.positions[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def values(self):
+        return [self.value(i) for i in range(len(self))]
+
+    def type_counts(self):
+        """Number of tokens of each type name, counted on the int codes."""
+        return {tokens[code]: count for code, count in Counter(self.types).items()}
+
+    def to_frame(self):
+        """A pandas DataFrame of the tokens.
+
+        The type codes, lines and positions are wrapped without copying; only
+        the value column is built.
+        """
+        import numpy as np
+        import pandas as pd
+        types = pd.Categorical.from_codes(np.frombuffer(self.types, dtype=np.int8),
+                                          categories=list(tokens))
+        return pd.DataFrame({
+            'type': types,
+            'value': self.values(),
+            'line': np.frombuffer(self.lines, dtype=np.intc),
+            'lexpos': np.frombuffer(self.positions, dtype=np.intc),
+        }, copy=False)
+
+    def iter_csv(self, chunk_size=65536):
+        """Yield the table as CSV text in chunks of about chunk_size characters."""
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+        writer.writerow(self.COLUMNS)
+        value, lines, positions = self.value, self.lines, self.positions
+        for i, code in enumerate(self.types):
+            writer.writerow((tokens[code], value(i), lines[i], positions[i]))
+            if buf.tell() >= chunk_size:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    def to_csv(self):
+        return ''.join(self.iter_csv())
+
+_STRING = TYPE_CODES['STRING']
+_NUMBER = TYPE_CODES['NUMBER']
+_INDENT = TYPE_CODES['INDENT']
+
+def tokenize(code):
+    """Tokenize the input code and return a list of tokens with their details."""
+    return [tok._asdict() for tok in iter_tokens(code)]
+
+TOKEN_CATEGORIES = {
+    "Keywords": ["IF", "ELSE", "WHILE", "FOR", "IN", "DEF", "RETURN", "BREAK", "CONTINUE", "TRY", "EXCEPT", "PRINT", "LEN", "RANGE", "AND", "OR", "NOT", "TRUE", "FALSE"],
+    "Operators": ["PLUS", "MINUS", "TIMES", "DIVIDE", "MODULO", "EQUALS", "GT", "LT", "GE", "LE", "EQ", "NE"],
+    "Delimiters": ["LPAREN", "RPAREN", "LBRACKET", "RBRACKET", "COLON", "COMMA", "DOT"],
+    "Literals": ["NUMBER", "STRING"],
+    "Identifiers": ["IDENTIFIER"],
+    "Structure": ["NEWLINE"]
+}
 
 def format_token_output(tokens):
-    """Format the tokens into a structured, readable output."""
-    if not tokens:
+    """Format the tokens into a structured, readable output.
+
+    tokens is any iterable of token dicts (as from tokenize) or Token records
+    (as from iter_tokens). It is consumed once: column widths and summary
+    counts are gathered in the same pass that collects the rows.
+    """
+    rows = []
+    token_types = {}
+    # Minimum column widths, before the two characters of padding
+    max_type_len, max_value_len, max_line_len = 13, 13, 8
+    for token in tokens:
+        if isinstance(token, dict):
+            token = (token['type'], token['value'], token['line'], token['lexpos'])
+        type_str, value_str, line_str, pos_str = row = tuple(map(str, token))
+        rows.append(row)
+        token_types[type_str] = token_types.get(type_str, 0) + 1
+        if len(type_str) > max_type_len:
+            max_type_len = len(type_str)
+        if len(value_str) > max_value_len:
+            max_value_len = len(value_str)
+        if len(line_str) > max_line_len:
+            max_line_len = len(line_str)
+
+    if not rows:
         return "No tokens found in the input code."
-    
+
+    max_type_len += 2
+    max_value_len += 2
+    max_line_len += 2
+
     # Create a formatted table-like output with fixed-width columns
     output = ["Lexical Analysis Results:\n"]
-    
-    # Find the maximum length for each column to ensure proper alignment
-    max_type_len = max(len(str(token['type'])) for token in tokens) + 2
-    max_value_len = max(len(str(token['value'])) for token in tokens) + 2
-    max_line_len = max(len(str(token['line'])) for token in tokens) + 2
-    
-    # Ensure minimum column widths
-    max_type_len = max(max_type_len, 15)
-    max_value_len = max(max_value_len, 15)
-    max_line_len = max(max_line_len, 10)
-    
+
     # Create header with proper spacing
     header_type = "Token Type".ljust(max_type_len)
     header_value = "Token Value".ljust(max_value_len)
     header_line = "Line".ljust(max_line_len)
     header_pos = "Position"
-    
+
     output.append(f"{header_type}{header_value}{header_line}{header_pos}")
     output.append("-" * (max_type_len + max_value_len + max_line_len + 10))
-    
+
     # Format each token with consistent spacing
-    for token in tokens:
-        type_str = str(token['type']).ljust(max_type_len)
-        value_str = str(token['value']).ljust(max_value_len)
-        line_str = str(token['line']).ljust(max_line_len)
-        pos_str = str(token['lexpos'])
-        output.append(f"{type_str}{value_str}{line_str}{pos_str}")
-    
+    for type_str, value_str, line_str, pos_str in rows:
+        output.append(f"{type_str.ljust(max_type_len)}{value_str.ljust(max_value_len)}"
+                      f"{line_str.ljust(max_line_len)}{pos_str}")
+
     # Add a summary
     output.append("\nToken Summary:")
-    token_types = {}
-    for token in tokens:
-        token_types[token['type']] = token_types.get(token['type'], 0) + 1
-    
     for type_name, count in sorted(token_types.items()):
         output.append(f"- {type_name}: {count} tokens")
-    
+
     # Add token categories
     output.append("\nToken Categories:")
-    categories = {
-        "Keywords": ["IF", "ELSE", "WHILE", "FOR", "IN", "DEF", "RETURN", "BREAK", "CONTINUE", "TRY", "EXCEPT", "PRINT", "LEN", "RANGE", "AND", "OR", "NOT", "TRUE", "FALSE"],
-        "Operators": ["PLUS", "MINUS", "TIMES", "DIVIDE", "MODULO", "EQUALS", "GT", "LT", "GE", "LE", "EQ", "NE"],
-        "Delimiters": ["LPAREN", "RPAREN", "LBRACKET", "RBRACKET", "COLON", "COMMA", "DOT"],
-        "Literals": ["NUMBER", "STRING"],
-        "Identifiers": ["IDENTIFIER"],
-        "Structure": ["NEWLINE"]
-    }
-    
-    for category, types in categories.items():
+    for category, types in TOKEN_CATEGORIES.items():
         count = sum(token_types.get(t, 0) for t in types)
         output.append(f"- {category}: {count} tokens")
-    
+
     return "\n".join(output)
 
 # Example usage for testing
@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'BREAK', 'COLON', 'COMMA', 'CONTINUE', 'DEDENT', 'DEF', 'DIVIDE', 'DOT', 'ELSE', 'EQ', 'EQUALS', 'EXCEPT', 'FALSE', 'FOR', 'GE', 'GT', 'IDENTIFIER', 'IF', 'IN', 'INDENT', 'LBRACKET', 'LE', 'LEN', 'LPAREN', 'LT', 'MINUS', 'MODULO', 'NE', 'NEWLINE', 'NOT', 'NUMBER', 'OR', 'PLUS', 'PRINT', 'RANGE', 'RBRACKET', 'RETURN', 'RPAREN', 'STRING', 'TIMES', 'TRUE', 'TRY', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NEWLINE>\\n+[ \\t]*)|(?P<t_NUMBER>\\d+)|(?P<t_STRING>"[^"\\\\]*(\\\\.[^"\\\\]*)*"|\\\'[^\\\'\\\\]*(\\\\.[^\\\'\\\\]*)*\\\')|(?P<t_IDENTIFIER>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_COMMENT>\\#.*)|(?P<t_DOT>\\.)|(?P<t_EQ>==)|(?P<t_GE>>=)|(?P<t_LBRACKET>\\[)|(?P<t_LE><=)|(?P<t_LPAREN>\\()|(?P<t_NE>!=)|(?P<t_PLUS>\\+)|(?P<t_RBRACKET>\\])|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_COLON>:)|(?P<t_COMMA>,)|(?P<t_DIVIDE>/)|(?P<t_EQUALS>=)|(?P<t_GT>>)|(?P<t_LT><)|(?P<t_MINUS>-)|(?P<t_MODULO>%)', [None, ('t_NEWLINE', 'NEWLINE'), ('t_NUMBER', 'NUMBER'), ('t_STRING', 'STRING'), None, None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_COMMENT', 'COMMENT'), (None, 'DOT'), (None, 'EQ'), (None, 'GE'), (None, 'LBRACKET'), (None, 'LE'), (None, 'LPAREN'), (None, 'NE'), (None, 'PLUS'), (None, 'RBRACKET'), (None, 'RPAREN'), (None, 'TIMES'), (None, 'COLON'), (None, 'COMMA'), (None, 'DIVIDE'), (None, 'EQUALS'), (None, 'GT'), (None, 'LT'), (None, 'MINUS'), (None, 'MODULO')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {'INITIAL': 't_eof'}
+_grammar_version = '85b00323b412f6bd'
@@ -0,0 +1,213 @@
+"""Resource limits for running untrusted programs on the tree-walker.
+
+An Interpreter made with limits=Limits(...) charges every run of a program
+against four budgets, each None for no limit:
+
+  steps         loop iterations and function calls, the back-edges and
+                calls without which a program ends after as many steps
+                as it has statements
+  seconds       wall-clock time from the start of the run, read every
+                CHECK_INTERVAL steps, or on every step with no
+                allocation budget
+  output_bytes  bytes printed, UTF-8 encoded with their newlines
+  allocation    characters and list elements of the strings and lists a
+                program builds, and bytes of the ints it builds past
+                INT_FREE_BYTES, in total, not only those still alive
+
+Going over a budget raises the ResourceLimitExceeded subclass of that
+budget. A program cannot catch it: try/except lets it through.
+
+Allocation is charged where strings, lists and ints are built, by
+evaluate functions that shadow those of the Interpreter, as the adaptive
+ones of src/quicken.py do. An operation whose result could take more
+memory than the program has used so far, such as "ab" * n, a replace or
+a product of ints, is charged before it runs, so it fails without
+allocating. Other results, such as a concatenation or a sum, are at most
+about the size of their operands and are charged after.
+
+Ints are charged because a step is not bounded in time by itself: each
+squaring of x = x * x doubles the size of x, so that a few dozen steps
+would run for hours. With an allocation budget, that budget bounds how
+long a step can take, and the clock is read only every CHECK_INTERVAL
+steps; without one, it is read on every step. A step still runs to its
+end, so a run can outlast seconds by its last steps.
+"""
+import math
+import sys
+import time
+
+from .runtime import binary_function, string_method, unary_function
+
+# The most steps between two checks of the step budget and the clock
+CHECK_INTERVAL = 256
+
+# The bytes of an int that are not charged, those of a machine word
+INT_FREE_BYTES = 8
+INT_FREE_BITS = INT_FREE_BYTES * 8 + 7
+
+
+class ResourceLimitExceeded(Exception):
+    """A run went over one of the budgets of its Limits.
+
+    limit names the budget and value is its size.
+    """
+    limit, description, unit = None, "Resource", "units"
+
+    def __init__(self, value):
+        super().__init__(f"{self.description} limit exceeded: more than {value} {self.unit}")
+        self.value = value
+
+
+class StepLimitExceeded(ResourceLimitExceeded):
+    limit, description, unit = 'steps', "Step", "steps"
+
+
+class TimeLimitExceeded(ResourceLimitExceeded):
+    limit, description, unit = 'seconds', "Time", "seconds"
+
+
+class OutputLimitExceeded(ResourceLimitExceeded):
+    limit, description, unit = 'output_bytes', "Output", "bytes of output"
+
+
+class AllocationLimitExceeded(ResourceLimitExceeded):
+    limit, description, unit = 'allocation', "Allocation", "characters and list elements"
+
+
+class Limits:
+    """The budgets of each run of an Interpreter and what the last run used.
+
+    start() begins a run: it resets steps, output and allocated, the use
+    of the budgets, and starts the clock.
+    """
+    def __init__(self, steps=None, seconds=None, output_bytes=None, allocation=None):
+        self.max_steps = steps
+        self.max_seconds = seconds
+        self.max_output = output_bytes
+        self.max_allocation = allocation
+        self.start()
+
+    def start(self):
+        # Bytes of output left, counted down from the budget or from so
+        # many that no program can print them
+        self._output_budget = sys.maxsize if self.max_output is None else self.max_output
+        self._output_left = self._output_budget
+        self.allocated = 0
+        self._deadline = math.inf
+        if self.max_seconds is not None:
+            self._deadline = time.monotonic() + self.max_seconds
+        # Steps before the last check, and steps left until the next one
+        self._counted = 0
+        self._countdown = self._chunk = self._next_chunk()
+
+    @property
+    def steps(self):
+        return self._counted + self._chunk - self._countdown
+
+    @property
+    def output(self):
+        return self._output_budget - self._output_left
+
+    def _next_chunk(self):
+        if self.max_seconds is not None and self.max_allocation is None:
+            # Nothing bounds how long a step takes, so every step reads the clock
+            return 1
+        if self.max_steps is None:
+            return CHECK_INTERVAL
+        # Stop on the first step over the budget, or right away past it
+        return max(min(CHECK_INTERVAL, self.max_steps + 1 - self._counted), 1)
+
+    def tick(self):
+        """Count a step: one iteration of a loop or one call."""
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._check()
+
+    def _check(self):
+        self._counted += self._chunk
+        # Past a budget, every later step checks again and fails again
+        if self.max_steps is not None and self._counted > self.max_steps:
+            self._countdown = self._chunk = 0
+            raise StepLimitExceeded(self.max_steps)
+        if time.monotonic() > self._deadline:
+            self._countdown = self._chunk = 0
+            raise TimeLimitExceeded(self.max_seconds)
+        self._countdown = self._chunk = self._next_chunk()
+
+    def write(self, text):
+        """Count a line of output, before it is written."""
+        self._output_left -= (len(text) if text.isascii()
+                              else len(text.encode('utf-8', 'surrogatepass'))) + 1
+        if self._output_left < 0:
+            raise OutputLimitExceeded(self.max_output)
+
+    def allocate(self, size):
+        """Count size characters, list elements or bytes about to be built."""
+        self.allocated += size
+        if self.max_allocation is not None and self.allocated > self.max_allocation:
+            raise AllocationLimitExceeded(self.max_allocation)
+
+
+# The types whose building is charged
+SEQUENCES = (str, list)
+
+
+def evaluate_BinaryOp(interpreter, node):
+    left = interpreter.evaluate(node.left)
+    right = interpreter.evaluate(node.right)
+    op = node.op
+    if op == '+':
+        result = left + right
+    elif op == '-':
+        result = left - right
+    elif op == '*':
+        # A repeated sequence or a product is charged before it is built
+        if left.__class__ is int and right.__class__ is int:
+            bits = left.bit_length() + right.bit_length()
+            if bits > INT_FREE_BITS:
+                interpreter.limits.allocate(bits >> 3)
+        elif left.__class__ in SEQUENCES and isinstance(right, int):
+            interpreter.limits.allocate(len(left) * max(right, 0))
+        elif right.__class__ in SEQUENCES and isinstance(left, int):
+            interpreter.limits.allocate(len(right) * max(left, 0))
+        return left * right
+    else:
+        return binary_function(op)(left, right)
+    cls = result.__class__
+    if cls is int:
+        if result.bit_length() > INT_FREE_BITS:
+            interpreter.limits.allocate(result.bit_length() >> 3)
+    elif cls in SEQUENCES:
+        interpreter.limits.allocate(len(result))
+    return result
+
+
+def evaluate_UnaryOp(interpreter, node):
+    result = unary_function(node.op)(interpreter.evaluate(node.expr))
+    if result.__class__ is int and result.bit_length() > INT_FREE_BITS:
+        interpreter.limits.allocate(result.bit_length() >> 3)
+    return result
+
+
+def evaluate_ListNode(interpreter, node):
+    interpreter.limits.allocate(len(node.elements))
+    return [interpreter.evaluate(elem) for elem in node.elements]
+
+
+def evaluate_StringMethod(interpreter, node):
+    string_obj = interpreter.evaluate(node.expr)
+    args = [interpreter.evaluate(arg) for arg in node.args]
+    if (node.method == 'replace' and isinstance(string_obj, str) and len(args) == 2
+            and isinstance(args[0], str) and isinstance(args[1], str)):
+        # The size of the result, worked out before it is built
+        old, new = args
+        interpreter.limits.allocate(len(string_obj) + string_obj.count(old) * (len(new) - len(old)))
+        return string_method(string_obj, node.method, args)
+    result = string_method(string_obj, node.method, args)
+    interpreter.limits.allocate(len(result))
+    return result
+
+
+# The evaluate functions that shadow the Interpreter's under limits
+LIMITED = {'BinaryOp': evaluate_BinaryOp, 'UnaryOp': evaluate_UnaryOp, 'ListNode': evaluate_ListNode,
+           'StringMethod': evaluate_StringMethod}
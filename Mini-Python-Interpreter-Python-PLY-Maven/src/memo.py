@@ -0,0 +1,182 @@
+"""Memoization of pure functions for the tree-walker.
+
+An Interpreter made with memoize calls functions through a Memoizer. It
+keeps, for each function pure_functions finds pure, a MemoTable of its
+results by arguments, and a call whose arguments are in the table
+returns the result without running the body. Tables drop the least
+recently used result beyond memoize entries, MEMO_SIZE for True.
+
+A function is pure when what a call returns depends on its arguments
+alone and the call changes nothing outside it: its body prints nothing,
+defines no function, reads and writes only its parameters and locals,
+catches no errors, as whether a deep call fails depends on the stack it
+runs on, and calls only pure functions. Which functions are pure depends
+on the functions table, where a later def can replace a callee, so the
+analysis is redone and every table emptied whenever its version changes.
+
+Only calls whose arguments are all of KEY_TYPES are memoized, keyed on
+the types as well so that 1, 1.0 and True stay apart, and on the hex of
+floats so that 0.0 and -0.0 do. Only results of those types are kept, so
+a table never hands one list to two callers.
+
+A hit skips the body, so it also skips the loop flags a loop in the body
+leaves behind in the tree-walker (see src/optimizer.py); the hit returns
+what the other engines would.
+"""
+from collections import OrderedDict
+
+from .ast_nodes import FunctionCall, FunctionDef, Identifier, Print, TryExcept
+from .resolver import assigned_names
+from .visitor import walk
+
+MEMO_SIZE = 1024
+
+KEY_TYPES = frozenset({int, float, bool, str, type(None)})
+
+# Returned by MemoTable.get for a key it does not hold
+MISS = object()
+
+
+def local_facts(func):
+    """Whether func's body is pure but for its calls, and the names it calls."""
+    local = {param.name if hasattr(param, 'name') else param for param in func.params}
+    local.update(assigned_names(func.body))
+    callees = set()
+    call_names = set()
+    for node in walk(func.body):
+        if isinstance(node, (Print, FunctionDef, TryExcept)):
+            return False, callees
+        if isinstance(node, FunctionCall):
+            name = node.name.name if hasattr(node.name, 'name') else node.name
+            callees.add(name)
+            call_names.add(id(node.name))
+        elif isinstance(node, Identifier) and id(node) not in call_names and node.name not in local:
+            return False, callees
+    return True, callees
+
+
+def pure_functions(functions, facts=None):
+    """The names of the pure functions of a functions table.
+
+    facts caches local_facts by id of the FunctionDef, holding the node
+    so the id stays its own.
+    """
+    if facts is None:
+        facts = {}
+    local = {}
+    for name, func in functions.items():
+        if isinstance(func, FunctionDef):
+            if id(func) not in facts:
+                facts[id(func)] = (func, local_facts(func))
+            local[name] = facts[id(func)][1]
+    pure = {name for name, (ok, _) in local.items() if ok}
+    # Drop the functions that call one that is not pure, until none does
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            if not local[name][1] <= pure:
+                pure.discard(name)
+                changed = True
+    return pure
+
+
+class MemoTable:
+    """The results of one function by argument key, at most size of them."""
+    def __init__(self, size):
+        self.size = size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        results = self.results
+        if key in results:
+            self.hits += 1
+            results.move_to_end(key)
+            return results[key]
+        self.misses += 1
+        return MISS
+
+    def put(self, key, result):
+        results = self.results
+        results[key] = result
+        if len(results) > self.size:
+            results.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class Memoizer:
+    """The memo tables of one Interpreter and what they did.
+
+    tables holds every function memoized so far by name, and pure the
+    names of those pure under the current functions table.
+    """
+    def __init__(self, size=MEMO_SIZE):
+        self.size = size
+        self.tables = {}
+        self.pure = frozenset()
+        self.version = None
+        self._facts = {}
+
+    def call(self, interpreter, cache, args):
+        """Call the function of a call site's cache, through its table if pure."""
+        functions = interpreter.functions
+        if functions.version != self.version:
+            self.refresh(functions)
+        name = cache[1].name
+        if name not in self.pure:
+            return interpreter._invoke(cache, args)
+        key = tuple(args)
+        types = tuple(map(type, key))
+        if not KEY_TYPES.issuperset(types):
+            return interpreter._invoke(cache, args)
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = MemoTable(self.size)
+        if float in types:
+            # 0.0 == -0.0, but they are different arguments
+            key = tuple(arg.hex() if type(arg) is float else arg for arg in key)
+        key = (key, types)
+        result = table.get(key)
+        if result is MISS:
+            result = interpreter._invoke(cache, args)
+            if type(result) in KEY_TYPES:
+                table.put(key, result)
+        return result
+
+    def refresh(self, functions):
+        """Find the pure functions of a changed functions table again."""
+        self.pure = frozenset(pure_functions(functions, self._facts))
+        self.version = functions.version
+        # A callee may have been replaced, so no result can be trusted
+        for table in self.tables.values():
+            table.results.clear()
+
+    @property
+    def hits(self):
+        return sum(table.hits for table in self.tables.values())
+
+    @property
+    def misses(self):
+        return sum(table.misses for table in self.tables.values())
+
+    @property
+    def hit_rate(self):
+        """The share of the memoized calls answered from a table."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def report(self):
+        lines = [f"memoized calls: {self.hits + self.misses}, hits: {self.hits} ({self.hit_rate:.1%}), "
+                 f"misses: {self.misses}"]
+        for name, table in sorted(self.tables.items(), key=lambda item: -item[1].hits):
+            lines.append(f"  {name}: {table.hits} hits, {table.misses} misses ({table.hit_rate:.1%}), "
+                         f"{len(table.results)} entries, {table.evictions} evicted")
+        return "\n".join(lines)
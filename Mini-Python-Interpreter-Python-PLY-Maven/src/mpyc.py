@@ -0,0 +1,332 @@
+"""On-disk cache of parsed programs, the counterpart of __pycache__.
+
+An MpycCache directory holds one .mpyc file per source: the AST, with
+source positions, and the module CodeObject the VM runs, so a warm run
+skips lexing, parsing and compilation. Files are named by a sha256 of the
+source and the compiler version, a hash of the modules that build the
+trees and the bytecode, so any edit to either makes a new key and old
+entries are never read again. They age out instead: the directory is
+capped at max_bytes, evicting the least recently used files, and a hit
+refreshes its file's mtime. Entries stored under a tag, such as a
+script's name, also replace the previous entry of that tag.
+
+An entry is MAGIC, the key digest and a zlib-compressed marshal payload,
+read back with a single read(). The tree is flattened into columns, node
+kinds and positions as packed arrays and field values as one list, in
+postorder with a child referred to by its index, so decoding is one loop
+without recursion and deep expressions do not run into marshal's nesting
+limit. marshal only ever yields plain data, so a tampered file cannot
+run code; one that does not decode is a miss.
+"""
+import gc
+import hashlib
+import marshal
+import os
+import tempfile
+import zlib
+from array import array
+from functools import lru_cache
+
+from . import ast_nodes
+from .ast_nodes import Node
+from .compiler import CodeObject, cache_program, compile_program
+from .lexer import read_source
+
+MAGIC = b'MPYC'
+# Bumped whenever the layout of an entry changes
+FORMAT = 1
+SUFFIX = '.mpyc'
+CACHE_DIR = '__mpycache__'
+
+_HEADER = len(MAGIC) + hashlib.sha256().digest_size
+
+# Node classes by type code; sorted by name so codes do not depend on import order
+_CLASSES = sorted((cls for cls in vars(ast_nodes).values()
+                   if isinstance(cls, type) and issubclass(cls, Node)
+                   and cls.__module__ == ast_nodes.__name__
+                   and cls not in (Node, ast_nodes.Statement, ast_nodes.Expression)),
+                  key=lambda cls: cls.__name__)
+_KINDS = {cls: kind for kind, cls in enumerate(_CLASSES)}
+_ARITY = [len(cls._fields) for cls in _CLASSES]
+
+# The modules whose code decides what a source is cached as
+_COMPILER_MODULES = ('lexer', 'fastlexer', 'myparser', 'pratt', 'ast_nodes',
+                     'resolver', 'compiler')
+
+
+@lru_cache(maxsize=None)
+def compiler_version():
+    """Hash of the entry format and the front end and compiler sources."""
+    digest = hashlib.sha256(f"{FORMAT}:{marshal.version}".encode())
+    # The files beside this one, whether or not their modules are imported
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _COMPILER_MODULES:
+        path = os.path.join(here, name + '.py')
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            # No source to hash, e.g. a zipped install: key on the name only
+            digest.update(name.encode())
+    return digest.hexdigest()[:16]
+
+
+def source_key(source):
+    """The cache key of a source under the running compiler."""
+    return hashlib.sha256(f"{compiler_version()}\0{source}".encode('utf-8', 'surrogatepass')).digest()
+
+
+def _encode_value(value, index):
+    if isinstance(value, Node):
+        return index[id(value)]
+    if isinstance(value, list):
+        return [_encode_value(item, index) for item in value]
+    if type(value) is int:
+        # Bare ints are node references; scalar ones are boxed
+        return (value,)
+    return value
+
+
+def encode_tree(ast):
+    """Flatten a program into columns of marshal-able data.
+
+    Returns (kinds, positions, values, body, index): the type code of each
+    node, in postorder; lineno, col_offset and end of each, 0 for a node
+    without a position; the values of their fields in order, children as
+    indexes; the indexes of the statements; and the index of each node id.
+    """
+    kinds = array('B')
+    positions = array('i')
+    values = []
+    index = {}
+    stack = [(node, False) for node in reversed(ast)]
+    while stack:
+        node, ready = stack.pop()
+        if id(node) in index:
+            continue
+        if not ready:
+            stack.append((node, True))
+            for child in reversed(list(ast_nodes.iter_child_nodes(node))):
+                if id(child) not in index:
+                    stack.append((child, False))
+            continue
+        values.extend(_encode_value(getattr(node, name), index) for name in node._fields)
+        if hasattr(node, 'end'):
+            positions.extend((node.lineno, node.col_offset, node.end))
+        else:
+            positions.extend((0, 0, 0))
+        index[id(node)] = len(kinds)
+        kinds.append(_KINDS[type(node)])
+    return kinds.tobytes(), positions.tobytes(), values, [index[id(node)] for node in ast], index
+
+
+def decode_tree(kinds, positions, values, body):
+    """Rebuild the nodes of encode_tree's columns; returns (program, nodes)."""
+    classes = _CLASSES
+    arity = _ARITY
+    positions = array('i', positions).tolist()
+    nodes = []
+    append = nodes.append
+    v = p = 0
+    for kind in kinds:
+        args = []
+        n = arity[kind]
+        for value in values[v:v + n]:
+            kind_of = type(value)
+            if kind_of is int:
+                value = nodes[value]
+            elif kind_of is list:
+                value = [nodes[item] if type(item) is int else item[0] if type(item) is tuple else item
+                         for item in value]
+            elif kind_of is tuple:
+                value = value[0]
+            args.append(value)
+        v += n
+        node = classes[kind](*args)
+        if positions[p]:
+            node.lineno, node.col_offset, node.end = positions[p:p + 3]
+        p += 3
+        append(node)
+    return [nodes[i] for i in body], nodes
+
+
+def encode_code(code, index):
+    """A CodeObject tree as marshal-able data; index maps node ids to records."""
+    consts = [(1, encode_code(const, index)) if isinstance(const, CodeObject) else (0, const)
+              for const in code.consts]
+    node = index[id(code.node)] if code.node is not None else None
+    return (code.name, array('i', code.code).tobytes(), consts, code.names,
+            code.varnames, code.nparams, node)
+
+
+def decode_code(data, nodes):
+    name, instructions, consts, names, varnames, nparams, node = data
+    code = CodeObject(name, varnames, nparams, nodes[node] if node is not None else None)
+    code.code = array('i', instructions).tolist()
+    code.consts = [decode_code(const, nodes) if nested else const for nested, const in consts]
+    code.names = names
+    return code
+
+
+def dumps(ast, code=None):
+    """Serialize a program, and optionally its module CodeObject, to bytes."""
+    *columns, index = encode_tree(ast)
+    compiled = encode_code(code, index) if code is not None else None
+    # The fastest zlib level already shrinks an entry four- to fivefold
+    return zlib.compress(marshal.dumps((*columns, compiled)), 1)
+
+
+def loads(data):
+    """Inverse of dumps: (program, CodeObject or None)."""
+    *columns, compiled = marshal.loads(zlib.decompress(data))
+    # The tree holds no reference cycles, so collections triggered by the
+    # many allocations would find nothing to free
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        program, nodes = decode_tree(*columns)
+        return program, decode_code(compiled, nodes) if compiled is not None else None
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class MpycCache:
+    """A directory of .mpyc entries, capped at max_bytes.
+
+    load(source) returns the cached program or None. A loaded module
+    CodeObject is handed to compiler.cache_program, so running the program
+    on the VM does not compile it again. store(source, ast) compiles the
+    program and writes both; errors writing the directory are ignored,
+    the cache is only ever an optimization. Several processes may share
+    a directory: files are written to a temporary name and renamed into
+    place.
+    """
+    def __init__(self, directory=CACHE_DIR, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key, tag=None):
+        name = key.hex()[:32] + SUFFIX
+        return os.path.join(self.directory, f"{tag}.{name}" if tag else name)
+
+    def load(self, source, tag=None):
+        key = source_key(source)
+        path = self.path(key, tag)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            if data[:_HEADER] != MAGIC + key:
+                raise ValueError("stale or foreign entry")
+            program, code = loads(memoryview(data)[_HEADER:])
+        except (ValueError, EOFError, TypeError, IndexError, KeyError, zlib.error):
+            self.misses += 1
+            self._remove(path)
+            return None
+        if code is not None:
+            cache_program(program, code)
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return program
+
+    def store(self, source, ast, tag=None):
+        key = source_key(source)
+        try:
+            code = compile_program(ast)
+        except RecursionError:
+            code = None
+        data = MAGIC + key + dumps(ast, code)
+        if len(data) > self.max_bytes:
+            return
+        path = self.path(key, tag)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except OSError:
+            self._remove(temp)
+            return
+        self._evict(path, len(data), tag)
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                return [entry for entry in entries if entry.name.endswith(SUFFIX)]
+        except OSError:
+            return []
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            # Already evicted by another process
+            return False
+        return True
+
+    def _evict(self, keep, size, tag=None):
+        entries = []
+        for entry in self._entries():
+            if entry.path == keep:
+                continue
+            if tag and entry.name[:-len(SUFFIX)].rpartition('.')[0] == tag:
+                # An older version of the same script
+                self._remove(entry.path)
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = size + sum(entry_size for _, entry_size, _ in entries)
+        entries.sort()
+        for _, entry_size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= entry_size
+
+    def size(self):
+        """Total bytes of the entries in the directory."""
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def clear(self):
+        for entry in self._entries():
+            self._remove(entry.path)
+        self.hits = self.misses = self.evictions = 0
+
+
+def parse_file(path, cache=None):
+    """Parse a script, through the cache in the __mpycache__ directory beside it."""
+    from .myparser import parser
+    source = read_source(path)
+    if cache is None:
+        cache = MpycCache(os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR))
+    tag = os.path.splitext(os.path.basename(path))[0]
+    ast = cache.load(source, tag)
+    if ast is None:
+        ast = parser.parse(source)
+        if ast is not None:
+            cache.store(source, ast, tag)
+    return ast
@@ -1,6 +1,13 @@
-from ply import yacc
-from .lexer import tokens
+import copy
+import hashlib
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from . import tables
+from .lexer import tokens, token_length
 from .ast_nodes import *
+from .source_index import index_for
 
 # Define operator precedence - from lowest to highest
 precedence = (
@@ -15,6 +22,68 @@ precedence = (
     ('nonassoc', 'LPAREN', 'RPAREN'), # Parentheses precedence
 )
 
+_terminals = frozenset(tokens)
+# Tokens whose value is their source text
+_unquoted = _terminals - {'NUMBER', 'STRING'}
+
+def _line_starts(p):
+    """Offsets at which the lines of the source being parsed start."""
+    # The production object lives for one parse, so it can hold the table
+    p.line_starts = index_for(p.lexer.lexdata).line_starts.tolist()
+    return p.line_starts
+
+def _token(node, p, n):
+    """Give node the source span of the token at symbol n of the production."""
+    tok = p.slice[n]
+    lexpos = tok.lexpos
+    lineno = node.lineno = tok.lineno
+    try:
+        node.col_offset = lexpos - p.line_starts[lineno - 1]
+    except AttributeError:
+        node.col_offset = lexpos - _line_starts(p)[lineno - 1]
+    if tok.type in _unquoted:
+        node.end = lexpos + len(tok.value)
+    else:
+        node.end = lexpos + token_length(p.lexer.lexdata, tok)
+    return node
+
+def _locate(node, p, first, last):
+    """Give node the source span of symbols first to last of the production.
+
+    A terminal contributes its token's position; a nonterminal that is a
+    node, its own span; a list of statements, the span of its last item.
+    Tokens already carry their line, so only the column needs the line
+    table, and PLY's expensive tracking mode is not needed.
+    """
+    symbols = p.slice
+    sym = symbols[first]
+    if sym.type in _terminals:
+        lineno = node.lineno = sym.lineno
+        try:
+            node.col_offset = sym.lexpos - p.line_starts[lineno - 1]
+        except AttributeError:
+            node.col_offset = sym.lexpos - _line_starts(p)[lineno - 1]
+    else:
+        child = sym.value
+        node.lineno = child.lineno
+        node.col_offset = child.col_offset
+    sym = symbols[last]
+    if sym.type in _unquoted:
+        node.end = sym.lexpos + len(sym.value)
+    elif sym.type in _terminals:
+        node.end = sym.lexpos + token_length(p.lexer.lexdata, sym)
+    elif sym.value.__class__ is list:
+        node.end = sym.value[-1].end
+    else:
+        node.end = sym.value.end
+    return node
+
+def _block_end(p, body, colon):
+    """Index of the symbol a compound statement's span ends with."""
+    # The DEDENT closing a block sits on the line after it, so the span
+    # ends with the last statement of the block, or its colon if it has none
+    return body if p[body] else colon
+
 # Grammar rules
 def p_program(p):
     '''program : statements'''
@@ -23,10 +92,13 @@ def p_program(p):
 def p_statements(p):
     '''statements : statement
                   | statements statement'''
+    # Append in place: copying the accumulated list per statement is O(n^2)
     if len(p) == 2:
         p[0] = [p[1]] if p[1] is not None else []
     else:
-        p[0] = p[1] + ([p[2]] if p[2] is not None else [])
+        p[0] = p[1]
+        if p[2] is not None:
+            p[0].append(p[2])
 
 def p_statement_code(p):
     '''statement : print_stmt
@@ -51,11 +123,17 @@ def p_print_stmt(p):
                  | PRINT expr'''
     if len(p) == 5:
         if len(p[3]) == 1:
-            p[0] = Print(p[3][0])
+            p[0] = _locate(Print(p[3][0]), p, 1, 4)
         else:
-            p[0] = Print(ListNode(p[3]))
+            args = ListNode(p[3])
+            if p[3]:
+                args.lineno, args.col_offset, args.end = p[3][0].lineno, p[3][0].col_offset, p[3][-1].end
+            else:
+                # print() prints an empty line
+                _locate(args, p, 2, 4)
+            p[0] = _locate(Print(args), p, 1, 4)
     else:
-        p[0] = Print(p[2])
+        p[0] = _locate(Print(p[2]), p, 1, 2)
 
 def p_expr_stmt(p):
     '''expr_stmt : expr'''
@@ -64,26 +142,28 @@ def p_expr_stmt(p):
 def p_assign_stmt(p):
     '''assign_stmt : IDENTIFIER EQUALS expr
                   | IDENTIFIER LBRACKET expr RBRACKET EQUALS expr'''
+    target = _token(Identifier(p[1]), p, 1)
     if len(p) == 4:
-        p[0] = Assign(Identifier(p[1]), p[3])
+        p[0] = _locate(Assign(target, p[3]), p, 1, 3)
     else:
-        p[0] = ListAssign(Identifier(p[1]), p[3], p[6])
+        p[0] = _locate(ListAssign(target, p[3], p[6]), p, 1, 6)
 
 def p_if_stmt(p):
     '''if_stmt : IF expr COLON NEWLINE INDENT statements DEDENT
                | IF expr COLON NEWLINE INDENT statements DEDENT ELSE COLON NEWLINE INDENT statements DEDENT'''
     if len(p) == 8:
-        p[0] = IfElse(p[2], p[6], [])
+        p[0] = _locate(IfElse(p[2], p[6], []), p, 1, _block_end(p, 6, 3))
     else:
-        p[0] = IfElse(p[2], p[6], p[12])
+        p[0] = _locate(IfElse(p[2], p[6], p[12]), p, 1, _block_end(p, 12, 9))
 
 def p_while_stmt(p):
     '''while_stmt : WHILE expr COLON NEWLINE INDENT statements DEDENT'''
-    p[0] = WhileLoop(p[2], p[6])
+    p[0] = _locate(WhileLoop(p[2], p[6]), p, 1, _block_end(p, 6, 3))
 
 def p_for_stmt(p):
     '''for_stmt : FOR IDENTIFIER IN expr COLON NEWLINE INDENT statements DEDENT'''
-    p[0] = ForLoop(Identifier(p[2]), p[4], p[8])
+    var = _token(Identifier(p[2]), p, 2)
+    p[0] = _locate(ForLoop(var, p[4], p[8]), p, 1, _block_end(p, 8, 5))
 
 def p_function_def(p):
     '''function_def : DEF IDENTIFIER LPAREN param_list RPAREN COLON NEWLINE INDENT statements DEDENT'''
@@ -94,7 +174,7 @@ def p_function_def(p):
             params.append(param)
         else:
             params.append(Identifier(param))
-    p[0] = FunctionDef(p[2], params, p[9])
+    p[0] = _locate(FunctionDef(p[2], params, p[9]), p, 1, _block_end(p, 9, 6))
 
 def p_param_list(p):
     '''param_list : IDENTIFIER
@@ -105,30 +185,31 @@ def p_param_list(p):
             p[0] = []
         else:
             # Create an Identifier object for the parameter
-            p[0] = [Identifier(p[1])]
+            p[0] = [_token(Identifier(p[1]), p, 1)]
     else:
         # Add the new parameter as an Identifier
-        p[0] = p[1] + [Identifier(p[3])]
+        p[0] = p[1]
+        p[0].append(_token(Identifier(p[3]), p, 3))
 
 def p_return_stmt(p):
     '''return_stmt : RETURN expr
                   | RETURN'''
     if len(p) == 3:
-        p[0] = Return(p[2])
+        p[0] = _locate(Return(p[2]), p, 1, 2)
     else:
-        p[0] = Return(None)
+        p[0] = _token(Return(None), p, 1)
 
 def p_break_stmt(p):
     '''break_stmt : BREAK'''
-    p[0] = Break()
+    p[0] = _token(Break(), p, 1)
 
 def p_continue_stmt(p):
     '''continue_stmt : CONTINUE'''
-    p[0] = Continue()
+    p[0] = _token(Continue(), p, 1)
 
 def p_try_except_stmt(p):
     '''try_except_stmt : TRY COLON NEWLINE INDENT statements DEDENT EXCEPT COLON NEWLINE INDENT statements DEDENT'''
-    p[0] = TryExcept(p[5], p[11])
+    p[0] = _locate(TryExcept(p[5], p[11]), p, 1, _block_end(p, 11, 8))
 
 def p_expr(p):
     '''expr : term
@@ -148,7 +229,7 @@ def p_expr(p):
     if len(p) == 2:
         p[0] = p[1]
     else:
-        p[0] = BinaryOp(p[1], p[2], p[3])
+        p[0] = _locate(BinaryOp(p[1], p[2], p[3]), p, 1, 3)
 
 def p_term(p):
     '''term : factor
@@ -157,7 +238,7 @@ def p_term(p):
     if len(p) == 2:
         p[0] = p[1]
     else:
-        p[0] = UnaryOp(p[1], p[2])
+        p[0] = _locate(UnaryOp(p[1], p[2]), p, 1, 2)
 
 def p_factor(p):
     '''factor : NUMBER
@@ -173,27 +254,29 @@ def p_factor(p):
               | LPAREN expr RPAREN'''
     if len(p) == 2:
         if isinstance(p[1], int) or isinstance(p[1], float):
-            p[0] = Number(p[1])
+            p[0] = _token(Number(p[1]), p, 1)
         elif isinstance(p[1], str) and p.slice[1].type == 'STRING':
-            p[0] = String(p[1])
+            p[0] = _token(String(p[1]), p, 1)
         elif p.slice[1].type == 'TRUE':
-            p[0] = Boolean(True)
+            p[0] = _token(Boolean(True), p, 1)
         elif p.slice[1].type == 'FALSE':
-            p[0] = Boolean(False)
+            p[0] = _token(Boolean(False), p, 1)
         elif p.slice[1].type == 'IDENTIFIER':
-            p[0] = Identifier(p[1])
+            p[0] = _token(Identifier(p[1]), p, 1)
         else:
             p[0] = p[1]
     else:
-        p[0] = p[2]
+        # The span of a parenthesized expression takes in the parentheses,
+        # so the statement or operation around it covers them as well
+        p[0] = _locate(p[2], p, 1, 3)
 
 def p_list_expr(p):
     '''list_expr : LBRACKET expr_list RBRACKET
                 | IDENTIFIER LBRACKET expr RBRACKET'''
     if len(p) == 4:
-        p[0] = ListNode(p[2])
+        p[0] = _locate(ListNode(p[2]), p, 1, 3)
     else:
-        p[0] = IndexNode(Identifier(p[1]), p[3])
+        p[0] = _locate(IndexNode(_token(Identifier(p[1]), p, 1), p[3]), p, 1, 4)
 
 def p_expr_list(p):
     '''expr_list : expr
@@ -202,27 +285,30 @@ def p_expr_list(p):
     if len(p) == 2:
         p[0] = [p[1]] if p[1] is not None else []
     else:
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
 
 def p_function_call(p):
     '''function_call : IDENTIFIER LPAREN expr_list RPAREN
                     | IDENTIFIER LPAREN RPAREN'''
+    name = _token(Identifier(p[1]), p, 1)
     if len(p) == 5:
-        p[0] = FunctionCall(Identifier(p[1]), p[3])
+        p[0] = _locate(FunctionCall(name, p[3]), p, 1, 4)
     else:
-        p[0] = FunctionCall(Identifier(p[1]), [])
+        p[0] = _locate(FunctionCall(name, []), p, 1, 3)
 
 def p_string_method(p):
     '''string_method : IDENTIFIER DOT IDENTIFIER LPAREN expr_list RPAREN
                     | IDENTIFIER DOT IDENTIFIER LPAREN RPAREN'''
+    target = _token(Identifier(p[1]), p, 1)
     if len(p) == 7:
-        p[0] = StringMethod(Identifier(p[1]), p[3], p[5])
+        p[0] = _locate(StringMethod(target, p[3], p[5]), p, 1, 6)
     else:
-        p[0] = StringMethod(Identifier(p[1]), p[3], [])
+        p[0] = _locate(StringMethod(target, p[3], []), p, 1, 5)
 
 def p_len_function(p):
     '''len_function : LEN LPAREN expr RPAREN'''
-    p[0] = LenFunction(p[3])
+    p[0] = _locate(LenFunction(p[3]), p, 1, 4)
 
 def p_range_call(p):
     '''range_call : RANGE LPAREN expr_list RPAREN
@@ -231,9 +317,9 @@ def p_range_call(p):
         args = p[3]
         while len(args) < 3:
             args.append(None)
-        p[0] = RangeCall(args[0], args[1], args[2])
+        p[0] = _locate(RangeCall(args[0], args[1], args[2]), p, 1, 4)
     else:
-        p[0] = RangeCall(None, None, None)
+        p[0] = _locate(RangeCall(None, None, None), p, 1, 3)
 
 
 
@@ -242,46 +328,40 @@ def p_empty(p):
     p[0] = None
 
 # Error handling
-def p_error(p):
-    if p:
-        # Get the line number and column
-        line = p.lineno
-        col = p.lexpos - p.lexer.lexdata.rfind('\n', 0, p.lexpos)
-        
-        # Get the line content
-        lines = p.lexer.lexdata.split('\n')
-        if 0 <= line-1 < len(lines):
-            line_content = lines[line-1]
-            pointer = ' ' * (col-1) + '^'
-        else:
-            line_content = ""
-            pointer = ""
-            
+def syntax_error(source, tok):
+    """The SyntaxError for an unexpected token of source, or for its end if tok is None."""
+    if tok:
+        # Get the line number, column and line content
+        index = index_for(source)
+        line, col = index.position(tok.lexpos)
+        line_content = index.line_text(line)
+        pointer = ' ' * (col-1) + '^'
+
         # Common error patterns and suggestions
         error_msg = f"Syntax error at line {line}, column {col}:\n"
         error_msg += f"{line_content}\n{pointer}\n"
         
         # Add specific error messages based on the token
-        if p.type == 'COLON':
+        if tok.type == 'COLON':
             error_msg += "Missing colon ':' after if/for/while statement or function definition"
-        elif p.type == 'RPAREN':
+        elif tok.type == 'RPAREN':
             error_msg += "Missing closing parenthesis ')'"
-        elif p.type == 'LBRACKET':
+        elif tok.type == 'LBRACKET':
             error_msg += "Missing closing bracket ']'"
-        elif p.type == 'RBRACKET':
+        elif tok.type == 'RBRACKET':
             error_msg += "Missing opening bracket '['"
-        elif p.type == 'LPAREN':
+        elif tok.type == 'LPAREN':
             error_msg += "Missing closing parenthesis ')'"
-        elif p.type == 'EQUALS':
+        elif tok.type == 'EQUALS':
             error_msg += "Invalid assignment. Use '=' for assignment"
-        elif p.type == 'IDENTIFIER':
-            error_msg += f"Unexpected identifier '{p.value}'. Check for missing operators or parentheses"
-        elif p.type == 'NUMBER':
-            error_msg += f"Unexpected number '{p.value}'. Check for missing operators or parentheses"
-        elif p.type == 'STRING':
-            error_msg += f"Unexpected string '{p.value}'. Check for missing operators or parentheses"
+        elif tok.type == 'IDENTIFIER':
+            error_msg += f"Unexpected identifier '{tok.value}'. Check for missing operators or parentheses"
+        elif tok.type == 'NUMBER':
+            error_msg += f"Unexpected number '{tok.value}'. Check for missing operators or parentheses"
+        elif tok.type == 'STRING':
+            error_msg += f"Unexpected string '{tok.value}'. Check for missing operators or parentheses"
         else:
-            error_msg += f"Unexpected token '{p.value}'"
+            error_msg += f"Unexpected token '{tok.value}'"
             
         # Add suggestions for common errors
         error_msg += "\n\nCommon fixes:\n"
@@ -291,16 +371,173 @@ def p_error(p):
         error_msg += "4. Verify operator usage and precedence\n"
         error_msg += "5. Make sure all statements are properly terminated"
         
-        raise SyntaxError(error_msg)
+        return SyntaxError(error_msg)
     else:
-        raise SyntaxError("Unexpected end of file. Check for unclosed blocks or missing statements")
+        return SyntaxError("Unexpected end of file. Check for unclosed blocks or missing statements")
+
+def p_error(p):
+    raise syntax_error(p.lexer.lexdata if p else None, p)
+
 
 # Build the parser
-_parser = yacc.yacc()
+_parser = tables.build_parser(sys.modules[__name__])
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize nbytes maxbytes')
+
+# The PLY LALR parser, and the hand-written one of pratt.py
+BACKENDS = ('lalr', 'pratt')
+
+
+class CompilerContext:
+    """A lexer and parser of its own, for use by one thread at a time.
+
+    Both the lexer and the PLY parser object keep per-parse state, so
+    concurrent parses must not share them. The parse tables are read-only
+    and shared by every context. lexer_factory makes the lexer, e.g.
+    fastlexer.FastLexer; by default it is an IndentLexer over a clone of
+    the PLY lexer. backend picks the parser; the PLY keyword arguments
+    apply to the lalr backend only.
+    """
+    def __init__(self, lexer_factory=None):
+        from .lexer import IndentLexer, outer_lexer
+        from .pratt import PrattParser
+        if lexer_factory is None:
+            self.lexer = IndentLexer(outer_lexer.clone())
+        else:
+            self.lexer = lexer_factory()
+        self.parser = copy.copy(_parser)
+        self.pratt = PrattParser()
+
+    def parse(self, code, lexer=None, backend='lalr', **kwargs):
+        if backend == 'pratt' and not kwargs:
+            return self.pratt.parse(code, lexer or self.lexer)
+        if backend == 'pratt':
+            raise TypeError(f"the pratt backend takes no options: {', '.join(kwargs)}")
+        if backend != 'lalr':
+            raise ValueError(f"unknown parser backend {backend!r}, expected one of {BACKENDS}")
+        return self.parser.parse(code, lexer=lexer or self.lexer, **kwargs)
+
+
+def estimate_size(ast):
+    """Approximate memory held by an AST, in bytes."""
+    total = 0
+    seen = set()
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        total += sys.getsizeof(node)
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, Node):
+            stack.extend(value for _, value in iter_fields(node))
+    return total
+
 
 class CustomParser:
-    def parse(self, code, lexer=None, **kwargs):
-        from .lexer import lexer as custom_lexer
-        return _parser.parse(code, lexer=lexer or custom_lexer, **kwargs)
+    """Parser front end that caches ASTs by a hash of the source text.
+
+    The cache is an LRU bounded both by entry count (cache_size) and by the
+    estimated memory of the cached ASTs (cache_bytes). Cached ASTs are shared
+    between callers, so they must be treated as read-only.
+
+    parse is safe to call from several threads: each thread parses through
+    its own CompilerContext, made with lexer_factory, and the cache is
+    guarded by a lock. Parsing itself runs outside the lock.
+
+    backend selects the LALR parser or the Pratt parser; both build the
+    same trees, but each has its own cache entries.
+
+    disk_cache, an mpyc.MpycCache, adds a persistent second level behind
+    the memory cache: sources missing from memory are looked up on disk
+    before they are parsed, and parsed ones are written back.
+
+    With hash_cons, equal expression subtrees of each tree are made one
+    node by hashcons.share_subtrees.
+    """
+    def __init__(self, cache_size=128, cache_bytes=32 * 1024 * 1024, lexer_factory=None,
+                 disk_cache=None, hash_cons=False):
+        self.lexer_factory = lexer_factory
+        self.disk_cache = disk_cache
+        self.hash_cons = hash_cons
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cache_nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def context(self):
+        """The calling thread's CompilerContext, created on first use."""
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._local.context = CompilerContext(self.lexer_factory)
+        return context
+
+    def parse(self, code, lexer=None, backend='lalr', **kwargs):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown parser backend {backend!r}, expected one of {BACKENDS}")
+        if lexer is not None or kwargs:
+            return self._share(self.context().parse(code, lexer=lexer, backend=backend, **kwargs))
+        if not self.cache_size:
+            return self._load_or_parse(code, backend)
+
+        key = (backend, hashlib.sha256(code.encode('utf-8', 'surrogatepass')).digest())
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        ast = self._load_or_parse(code, backend)
+        if ast is not None:
+            self._store(key, ast)
+        return ast
+
+    def _load_or_parse(self, code, backend):
+        if self.disk_cache is None:
+            return self._share(self.context().parse(code, backend=backend))
+        ast = self.disk_cache.load(code)
+        if ast is None:
+            ast = self._share(self.context().parse(code, backend=backend))
+            if ast is not None:
+                self.disk_cache.store(code, ast)
+        return ast
+
+    def _share(self, ast):
+        if self.hash_cons and ast is not None:
+            from .hashcons import share_subtrees
+            share_subtrees(ast)
+        return ast
+
+    def _store(self, key, ast):
+        size = estimate_size(ast)
+        if size > self.cache_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                # Another thread parsed the same source meanwhile
+                return
+            while self._cache and (len(self._cache) >= self.cache_size
+                                   or self._cache_nbytes + size > self.cache_bytes):
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_nbytes -= evicted
+            self._cache[key] = (ast, size)
+            self._cache_nbytes += size
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self._cache),
+                         self._cache_nbytes, self.cache_bytes)
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._cache_nbytes = 0
+            self.hits = self.misses = 0
 
 parser = CustomParser()
\ No newline at end of file
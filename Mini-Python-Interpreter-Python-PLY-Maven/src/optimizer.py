@@ -0,0 +1,910 @@
+"""Source-level optimizations of the AST.
+
+optimize runs these passes over a copy of a program:
+
+Propagator
+    Walks each scope in execution order, knowing for every variable what
+    the code so far guarantees about it: its value, its kind (number,
+    string, list) or the variable it is a copy of. Reads of constants
+    become literals and reads of copies read the original. Operations on
+    known values are folded, with the runtime helpers the engines share,
+    so folding cannot disagree with execution; one that would raise is
+    left to raise when the program runs. An if on a known condition is
+    replaced by the branch it takes, a while loop whose condition is
+    false on entry is dropped, and so are statements after a break,
+    continue or return of a known value.
+LoopInvariantHoister
+    Computes expressions that are the same on every iteration of a loop
+    once, into a new variable assigned before the loop. Only expressions
+    that cannot raise are moved, since the loop might not have evaluated
+    them at all.
+drop_unused_functions
+    Removes functions no code that runs can call, when the program is
+    taken to be whole.
+DeadStoreEliminator
+    Removes assignments to function locals that are never read, if the
+    assigned value cannot raise. Module-level variables are kept: the
+    functions and any later program run by the same Interpreter read
+    them by name.
+
+Lists cannot be changed in place by any engine, so a list value is as
+constant as a number. Functions cannot assign module-level variables,
+so a call leaves what is known about them intact. The tree engine keeps
+some loop state past the end of a loop: the flag of a break or continue
+in the last iteration, and an in_loop cleared by any inner loop. Programs
+that depend on it already run differently there than on the other
+engines, and the optimizer keeps the meaning the other engines give them.
+
+ConstantFolder, used by fold_constants, is the folding alone.
+"""
+import copy
+import math
+from collections import namedtuple
+
+from . import runtime
+from .ast_nodes import *
+from .resolver import assigned_names
+from .unparse import unparse
+from .visitor import CHILD_FIELDS, NodeTransformer, NodeVisitor, walk
+
+# Folded strings and lists longer than this are left to be built at run time
+MAX_LITERAL = 1000
+
+# What is known about a variable or an expression: kind is 'num', 'str',
+# 'list', 'range' or None, value is the value or UNKNOWN, and copy names a
+# variable known to hold the same value.
+Fact = namedtuple('Fact', 'kind value copy')
+UNKNOWN = object()
+BOUND = Fact(None, UNKNOWN, None)
+
+_COMPARISONS = ('==', '!=', '<', '>', '<=', '>=')
+
+
+def kind_of_value(value):
+    if isinstance(value, (bool, int, float)):
+        return 'num'
+    if isinstance(value, str):
+        return 'str'
+    if isinstance(value, list):
+        return 'list'
+    if isinstance(value, range):
+        return 'range'
+    return None
+
+
+def fact_of_value(value):
+    return Fact(kind_of_value(value), value, None)
+
+
+def literal(value):
+    """A node for value, or None if no literal can hold it."""
+    if isinstance(value, bool):
+        return Boolean(value)
+    if isinstance(value, int):
+        return Number(value)
+    if isinstance(value, float):
+        return Number(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        return String(value) if len(value) <= MAX_LITERAL else None
+    if isinstance(value, list) and len(value) <= MAX_LITERAL:
+        elements = [literal(item) for item in value]
+        if None not in elements:
+            return ListNode(elements)
+    return None
+
+
+def same_value(a, b):
+    """a and b are equal and of the same types, so 1, 1.0 and True differ.
+
+    Floats also need the same sign, as 0.0 == -0.0 but they print apart.
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(same_value, a, b))
+    if isinstance(a, float):
+        return a == b and math.copysign(1, a) == math.copysign(1, b)
+    return a == b
+
+
+def same_fact(a, b):
+    return (a.kind == b.kind and a.copy == b.copy
+            and (a.value is b.value or same_value(a.value, b.value)))
+
+
+def merge(*envs):
+    """What holds on every one of envs; None for a point no path reaches."""
+    envs = [env for env in envs if env is not None]
+    if not envs:
+        return None
+    result = dict(envs[0])
+    for env in envs[1:]:
+        for name, fact in list(result.items()):
+            other = env.get(name)
+            if other is None:
+                del result[name]
+            elif not same_fact(fact, other):
+                result[name] = Fact(fact.kind if fact.kind == other.kind else None,
+                                    fact.value if same_value(fact.value, other.value) else UNKNOWN,
+                                    fact.copy if fact.copy == other.copy else None)
+    return result
+
+
+def same_env(a, b):
+    if a is None or b is None:
+        return a is b
+    return a.keys() == b.keys() and all(same_fact(a[name], b[name]) for name in a)
+
+
+def forget(env, names):
+    """env without what it knows about names."""
+    if env is None:
+        return None
+    return {name: fact if fact.copy not in names else fact._replace(copy=None)
+            for name, fact in env.items() if name not in names}
+
+
+def binary_kind(op, left, right):
+    if op in _COMPARISONS:
+        return 'num'
+    if op in ('and', 'or'):
+        return left if left == right else None
+    if op == '+' and left == right and left in ('num', 'str', 'list'):
+        return left
+    if left == right == 'num':
+        return 'num'
+    return None
+
+
+def kind(node, env):
+    """The kind of value node has if it is evaluated with the facts env."""
+    if isinstance(node, (Number, Boolean)):
+        return 'num'
+    if isinstance(node, String):
+        return 'str'
+    if isinstance(node, ListNode):
+        return 'list'
+    if isinstance(node, Identifier):
+        fact = env.get(node.name)
+        return fact.kind if fact is not None else None
+    if isinstance(node, BinaryOp):
+        return binary_kind(node.op, kind(node.left, env), kind(node.right, env))
+    if isinstance(node, (UnaryOp, LenFunction)):
+        return 'num'
+    if isinstance(node, StringMethod):
+        return 'str'
+    if isinstance(node, RangeCall):
+        return 'range'
+    if isinstance(node, IndexNode) and kind(node.expr, env) == 'str':
+        return 'str'
+    return None
+
+
+def cannot_raise(node, env):
+    """Whether evaluating node with the facts env is sure to succeed.
+
+    Such an expression has no effects either: it can be evaluated early,
+    or not at all.
+    """
+    if isinstance(node, (Number, String, Boolean)):
+        return True
+    if isinstance(node, Identifier):
+        return node.name in env
+    if isinstance(node, ListNode):
+        return all(cannot_raise(element, env) for element in node.elements)
+    if isinstance(node, BinaryOp):
+        if not (cannot_raise(node.left, env) and cannot_raise(node.right, env)):
+            return False
+        if node.op in ('==', '!=', 'and', 'or'):
+            return True
+        left, right = kind(node.left, env), kind(node.right, env)
+        if node.op in ('+', '<', '>', '<=', '>='):
+            return left == right and left in (('num', 'str', 'list') if node.op == '+' else ('num', 'str'))
+        if node.op in ('/', '%'):
+            return (left == right == 'num' and isinstance(node.right, (Number, Boolean))
+                    and node.right.value != 0)
+        return node.op in ('-', '*') and left == right == 'num'
+    if isinstance(node, UnaryOp):
+        if node.op == 'not':
+            return cannot_raise(node.expr, env)
+        return node.op == '-' and cannot_raise(node.expr, env) and kind(node.expr, env) == 'num'
+    if isinstance(node, LenFunction):
+        return cannot_raise(node.expr, env) and kind(node.expr, env) in ('str', 'list')
+    if isinstance(node, StringMethod):
+        if not (cannot_raise(node.expr, env) and kind(node.expr, env) == 'str'):
+            return False
+        if node.method == 'replace':
+            return len(node.args) == 2 and all(cannot_raise(arg, env) and kind(arg, env) == 'str'
+                                               for arg in node.args)
+        return node.method in ('upper', 'lower', 'strip')
+    return False
+
+
+def fold(node, operation, facts):
+    """The literal node.op gives for the values of facts, if all are known.
+
+    Returns the replacement node, or node itself, and the fact for it.
+    """
+    values = [fact.value for fact in facts]
+    if UNKNOWN in values:
+        return node, None
+    try:
+        value = operation(*values)
+    except Exception:
+        # Raised again when the program runs
+        return node, None
+    result = literal(value)
+    if result is None:
+        return node, fact_of_value(value)
+    return copy_location(result, node), fact_of_value(value)
+
+
+def _evaluator(node):
+    """The runtime operation of node, taking its children's values."""
+    if isinstance(node, BinaryOp):
+        return runtime.binary_function(node.op)
+    if isinstance(node, UnaryOp):
+        return runtime.unary_function(node.op)
+    if isinstance(node, IndexNode):
+        return runtime.index_value
+    if isinstance(node, LenFunction):
+        return runtime.length_of
+    return lambda value, *args: runtime.string_method(value, node.method, args)
+
+
+def clone(node):
+    """A copy of a tree with no node shared, fit to be changed in place.
+
+    Hash-consed trees share subtrees, and a subtree can be rewritten one way
+    in one place and another way in the next. The copy has no structural
+    hashes, resolver state, quickened sites or inline caches.
+    """
+    if isinstance(node, list):
+        return [clone(item) for item in node]
+    if not isinstance(node, Node):
+        return node
+    new = copy.copy(node)
+    try:
+        del new._hash
+    except AttributeError:
+        pass
+    for name in CHILD_FIELDS[type(node)]:
+        setattr(new, name, clone(getattr(node, name)))
+    if isinstance(new, Identifier):
+        new.slot = None
+        new.cache = None
+    elif isinstance(new, FunctionCall):
+        new.cache = None
+    elif isinstance(new, FunctionDef):
+        new.varnames = None
+    elif isinstance(new, (BinaryOp, UnaryOp, IndexNode)):
+        new.site = 0
+    return new
+
+
+class Propagator(NodeVisitor):
+    """Constant and copy propagation, folding and dead-branch elimination.
+
+    self.env holds the facts about the variables of the current scope at
+    the point reached, or None where no path reaches. Expression visits
+    return the rewritten expression and its fact, or None for one nothing
+    is known about; statement visits return what replaces the statement,
+    like a NodeTransformer's. A loop's facts are worked out by going round
+    it without rewriting until they stop changing; the tree is changed only
+    when self.rewrite is set.
+    """
+    # Times a loop is gone round before its variables are given up on
+    MAX_PASSES = 3
+
+    def __init__(self):
+        self.env = {}
+        self.loops = []
+        self.rewrite = True
+        self.in_function = False
+        # Facts at the head of each loop, and the Assigns whose value cannot raise
+        self.loop_facts = {}
+        self.pure_stores = set()
+
+    # Statements
+
+    def visit_list(self, node):
+        result = []
+        for stmt in node:
+            if self.env is None:
+                # Unreachable
+                break
+            if isinstance(stmt, Expression):
+                stmt = self.visit(stmt)[0]
+            else:
+                stmt = self.visit(stmt)
+            if isinstance(stmt, list):
+                result.extend(stmt)
+            elif stmt is not None:
+                result.append(stmt)
+        if self.rewrite:
+            node[:] = result
+        return node
+
+    def generic_visit(self, node):
+        return node
+
+    def assign(self, name, fact):
+        env = forget(self.env, {name})
+        if fact is None:
+            fact = BOUND
+        elif fact.copy == name:
+            fact = fact._replace(copy=None)
+        env[name] = fact
+        self.env = env
+
+    def visit_Assign(self, node):
+        expr, fact = self.visit(node.expr)
+        if self.rewrite:
+            node.expr = expr
+            if cannot_raise(expr, self.env):
+                self.pure_stores.add(id(node))
+        self.assign(node.name.name, fact)
+        return node
+
+    def visit_Print(self, node):
+        if isinstance(node.expr, ListNode):
+            # The arguments of print(a, b)
+            elements = [self.visit(element)[0] for element in node.expr.elements]
+            if self.rewrite:
+                node.expr.elements = elements
+            return node
+        expr, fact = self.visit(node.expr)
+        if self.rewrite and not (isinstance(expr, ListNode) and expr is not node.expr):
+            # A list folded into print's argument would print as its elements
+            node.expr = expr
+        return node
+
+    def visit_Return(self, node):
+        if node.expr is None:
+            return node
+        expr, fact = self.visit(node.expr)
+        if self.rewrite:
+            node.expr = expr
+        if self.in_function and fact is not None and fact.value is not UNKNOWN:
+            # A return of None does not leave the function
+            self.env = None
+        return node
+
+    def visit_Break(self, node):
+        if self.loops:
+            self.loops[-1][0].append(self.env)
+        self.env = None
+        return node
+
+    def visit_Continue(self, node):
+        if self.loops:
+            self.loops[-1][1].append(self.env)
+        self.env = None
+        return node
+
+    def visit_IfElse(self, node):
+        condition, fact = self.visit(node.condition)
+        if fact is not None and fact.value is not UNKNOWN:
+            # A known value comes from an expression without effects
+            return self.visit((node.if_body if fact.value else node.else_body) or [])
+        before = self.env
+        self.env = dict(before)
+        self.visit(node.if_body)
+        after_if = self.env
+        self.env = dict(before)
+        if node.else_body:
+            self.visit(node.else_body)
+        self.env = merge(after_if, self.env)
+        if self.rewrite:
+            node.condition = condition
+        return node
+
+    def loop(self, node, entry, assigned, start):
+        """Find the facts at the head of a loop, then rewrite it with them.
+
+        start(head) visits the part of the loop evaluated each time round
+        and returns the facts at the start of the body. Returns the facts
+        after the loop.
+        """
+        rewrite = self.rewrite
+        self.rewrite = False
+        head = entry
+        for _ in range(self.MAX_PASSES):
+            self.loops.append(([], []))
+            self.env = start(head)
+            self.visit(node.body)
+            breaks, continues = self.loops.pop()
+            new_head = merge(entry, self.env, *continues)
+            if same_env(new_head, head):
+                break
+            head = new_head
+        else:
+            head = forget(entry, assigned)
+        self.rewrite = rewrite
+
+        self.loops.append(([], []))
+        self.env = start(head)
+        self.visit(node.body)
+        breaks, continues = self.loops.pop()
+        if rewrite:
+            self.loop_facts[id(node)] = head
+        return merge(head, *breaks)
+
+    def visit_WhileLoop(self, node):
+        if self.rewrite:
+            env = self.env
+            self.env, self.rewrite = dict(env), False
+            condition, fact = self.visit(node.condition)
+            self.env, self.rewrite = env, True
+            if fact is not None and fact.value is not UNKNOWN and not fact.value:
+                return []
+
+        def start(head):
+            self.env = dict(head)
+            condition, fact = self.visit(node.condition)
+            if self.rewrite:
+                node.condition = condition
+            return self.env
+
+        self.env = self.loop(node, self.env, set(assigned_names(node.body)), start)
+        return node
+
+    def visit_ForLoop(self, node):
+        iterable, fact = self.visit(node.iterable)
+        if self.rewrite:
+            node.iterable = iterable
+        var = node.var.name
+        item = BOUND
+        if fact is not None and fact.kind == 'range':
+            item = Fact('num', UNKNOWN, None)
+        elif fact is not None and isinstance(fact.value, list):
+            kinds = {kind_of_value(value) for value in fact.value}
+            if len(kinds) == 1:
+                item = Fact(kinds.pop(), UNKNOWN, None)
+
+        def start(head):
+            self.env = head
+            self.assign(var, item)
+            return self.env
+
+        assigned = set(assigned_names(node.body)) | {var}
+        self.env = self.loop(node, self.env, assigned, start)
+        return node
+
+    def visit_TryExcept(self, node):
+        before = self.env
+        self.env = dict(before)
+        self.visit(node.try_body)
+        after_try = self.env
+        # The try body can stop anywhere, so the except body knows nothing
+        # about what it assigns
+        self.env = forget(before, set(assigned_names(node.try_body)))
+        self.visit(node.except_body)
+        self.env = merge(after_try, self.env)
+        return node
+
+    def visit_FunctionDef(self, node):
+        if not self.rewrite:
+            # Defining a function changes no variable
+            return node
+        saved = self.env, self.loops, self.in_function
+        self.env, self.loops, self.in_function = {}, [], True
+        self.visit(node.body)
+        self.env, self.loops, self.in_function = saved
+        return node
+
+    # Expressions
+
+    def visit_Number(self, node):
+        return node, fact_of_value(node.value)
+
+    visit_String = visit_Boolean = visit_Number
+
+    def visit_Identifier(self, node):
+        fact = self.env.get(node.name)
+        if fact is None:
+            return node, Fact(None, UNKNOWN, node.name)
+        if fact.value is not UNKNOWN and not isinstance(fact.value, list):
+            replacement = literal(fact.value)
+            if replacement is not None:
+                return copy_location(replacement, node), fact
+        if fact.copy is not None:
+            return copy_location(Identifier(fact.copy), node), fact
+        return node, fact._replace(copy=node.name)
+
+    def children(self, node, names):
+        """Visit the given child fields, rewriting them; returns their facts."""
+        facts = []
+        for name in names:
+            value, fact = self.visit(getattr(node, name))
+            if self.rewrite:
+                setattr(node, name, value)
+            facts.append(fact or BOUND)
+        return facts
+
+    def visit_BinaryOp(self, node):
+        left, right = self.children(node, ('left', 'right'))
+        folded, fact = fold(node, _evaluator(node), (left, right))
+        return folded, fact or Fact(binary_kind(node.op, left.kind, right.kind), UNKNOWN, None)
+
+    def visit_UnaryOp(self, node):
+        operand, = self.children(node, ('expr',))
+        folded, fact = fold(node, _evaluator(node), (operand,))
+        return folded, fact or Fact('num', UNKNOWN, None)
+
+    def visit_IndexNode(self, node):
+        facts = self.children(node, ('expr', 'index'))
+        folded, fact = fold(node, _evaluator(node), facts)
+        return folded, fact or Fact('str' if facts[0].kind == 'str' else None, UNKNOWN, None)
+
+    def visit_LenFunction(self, node):
+        facts = self.children(node, ('expr',))
+        folded, fact = fold(node, _evaluator(node), facts)
+        return folded, fact or Fact('num', UNKNOWN, None)
+
+    def visit_StringMethod(self, node):
+        facts = self.children(node, ('expr',)) + self.arguments(node.args)
+        folded, fact = fold(node, _evaluator(node), facts)
+        return folded, fact or Fact('str', UNKNOWN, None)
+
+    def arguments(self, args):
+        facts = []
+        for i, arg in enumerate(args):
+            value, fact = self.visit(arg)
+            if self.rewrite:
+                args[i] = value
+            facts.append(fact or BOUND)
+        return facts
+
+    def visit_ListNode(self, node):
+        facts = self.arguments(node.elements)
+        values = [fact.value for fact in facts]
+        if UNKNOWN in values:
+            return node, Fact('list', UNKNOWN, None)
+        return node, fact_of_value(values)
+
+    def visit_FunctionCall(self, node):
+        # The name is looked up among the functions, not the variables
+        self.arguments(node.args)
+        return node, BOUND
+
+    def visit_RangeCall(self, node):
+        self.children(node, [name for name in ('start', 'stop', 'step')
+                             if getattr(node, name) is not None])
+        return node, Fact('range', UNKNOWN, None)
+
+
+class LoopInvariantHoister(NodeTransformer):
+    """Move expressions that do not change inside a loop out of it.
+
+    An expression is moved if none of its variables is assigned in the
+    loop, it calls no function, and with the facts at the loop's head it
+    cannot raise. Loops are handled from the outside in, so an expression
+    leaves every loop it is invariant in; equal expressions share one
+    variable.
+    """
+    def __init__(self, loop_facts, names):
+        self.loop_facts = loop_facts
+        self.names = set(names)
+        # Facts about the variables this pass adds
+        self.temps = {}
+
+    def new_name(self):
+        n = len(self.temps)
+        while f"_inv{n}" in self.names:
+            n += 1
+        name = f"_inv{n}"
+        self.names.add(name)
+        return name
+
+    def visit_WhileLoop(self, node):
+        return self.hoist(node, set(assigned_names(node.body)), ('condition', 'body'))
+
+    def visit_ForLoop(self, node):
+        return self.hoist(node, set(assigned_names(node.body)) | {node.var.name}, ('body',))
+
+    def hoist(self, node, assigned, fields):
+        facts = self.loop_facts.get(id(node))
+        if facts is None:
+            return self.generic_visit(node)
+        self.env = {**facts, **self.temps}
+        self.assigned = assigned
+        self.hoisted = {}
+        for name in fields:
+            setattr(node, name, self.replace(getattr(node, name)))
+        before = []
+        for source, (name, expr) in self.hoisted.items():
+            before.append(copy_location(Assign(copy_location(Identifier(name), expr), expr), expr))
+            self.temps[name] = Fact(kind(expr, self.env), UNKNOWN, None)
+        self.generic_visit(node)
+        return before + [node]
+
+    def invariant(self, node):
+        for child in walk(node):
+            if isinstance(child, (FunctionCall, RangeCall)):
+                return False
+            if isinstance(child, Identifier) and child.name in self.assigned:
+                return False
+        return True
+
+    def replace(self, node):
+        """node with the invariant expressions in it read from variables."""
+        if isinstance(node, list):
+            return [self.replace(item) for item in node]
+        if isinstance(node, FunctionDef) or not isinstance(node, Node):
+            return node
+        if (isinstance(node, (BinaryOp, UnaryOp, LenFunction, StringMethod, ListNode))
+                and self.invariant(node) and cannot_raise(node, self.env)):
+            source = unparse(node)
+            if source not in self.hoisted:
+                self.hoisted[source] = (self.new_name(), node)
+            return copy_location(Identifier(self.hoisted[source][0]), node)
+        if isinstance(node, Print) and isinstance(node.expr, ListNode):
+            # The arguments of print(a, b) are no list value
+            node.expr.elements = self.replace(node.expr.elements)
+            return node
+        for name in CHILD_FIELDS[type(node)]:
+            setattr(node, name, self.replace(getattr(node, name)))
+        return node
+
+
+def _references(body):
+    """Names read in body, leaving out the bodies of functions defined in it."""
+    names = set()
+    stack = [body]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, Identifier):
+            names.add(node.name)
+        elif isinstance(node, Node) and not isinstance(node, FunctionDef):
+            stack.extend(getattr(node, name) for name in CHILD_FIELDS[type(node)])
+    return names
+
+
+class _UnusedFunctionRemover(NodeTransformer):
+    def __init__(self, used):
+        self.used = used
+
+    def visit_FunctionDef(self, node):
+        if node.name not in self.used:
+            return None
+        return self.generic_visit(node)
+
+
+def drop_unused_functions(ast):
+    """Remove the functions the program cannot call, in place."""
+    definitions = {}
+    for node in walk(ast):
+        if isinstance(node, FunctionDef):
+            definitions.setdefault(node.name, []).append(node)
+    used, pending = set(), _references(ast)
+    while pending:
+        name = pending.pop()
+        if name in used:
+            continue
+        used.add(name)
+        for function in definitions.get(name, ()):
+            pending |= _references(function.body)
+    return _UnusedFunctionRemover(used).visit(ast)
+
+
+def uses(node):
+    """Names of the variables node reads."""
+    targets = set()
+    names = set()
+    for child in walk(node):
+        if isinstance(child, Assign):
+            targets.add(id(child.name))
+        elif isinstance(child, ForLoop):
+            targets.add(id(child.var))
+        elif isinstance(child, FunctionDef):
+            targets.update(map(id, child.params))
+        elif isinstance(child, Identifier) and id(child) not in targets:
+            names.add(child.name)
+    return names
+
+
+class DeadStoreEliminator(NodeVisitor):
+    """Remove assignments to the locals of a function that are never read.
+
+    Goes backwards through the body keeping the set of variables that may
+    still be read. A store is removed if the variable is not in the set and
+    its Assign is one of pure_stores, those the Propagator found cannot
+    raise. A variable is only made to lose all its stores if the function
+    never reads it, since otherwise the reads would go to a global.
+    """
+    def __init__(self, function, pure_stores):
+        params = {param.name for param in function.params}
+        assigned = assigned_names(function.body)
+        reads = uses(function.body)
+        pinned = params | {node.var.name for node in walk(function.body) if isinstance(node, ForLoop)}
+        pinned |= {node.name.name for node in walk(function.body)
+                   if isinstance(node, Assign) and id(node) not in pure_stores}
+        self.removable = {name for name in assigned if name in pinned or name not in reads}
+        self.pure_stores = pure_stores
+        self.live = set()
+        # Variables live wherever an exception can be raised
+        self.always = set()
+        self.loops = []
+        self.remove = True
+
+    def visit_list(self, node):
+        kept = []
+        for stmt in reversed(node):
+            self.live = self.live | self.always
+            if (self.remove and isinstance(stmt, Assign) and id(stmt) in self.pure_stores
+                    and stmt.name.name in self.removable and stmt.name.name not in self.live):
+                continue
+            self.visit(stmt)
+            kept.append(stmt)
+        if self.remove:
+            node[:] = kept[::-1]
+
+    def generic_visit(self, node):
+        self.live = self.live | uses(node)
+
+    def visit_FunctionDef(self, node):
+        # A nested function has a frame of its own
+        pass
+
+    def visit_Assign(self, node):
+        self.live = (self.live - {node.name.name}) | uses(node.expr)
+
+    def visit_IfElse(self, node):
+        after = self.live
+        self.visit(node.if_body)
+        live_if, self.live = self.live, after
+        self.visit(node.else_body or [])
+        self.live = live_if | self.live | uses(node.condition)
+
+    def loop(self, node, head_uses, var=None):
+        after = self.live
+        head = after | head_uses
+        remove, self.remove = self.remove, False
+        while True:
+            self.loops.append((after, head))
+            self.live = set(head)
+            self.visit(node.body)
+            self.loops.pop()
+            new_head = after | head_uses | (self.live - {var})
+            if new_head == head:
+                break
+            head = new_head
+        self.remove = remove
+        if remove:
+            self.loops.append((after, head))
+            self.live = set(head)
+            self.visit(node.body)
+            self.loops.pop()
+        self.live = head
+
+    def visit_WhileLoop(self, node):
+        self.loop(node, uses(node.condition))
+
+    def visit_ForLoop(self, node):
+        self.loop(node, set(), node.var.name)
+        self.live = self.live | uses(node.iterable)
+
+    def visit_TryExcept(self, node):
+        after = self.live
+        self.visit(node.except_body)
+        live_except, always = self.live, self.always
+        self.always = always | live_except
+        self.live = set(after)
+        self.visit(node.try_body)
+        self.always = always
+        self.live = self.live | live_except
+
+    def visit_Break(self, node):
+        self.live = set(self.loops[-1][0]) if self.loops else set()
+
+    def visit_Continue(self, node):
+        self.live = set(self.loops[-1][1]) if self.loops else set()
+
+
+class ConstantFolder(NodeTransformer):
+    """Fold operations on literals, and ifs on literal conditions."""
+    def fold(self, node):
+        self.generic_visit(node)
+        facts = []
+        for name in CHILD_FIELDS[type(node)]:
+            for child in (getattr(node, name) if name == 'args' else [getattr(node, name)]):
+                if not isinstance(child, (Number, String, Boolean)):
+                    return node
+                facts.append(fact_of_value(child.value))
+        return fold(node, _evaluator(node), facts)[0]
+
+    visit_BinaryOp = visit_UnaryOp = visit_IndexNode = visit_LenFunction = visit_StringMethod = fold
+
+    def visit_Print(self, node):
+        expr = node.expr
+        self.generic_visit(node)
+        if isinstance(node.expr, ListNode) and not isinstance(expr, ListNode):
+            node.expr = expr
+        return node
+
+    def visit_IfElse(self, node):
+        self.generic_visit(node)
+        if isinstance(node.condition, (Number, String, Boolean)):
+            return node.if_body if node.condition.value else (node.else_body or [])
+        return node
+
+
+def function_locals(ast):
+    """The names each FunctionDef of a tree binds, by id of the FunctionDef."""
+    return {id(node): set(assigned_names(node.body)) for node in walk(ast)
+            if isinstance(node, FunctionDef)}
+
+
+def keep_locals(ast, before):
+    """Give back to each function the locals the passes took from it.
+
+    Every engine decides which names are local from the assignments in a
+    function, so a removed branch that held the only assignment to a name
+    would make its reads find a module-level variable. An "if False:"
+    block at the end of the body assigns the names still read again.
+    """
+    for node in walk(ast):
+        if isinstance(node, FunctionDef) and id(node) in before:
+            params = {param.name if hasattr(param, 'name') else param for param in node.params}
+            lost = (before[id(node)] & uses(node.body)) - set(assigned_names(node.body)) - params
+            if lost:
+                stores = [Assign(Identifier(name), Number(0)) for name in sorted(lost)]
+                node.body.append(IfElse(Boolean(False), stores, []))
+    return ast
+
+
+def fold_constants(ast):
+    """A copy of a program with its constant expressions folded."""
+    ast = clone(ast)
+    before = function_locals(ast)
+    return keep_locals(ConstantFolder().visit(ast), before)
+
+
+def optimize(ast, whole=True):
+    """An optimized copy of a program.
+
+    With whole, the program is taken to be the only one run: functions it
+    does not call are dropped. Without it they are kept, for the later
+    programs an Interpreter runs to call. Loop invariants are kept in new variables named _inv0, _inv1
+    and so on where no name of the program is in the way: module-level
+    variables for loops at the top level, and locals of the function,
+    given slots by the resolver like its other locals, for loops in a
+    function body.
+    """
+    ast = clone(ast)
+    before = function_locals(ast)
+    names = {node.name for node in walk(ast) if isinstance(node, Identifier)}
+    names |= {node.name for node in walk(ast) if isinstance(node, FunctionDef)}
+    propagator = Propagator()
+    propagator.visit(ast)
+    LoopInvariantHoister(propagator.loop_facts, names).visit(ast)
+    if whole:
+        drop_unused_functions(ast)
+    for node in walk(ast):
+        if isinstance(node, FunctionDef):
+            DeadStoreEliminator(node, propagator.pure_stores).visit(node.body)
+    return keep_locals(ast, before)
+
+
+_program_cache = {}
+_PROGRAM_CACHE_SIZE = 32
+
+
+def optimize_program(ast):
+    """optimize(ast), kept for the next run of the same parsed program.
+
+    The program is not taken to be whole, as a later one run by the same
+    Interpreter may call the functions it defines. Reusing the optimized
+    tree also reuses what the engines compiled it to.
+    """
+    entry = _program_cache.get(id(ast))
+    if entry is not None and entry[0] is ast:
+        return entry[1]
+    optimized = optimize(ast, whole=False)
+    if len(_program_cache) >= _PROGRAM_CACHE_SIZE:
+        _program_cache.pop(next(iter(_program_cache)))
+    _program_cache[id(ast)] = (ast, optimized)
+    return optimized
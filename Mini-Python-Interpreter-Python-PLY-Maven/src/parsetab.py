@@ -0,0 +1,105 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftORleftANDleftEQNEleftLTGTLEGEleftPLUSMINUSleftTIMESDIVIDEMODULOrightUMINUSrightNOTnonassocLPARENRPARENAND BREAK COLON COMMA CONTINUE DEDENT DEF DIVIDE DOT ELSE EQ EQUALS EXCEPT FALSE FOR GE GT IDENTIFIER IF IN INDENT LBRACKET LE LEN LPAREN LT MINUS MODULO NE NEWLINE NOT NUMBER OR PLUS PRINT RANGE RBRACKET RETURN RPAREN STRING TIMES TRUE TRY WHILEprogram : statementsstatements : statement\n                  | statements statementstatement : print_stmt\n                | assign_stmt\n                | expr_stmt\n                | if_stmt\n                | while_stmt\n                | for_stmt\n                | function_def\n                | return_stmt\n                | break_stmt\n                | continue_stmt\n                | try_except_stmtstatement : NEWLINEprint_stmt : PRINT LPAREN expr_list RPAREN\n                 | PRINT exprexpr_stmt : exprassign_stmt : IDENTIFIER EQUALS expr\n                  | IDENTIFIER LBRACKET expr RBRACKET EQUALS exprif_stmt : IF expr COLON NEWLINE INDENT statements DEDENT\n               | IF expr COLON NEWLINE INDENT statements DEDENT ELSE COLON NEWLINE INDENT statements DEDENTwhile_stmt : WHILE expr COLON NEWLINE INDENT statements DEDENTfor_stmt : FOR IDENTIFIER IN expr COLON NEWLINE INDENT statements DEDENTfunction_def : DEF IDENTIFIER LPAREN param_list RPAREN COLON NEWLINE INDENT statements DEDENTparam_list : IDENTIFIER\n                 | param_list COMMA IDENTIFIER\n                 | emptyreturn_stmt : RETURN expr\n                  | RETURNbreak_stmt : BREAKcontinue_stmt : CONTINUEtry_except_stmt : TRY COLON NEWLINE INDENT statements DEDENT EXCEPT COLON NEWLINE INDENT statements DEDENTexpr : term\n            | expr PLUS term\n            | expr MINUS term\n            | expr TIMES term\n            | expr DIVIDE term\n            | expr MODULO term\n            | expr GT term\n            | expr LT term\n            | expr GE term\n            | expr LE term\n            | expr EQ term\n            | expr NE term\n            | expr AND term\n            | expr OR termterm : factor\n            | NOT term\n            | MINUS term %prec UMINUSfactor : NUMBER\n              | STRING\n              | TRUE\n              | FALSE\n              | IDENTIFIER\n              | list_expr\n              | function_call\n              | string_method\n              | len_function\n              | range_call\n              | LPAREN expr RPARENlist_expr : LBRACKET expr_list RBRACKET\n                | IDENTIFIER LBRACKET expr RBRACKETexpr_list : expr\n                | expr_list COMMA expr\n                | emptyfunction_call : IDENTIFIER LPAREN expr_list RPAREN\n                    | IDENTIFIER LPAREN RPARENstring_method : IDENTIFIER DOT IDENTIFIER LPAREN expr_list RPAREN\n                    | IDENTIFIER DOT IDENTIFIER LPAREN RPARENlen_function : LEN LPAREN expr RPARENrange_call : RANGE LPAREN expr_list RPAREN\n                 | RANGE LPAREN RPARENempty :'
+    
+_lr_action_items = {'NEWLINE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,74,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,103,104,110,111,113,114,123,124,125,126,129,130,131,132,135,136,137,138,139,141,144,145,146,150,151,152,153,154,155,158,159,160,161,162,163,164,],[15,15,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,107,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,117,118,-73,-16,-63,-67,15,-71,-72,-63,-70,15,15,140,15,-20,-69,15,15,147,-21,-23,15,15,15,156,157,-24,15,-25,15,15,15,15,-33,-22,]),'PRINT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[16,16,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,16,-71,-72,-63,-70,16,16,16,-20,-69,16,16,-21,-23,16,16,16,-24,16,-25,16,16,16,16,-33,-22,]),'IDENTIFIER':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,106,110,111,113,114,115,123,124,125,126,127,129,130,131,134,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[19,19,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,47,47,-18,-55,47,47,47,71,72,47,-31,-32,-34,47,-48,47,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,47,-17,-55,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,100,-29,-50,-49,47,47,47,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,47,47,120,-73,-16,-63,-67,47,19,-71,-72,-63,47,-70,19,19,142,19,-20,-69,19,19,-21,-23,19,19,19,-24,19,-25,19,19,19,19,-33,-22,]),'IF':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[21,21,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,21,-71,-72,-63,-70,21,21,21,-20,-69,21,21,-21,-23,21,21,21,-24,21,-25,21,21,21,21,-33,-22,]),'WHILE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[22,22,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,22,-71,-72,-63,-70,22,22,22,-20,-69,22,22,-21,-23,22,22,22,-24,22,-25,22,22,22,22,-33,-22,]),'FOR':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[23,23,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,23,-71,-72,-63,-70,23,23,23,-20,-69,23,23,-21,-23,23,23,23,-24,23,-25,23,23,23,23,-33,-22,]),'DEF':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[24,24,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,24,-71,-72,-63,-70,24,24,24,-20,-69,24,24,-21,-23,24,24,24,-24,24,-25,24,24,24,24,-33,-22,]),'RETURN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[25,25,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,25,-71,-72,-63,-70,25,25,25,-20,-69,25,25,-21,-23,25,25,25,-24,25,-25,25,25,25,25,-33,-22,]),'BREAK':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[26,26,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,26,-71,-72,-63,-70,26,26,26,-20,-69,26,26,-21,-23,26,26,26,-24,26,-25,26,26,26,26,-33,-22,]),'CONTINUE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[27,27,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,27,-71,-72,-63,-70,27,27,27,-20,-69,27,27,-21,-23,27,27,27,-24,27,-25,27,27,27,27,-33,-22,]),'TRY':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,123,124,125,126,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[28,28,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,28,-71,-72,-63,-70,28,28,28,-20,-69,28,28,-21,-23,28,28,28,-24,28,-25,28,28,28,28,-33,-22,]),'NOT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[32,32,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,32,32,-18,-55,32,32,32,32,-31,-32,-34,32,-48,32,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,32,-17,-55,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-29,-50,-49,32,32,32,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,32,32,-73,-16,-63,-67,32,32,-71,-72,-63,32,-70,32,32,32,-20,-69,32,32,-21,-23,32,32,32,-24,32,-25,32,32,32,32,-33,-22,]),'MINUS':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,67,69,70,73,75,76,77,78,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,102,105,108,110,111,112,113,114,115,116,119,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[30,30,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,30,30,50,-55,30,30,30,30,-31,-32,-34,30,-48,30,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,30,50,-55,50,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,50,50,50,50,-50,-49,30,30,50,30,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,50,50,-68,-62,30,30,50,-73,-16,50,-63,-67,30,50,50,30,-71,-72,-63,30,-70,30,30,30,50,-69,30,30,-21,-23,30,30,30,-24,30,-25,30,30,30,30,-33,-22,]),'NUMBER':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[33,33,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,33,33,-18,-55,33,33,33,33,-31,-32,-34,33,-48,33,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,33,-17,-55,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-29,-50,-49,33,33,33,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,33,33,-73,-16,-63,-67,33,33,-71,-72,-63,33,-70,33,33,33,-20,-69,33,33,-21,-23,33,33,33,-24,33,-25,33,33,33,33,-33,-22,]),'STRING':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[34,34,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,34,34,-18,-55,34,34,34,34,-31,-32,-34,34,-48,34,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,34,-17,-55,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-29,-50,-49,34,34,34,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,34,34,-73,-16,-63,-67,34,34,-71,-72,-63,34,-70,34,34,34,-20,-69,34,34,-21,-23,34,34,34,-24,34,-25,34,34,34,34,-33,-22,]),'TRUE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[35,35,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,35,35,-18,-55,35,35,35,35,-31,-32,-34,35,-48,35,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,35,-17,-55,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-29,-50,-49,35,35,35,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,35,35,-73,-16,-63,-67,35,35,-71,-72,-63,35,-70,35,35,35,-20,-69,35,35,-21,-23,35,35,35,-24,35,-25,35,35,35,35,-33,-22,]),'FALSE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[36,36,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,36,36,-18,-55,36,36,36,36,-31,-32,-34,36,-48,36,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,36,-17,-55,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-29,-50,-49,36,36,36,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,36,36,-73,-16,-63,-67,36,36,-71,-72,-63,36,-70,36,36,36,-20,-69,36,36,-21,-23,36,36,36,-24,36,-25,36,36,36,36,-33,-22,]),'LPAREN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,72,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,100,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[17,17,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,45,17,-18,64,17,17,17,17,-31,-32,-34,17,-48,17,-51,-52,-53,-54,-56,-57,-58,-59,-60,77,78,-3,17,-17,64,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,106,-29,-50,-49,17,17,17,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,115,-62,17,17,-73,-16,-63,-67,17,17,-71,-72,-63,17,-70,17,17,17,-20,-69,17,17,-21,-23,17,17,17,-24,17,-25,17,17,17,17,-33,-22,]),'LBRACKET':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[20,20,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,20,20,-18,63,20,20,20,20,-31,-32,-34,20,-48,20,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,20,-17,81,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,-29,-50,-49,20,20,20,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,20,20,-73,-16,-63,-67,20,20,-71,-72,-63,20,-70,20,20,20,-20,-69,20,20,-21,-23,20,20,20,-24,20,-25,20,20,20,20,-33,-22,]),'LEN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[42,42,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,42,42,-18,-55,42,42,42,42,-31,-32,-34,42,-48,42,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,42,-17,-55,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-29,-50,-49,42,42,42,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,42,42,-73,-16,-63,-67,42,42,-71,-72,-63,42,-70,42,42,42,-20,-69,42,42,-21,-23,42,42,42,-24,42,-25,42,42,42,42,-33,-22,]),'RANGE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,44,45,46,47,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,73,75,76,77,78,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,102,105,110,111,113,114,115,123,124,125,126,127,129,130,131,135,136,137,138,139,144,145,146,150,151,154,155,158,159,160,161,162,163,164,],[43,43,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,43,43,-18,-55,43,43,43,43,-31,-32,-34,43,-48,43,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,43,-17,-55,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-29,-50,-49,43,43,43,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,43,43,-73,-16,-63,-67,43,43,-71,-72,-63,43,-70,43,43,43,-20,-69,43,43,-21,-23,43,43,43,-24,43,-25,43,43,43,43,-33,-22,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,124,125,126,129,136,137,144,145,154,158,163,164,],[0,-1,-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,-71,-72,-63,-70,-20,-69,-21,-23,-24,-25,-33,-22,]),'DEDENT':([3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,25,26,27,29,31,33,34,35,36,37,38,39,40,41,44,46,47,73,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,99,101,110,111,113,114,124,125,126,129,135,136,137,138,139,144,145,150,154,155,158,161,162,163,164,],[-2,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-18,-55,-30,-31,-32,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-3,-17,-55,-29,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-19,-68,-62,-73,-16,-63,-67,-71,-72,-63,-70,143,-20,-69,144,145,-21,-23,154,-24,158,-25,163,164,-33,-22,]),'PLUS':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[49,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,49,-55,49,49,49,49,49,-50,-49,49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,49,49,-68,-62,49,-73,49,-63,-67,49,49,-71,-72,-63,-70,49,-69,]),'TIMES':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[51,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,51,-55,51,51,51,51,51,-50,-49,51,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,51,51,-68,-62,51,-73,51,-63,-67,51,51,-71,-72,-63,-70,51,-69,]),'DIVIDE':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[52,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,52,-55,52,52,52,52,52,-50,-49,52,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,52,52,-68,-62,52,-73,52,-63,-67,52,52,-71,-72,-63,-70,52,-69,]),'MODULO':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[53,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,53,-55,53,53,53,53,53,-50,-49,53,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,53,53,-68,-62,53,-73,53,-63,-67,53,53,-71,-72,-63,-70,53,-69,]),'GT':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[54,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,54,-55,54,54,54,54,54,-50,-49,54,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,54,54,-68,-62,54,-73,54,-63,-67,54,54,-71,-72,-63,-70,54,-69,]),'LT':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[55,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,55,-55,55,55,55,55,55,-50,-49,55,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,55,55,-68,-62,55,-73,55,-63,-67,55,55,-71,-72,-63,-70,55,-69,]),'GE':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[56,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,56,-55,56,56,56,56,56,-50,-49,56,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,56,56,-68,-62,56,-73,56,-63,-67,56,56,-71,-72,-63,-70,56,-69,]),'LE':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[57,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,57,-55,57,57,57,57,57,-50,-49,57,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,57,57,-68,-62,57,-73,57,-63,-67,57,57,-71,-72,-63,-70,57,-69,]),'EQ':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[58,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,58,-55,58,58,58,58,58,-50,-49,58,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,58,58,-68,-62,58,-73,58,-63,-67,58,58,-71,-72,-63,-70,58,-69,]),'NE':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[59,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,59,-55,59,59,59,59,59,-50,-49,59,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,59,59,-68,-62,59,-73,59,-63,-67,59,59,-71,-72,-63,-70,59,-69,]),'AND':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[60,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,60,-55,60,60,60,60,60,-50,-49,60,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,60,60,-68,-62,60,-73,60,-63,-67,60,60,-71,-72,-63,-70,60,-69,]),'OR':([18,19,29,31,33,34,35,36,37,38,39,40,41,46,47,48,67,69,70,73,75,76,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,110,112,113,114,116,119,124,125,126,129,136,137,],[61,-55,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,61,-55,61,61,61,61,61,-50,-49,61,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,61,61,-68,-62,61,-73,61,-63,-67,61,61,-71,-72,-63,-70,61,-69,]),'EQUALS':([19,113,],[62,127,]),'DOT':([19,47,],[65,65,]),'RBRACKET':([20,29,31,33,34,35,36,37,38,39,40,41,47,66,67,68,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,101,110,112,114,116,124,125,126,129,137,],[-74,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-55,101,-64,-66,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,113,-68,-62,-73,126,-67,-65,-71,-72,-63,-70,-69,]),'COMMA':([20,29,31,33,34,35,36,37,38,39,40,41,45,47,64,66,67,68,75,76,78,79,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,98,99,101,106,109,110,114,115,116,120,121,122,124,125,126,128,129,137,142,],[-74,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-74,-55,-74,102,-64,-66,-50,-49,-74,102,-64,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,102,-68,-62,-74,102,-73,-67,-74,-65,-26,134,-28,-71,-72,-63,102,-70,-69,-27,]),'COLON':([28,29,31,33,34,35,36,37,38,39,40,41,47,69,70,75,76,82,83,84,85,86,87,88,89,90,91,92,93,94,95,99,101,110,114,119,124,125,126,129,133,137,148,149,],[74,-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-55,103,104,-50,-49,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-68,-62,-73,-67,132,-71,-72,-63,-70,141,-69,152,153,]),'RPAREN':([29,31,33,34,35,36,37,38,39,40,41,45,47,48,64,67,68,75,76,78,79,80,82,83,84,85,86,87,88,89,90,91,92,93,94,95,98,99,101,106,108,109,110,114,115,116,120,121,122,124,125,126,128,129,137,142,],[-34,-48,-51,-52,-53,-54,-56,-57,-58,-59,-60,-74,-55,82,99,-64,-66,-50,-49,110,111,82,-61,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,114,-68,-62,-74,124,125,-73,-67,129,-65,-26,133,-28,-71,-72,-63,137,-70,-69,-27,]),'IN':([71,],[105,]),'INDENT':([107,117,118,140,147,156,157,],[123,130,131,146,151,159,160,]),'EXCEPT':([143,],[148,]),'ELSE':([144,],[149,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'statements':([0,123,130,131,146,151,159,160,],[2,135,138,139,150,155,161,162,]),'statement':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[3,44,3,3,3,44,44,44,3,44,3,44,3,3,44,44,]),'print_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,]),'assign_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,]),'expr_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,]),'if_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),'while_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'for_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,]),'function_def':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'return_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'break_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'continue_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),'try_except_stmt':([0,2,123,130,131,135,138,139,146,150,151,155,159,160,161,162,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,]),'expr':([0,2,16,17,20,21,22,25,45,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[18,18,46,48,67,69,70,73,80,96,97,67,108,67,112,116,119,67,18,136,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'term':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[29,29,29,29,29,29,29,29,75,76,29,83,84,85,86,87,88,89,90,91,92,93,94,95,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'factor':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'list_expr':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'function_call':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,]),'string_method':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,]),'len_function':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,]),'range_call':([0,2,16,17,20,21,22,25,30,32,45,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,77,78,81,102,105,115,123,127,130,131,135,138,139,146,150,151,155,159,160,161,162,],[41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'expr_list':([20,45,64,78,115,],[66,79,98,109,128,]),'empty':([20,45,64,78,106,115,],[68,68,68,68,122,68,]),'param_list':([106,],[121,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> statements','program',1,'p_program','myparser.py',24),
+  ('statements -> statement','statements',1,'p_statements','myparser.py',28),
+  ('statements -> statements statement','statements',2,'p_statements','myparser.py',29),
+  ('statement -> print_stmt','statement',1,'p_statement_code','myparser.py',39),
+  ('statement -> assign_stmt','statement',1,'p_statement_code','myparser.py',40),
+  ('statement -> expr_stmt','statement',1,'p_statement_code','myparser.py',41),
+  ('statement -> if_stmt','statement',1,'p_statement_code','myparser.py',42),
+  ('statement -> while_stmt','statement',1,'p_statement_code','myparser.py',43),
+  ('statement -> for_stmt','statement',1,'p_statement_code','myparser.py',44),
+  ('statement -> function_def','statement',1,'p_statement_code','myparser.py',45),
+  ('statement -> return_stmt','statement',1,'p_statement_code','myparser.py',46),
+  ('statement -> break_stmt','statement',1,'p_statement_code','myparser.py',47),
+  ('statement -> continue_stmt','statement',1,'p_statement_code','myparser.py',48),
+  ('statement -> try_except_stmt','statement',1,'p_statement_code','myparser.py',49),
+  ('statement -> NEWLINE','statement',1,'p_statement_newline','myparser.py',53),
+  ('print_stmt -> PRINT LPAREN expr_list RPAREN','print_stmt',4,'p_print_stmt','myparser.py',57),
+  ('print_stmt -> PRINT expr','print_stmt',2,'p_print_stmt','myparser.py',58),
+  ('expr_stmt -> expr','expr_stmt',1,'p_expr_stmt','myparser.py',68),
+  ('assign_stmt -> IDENTIFIER EQUALS expr','assign_stmt',3,'p_assign_stmt','myparser.py',72),
+  ('assign_stmt -> IDENTIFIER LBRACKET expr RBRACKET EQUALS expr','assign_stmt',6,'p_assign_stmt','myparser.py',73),
+  ('if_stmt -> IF expr COLON NEWLINE INDENT statements DEDENT','if_stmt',7,'p_if_stmt','myparser.py',80),
+  ('if_stmt -> IF expr COLON NEWLINE INDENT statements DEDENT ELSE COLON NEWLINE INDENT statements DEDENT','if_stmt',13,'p_if_stmt','myparser.py',81),
+  ('while_stmt -> WHILE expr COLON NEWLINE INDENT statements DEDENT','while_stmt',7,'p_while_stmt','myparser.py',88),
+  ('for_stmt -> FOR IDENTIFIER IN expr COLON NEWLINE INDENT statements DEDENT','for_stmt',9,'p_for_stmt','myparser.py',92),
+  ('function_def -> DEF IDENTIFIER LPAREN param_list RPAREN COLON NEWLINE INDENT statements DEDENT','function_def',10,'p_function_def','myparser.py',96),
+  ('param_list -> IDENTIFIER','param_list',1,'p_param_list','myparser.py',107),
+  ('param_list -> param_list COMMA IDENTIFIER','param_list',3,'p_param_list','myparser.py',108),
+  ('param_list -> empty','param_list',1,'p_param_list','myparser.py',109),
+  ('return_stmt -> RETURN expr','return_stmt',2,'p_return_stmt','myparser.py',122),
+  ('return_stmt -> RETURN','return_stmt',1,'p_return_stmt','myparser.py',123),
+  ('break_stmt -> BREAK','break_stmt',1,'p_break_stmt','myparser.py',130),
+  ('continue_stmt -> CONTINUE','continue_stmt',1,'p_continue_stmt','myparser.py',134),
+  ('try_except_stmt -> TRY COLON NEWLINE INDENT statements DEDENT EXCEPT COLON NEWLINE INDENT statements DEDENT','try_except_stmt',12,'p_try_except_stmt','myparser.py',138),
+  ('expr -> term','expr',1,'p_expr','myparser.py',142),
+  ('expr -> expr PLUS term','expr',3,'p_expr','myparser.py',143),
+  ('expr -> expr MINUS term','expr',3,'p_expr','myparser.py',144),
+  ('expr -> expr TIMES term','expr',3,'p_expr','myparser.py',145),
+  ('expr -> expr DIVIDE term','expr',3,'p_expr','myparser.py',146),
+  ('expr -> expr MODULO term','expr',3,'p_expr','myparser.py',147),
+  ('expr -> expr GT term','expr',3,'p_expr','myparser.py',148),
+  ('expr -> expr LT term','expr',3,'p_expr','myparser.py',149),
+  ('expr -> expr GE term','expr',3,'p_expr','myparser.py',150),
+  ('expr -> expr LE term','expr',3,'p_expr','myparser.py',151),
+  ('expr -> expr EQ term','expr',3,'p_expr','myparser.py',152),
+  ('expr -> expr NE term','expr',3,'p_expr','myparser.py',153),
+  ('expr -> expr AND term','expr',3,'p_expr','myparser.py',154),
+  ('expr -> expr OR term','expr',3,'p_expr','myparser.py',155),
+  ('term -> factor','term',1,'p_term','myparser.py',162),
+  ('term -> NOT term','term',2,'p_term','myparser.py',163),
+  ('term -> MINUS term','term',2,'p_term','myparser.py',164),
+  ('factor -> NUMBER','factor',1,'p_factor','myparser.py',171),
+  ('factor -> STRING','factor',1,'p_factor','myparser.py',172),
+  ('factor -> TRUE','factor',1,'p_factor','myparser.py',173),
+  ('factor -> FALSE','factor',1,'p_factor','myparser.py',174),
+  ('factor -> IDENTIFIER','factor',1,'p_factor','myparser.py',175),
+  ('factor -> list_expr','factor',1,'p_factor','myparser.py',176),
+  ('factor -> function_call','factor',1,'p_factor','myparser.py',177),
+  ('factor -> string_method','factor',1,'p_factor','myparser.py',178),
+  ('factor -> len_function','factor',1,'p_factor','myparser.py',179),
+  ('factor -> range_call','factor',1,'p_factor','myparser.py',180),
+  ('factor -> LPAREN expr RPAREN','factor',3,'p_factor','myparser.py',181),
+  ('list_expr -> LBRACKET expr_list RBRACKET','list_expr',3,'p_list_expr','myparser.py',199),
+  ('list_expr -> IDENTIFIER LBRACKET expr RBRACKET','list_expr',4,'p_list_expr','myparser.py',200),
+  ('expr_list -> expr','expr_list',1,'p_expr_list','myparser.py',207),
+  ('expr_list -> expr_list COMMA expr','expr_list',3,'p_expr_list','myparser.py',208),
+  ('expr_list -> empty','expr_list',1,'p_expr_list','myparser.py',209),
+  ('function_call -> IDENTIFIER LPAREN expr_list RPAREN','function_call',4,'p_function_call','myparser.py',217),
+  ('function_call -> IDENTIFIER LPAREN RPAREN','function_call',3,'p_function_call','myparser.py',218),
+  ('string_method -> IDENTIFIER DOT IDENTIFIER LPAREN expr_list RPAREN','string_method',6,'p_string_method','myparser.py',225),
+  ('string_method -> IDENTIFIER DOT IDENTIFIER LPAREN RPAREN','string_method',5,'p_string_method','myparser.py',226),
+  ('len_function -> LEN LPAREN expr RPAREN','len_function',4,'p_len_function','myparser.py',233),
+  ('range_call -> RANGE LPAREN expr_list RPAREN','range_call',4,'p_range_call','myparser.py',237),
+  ('range_call -> RANGE LPAREN RPAREN','range_call',3,'p_range_call','myparser.py',238),
+  ('empty -> <empty>','empty',0,'p_empty','myparser.py',250),
+]
+_grammar_version = '31aaee1e6469ff2e'
@@ -0,0 +1,394 @@
+"""Hand-written Pratt parser, an alternative backend to the PLY grammar.
+
+PrattParser reads the token stream of lexer.IndentLexer or
+fastlexer.FastLexer and builds exactly the tree the LALR grammar in
+myparser builds, source positions included, without the parse tables or
+a YaccProduction per reduction. Statements are parsed by recursive
+descent, dispatching on their first token; expressions by a Pratt loop
+over a table of binding powers.
+
+The grammar's expr rule is flat: every binary operator takes a term on
+its right, so its precedence declarations never come into play and all
+binary operators bind equally and associate to the left. The table gives
+them one binding power to match, and prefix operators take a term, as
+in the grammar. Where the grammar has shift/reduce conflicts PLY shifts,
+and so does this parser: an expression runs on through a MINUS that
+could start the next statement, return takes an expression whenever one
+follows, and print(x) prints the parenthesized expression x rather than
+an argument list of one.
+"""
+from .ast_nodes import *
+from .lexer import token_length, tokens
+from .myparser import syntax_error
+from .source_index import index_for
+
+# All binary operators bind equally, as in the grammar's flat expr rule
+_BINDING_POWER = dict.fromkeys(
+    ('PLUS', 'MINUS', 'TIMES', 'DIVIDE', 'MODULO', 'GT', 'LT', 'GE', 'LE',
+     'EQ', 'NE', 'AND', 'OR'), 10)
+
+# Tokens that can start an expression
+_EXPR_START = frozenset(('NUMBER', 'STRING', 'TRUE', 'FALSE', 'IDENTIFIER', 'LBRACKET',
+                         'LPAREN', 'NOT', 'MINUS', 'LEN', 'RANGE'))
+
+# Tokens whose value is their source text
+_UNQUOTED = frozenset(tokens) - {'NUMBER', 'STRING'}
+
+
+class _End:
+    """The token after the last one."""
+    type = '$end'
+
+
+_END = _End()
+
+
+class PrattParser:
+    """Parser producing the same trees as the PLY parser of myparser.
+
+    It keeps the state of one parse at a time, so concurrent parses each
+    need their own; CompilerContext holds one next to its PLY parser.
+    """
+    def parse(self, code, lexer):
+        lexer.input(code)
+        # Tokens are read as needed, one past the current at most
+        self._next_token = lexer.token
+        self.ahead = None
+        self.tok = self._next_token() or _END
+        self.source = lexer.lexdata
+        self.line_starts = index_for(self.source).line_starts.tolist()
+        try:
+            return self._statements('$end')
+        finally:
+            self._next_token = self.tok = self.ahead = None
+
+    # Token handling
+
+    def _advance(self):
+        tok = self.tok
+        if self.ahead is None:
+            self.tok = self._next_token() or _END
+        else:
+            self.tok = self.ahead
+            self.ahead = None
+        return tok
+
+    def _peek(self):
+        """The token after the current one."""
+        if self.ahead is None:
+            self.ahead = self._next_token() or _END
+        return self.ahead
+
+    def _expect(self, type):
+        if self.tok.type != type:
+            raise self._error()
+        return self._advance()
+
+    def _error(self):
+        tok = self.tok
+        return syntax_error(self.source, None if tok is _END else tok)
+
+    # Source positions, as myparser._token and myparser._locate set them
+
+    def _token_end(self, tok):
+        if tok.type in _UNQUOTED:
+            return tok.lexpos + len(tok.value)
+        return tok.lexpos + token_length(self.source, tok)
+
+    def _leaf(self, node, tok):
+        """Give node the span of a single token."""
+        return self._from_token(node, tok, self._token_end(tok))
+
+    def _from_token(self, node, tok, end):
+        """Give node the span from the start of tok to end."""
+        lineno = node.lineno = tok.lineno
+        node.col_offset = tok.lexpos - self.line_starts[lineno - 1]
+        node.end = end
+        return node
+
+    @staticmethod
+    def _from_node(node, first, end):
+        """Give node the span from the start of node first to end."""
+        node.lineno = first.lineno
+        node.col_offset = first.col_offset
+        node.end = end
+        return node
+
+    # Statements
+
+    def _statements(self, end):
+        """One or more statements up to a token of type end; blank lines are dropped."""
+        body = []
+        while True:
+            stmt = self._statement()
+            if stmt is not None:
+                body.append(stmt)
+            if self.tok.type == end:
+                return body
+
+    def _statement(self):
+        handler = _STATEMENTS.get(self.tok.type)
+        if handler is not None:
+            return handler(self)
+        if self.tok.type in _EXPR_START:
+            return self._expression()
+        raise self._error()
+
+    def _block(self):
+        """COLON NEWLINE INDENT statements DEDENT, as (colon token, statements)."""
+        colon = self._expect('COLON')
+        self._expect('NEWLINE')
+        self._expect('INDENT')
+        body = self._statements('DEDENT')
+        self._advance()
+        return colon, body
+
+    def _block_end(self, colon, body):
+        # As in myparser._block_end: the last statement, or the colon of an empty block
+        return body[-1].end if body else self._token_end(colon)
+
+    def _newline(self):
+        self._advance()
+        return None
+
+    def _print(self):
+        keyword = self._advance()
+        if self.tok.type != 'LPAREN':
+            value = self._expression()
+            return self._from_token(Print(value), keyword, value.end)
+        lparen = self._advance()
+        if self.tok.type in ('RPAREN', 'COMMA'):
+            args = self._expr_list()
+        else:
+            first = self._expression()
+            if self.tok.type == 'RPAREN':
+                # print(x): a parenthesized expression, which may go on
+                self._from_token(first, lparen, self._token_end(self._advance()))
+                value = self._expression(left=first)
+                return self._from_token(Print(value), keyword, value.end)
+            args = self._expr_list(first)
+        rparen = self._expect('RPAREN')
+        if len(args) == 1:
+            return self._from_token(Print(args[0]), keyword, self._token_end(rparen))
+        values = ListNode(args)
+        if args:
+            self._from_node(values, args[0], args[-1].end)
+        else:
+            self._from_token(values, lparen, self._token_end(rparen))
+        return self._from_token(Print(values), keyword, self._token_end(rparen))
+
+    def _identifier(self):
+        name = self.tok
+        following = self._peek().type
+        if following == 'EQUALS':
+            self._advance()
+            self._advance()
+            value = self._expression()
+            target = self._leaf(Identifier(name.value), name)
+            return self._from_token(Assign(target, value), name, value.end)
+        if following == 'LBRACKET':
+            # a[i] = v assigns to an item; otherwise a[i] starts an expression
+            self._advance()
+            self._advance()
+            index = self._expression()
+            rbracket = self._expect('RBRACKET')
+            target = self._leaf(Identifier(name.value), name)
+            if self.tok.type == 'EQUALS':
+                self._advance()
+                value = self._expression()
+                return self._from_token(ListAssign(target, index, value), name, value.end)
+            item = self._from_token(IndexNode(target, index), name, self._token_end(rbracket))
+            return self._expression(left=item)
+        return self._expression()
+
+    def _if(self):
+        keyword = self._advance()
+        test = self._expression()
+        colon, body = self._block()
+        if self.tok.type != 'ELSE':
+            return self._from_token(IfElse(test, body, []), keyword, self._block_end(colon, body))
+        self._advance()
+        colon, orelse = self._block()
+        return self._from_token(IfElse(test, body, orelse), keyword, self._block_end(colon, orelse))
+
+    def _while(self):
+        keyword = self._advance()
+        test = self._expression()
+        colon, body = self._block()
+        return self._from_token(WhileLoop(test, body), keyword, self._block_end(colon, body))
+
+    def _for(self):
+        keyword = self._advance()
+        var = self._leaf(Identifier(self.tok.value), self._expect('IDENTIFIER'))
+        self._expect('IN')
+        iterable = self._expression()
+        colon, body = self._block()
+        return self._from_token(ForLoop(var, iterable, body), keyword, self._block_end(colon, body))
+
+    def _def(self):
+        keyword = self._advance()
+        name = self._expect('IDENTIFIER').value
+        self._expect('LPAREN')
+        params = []
+        if self.tok.type == 'IDENTIFIER' or self.tok.type == 'COMMA':
+            # As in the grammar, the list may start out empty: def f(, a)
+            if self.tok.type == 'IDENTIFIER':
+                params.append(self._leaf(Identifier(self.tok.value), self._advance()))
+            while self.tok.type == 'COMMA':
+                self._advance()
+                params.append(self._leaf(Identifier(self.tok.value), self._expect('IDENTIFIER')))
+        self._expect('RPAREN')
+        colon, body = self._block()
+        return self._from_token(FunctionDef(name, params, body), keyword, self._block_end(colon, body))
+
+    def _return(self):
+        keyword = self._advance()
+        if self.tok.type in _EXPR_START:
+            value = self._expression()
+            return self._from_token(Return(value), keyword, value.end)
+        return self._leaf(Return(None), keyword)
+
+    def _break(self):
+        return self._leaf(Break(), self._advance())
+
+    def _continue(self):
+        return self._leaf(Continue(), self._advance())
+
+    def _try(self):
+        keyword = self._advance()
+        _, body = self._block()
+        self._expect('EXCEPT')
+        colon, handler = self._block()
+        return self._from_token(TryExcept(body, handler), keyword, self._block_end(colon, handler))
+
+    # Expressions
+
+    def _expression(self, power=0, left=None):
+        """An expression of operators binding tighter than power.
+
+        left is an operand already parsed, for callers that had to read
+        past it to know they were looking at an expression.
+        """
+        if left is None:
+            left = self._prefix()
+        while _BINDING_POWER.get(self.tok.type, 0) > power:
+            op = self._advance()
+            right = self._expression(_BINDING_POWER[op.type])
+            left = self._from_node(BinaryOp(left, op.value, right), left, right.end)
+        return left
+
+    def _prefix(self):
+        tok = self.tok
+        if tok.type == 'NOT' or tok.type == 'MINUS':
+            self._advance()
+            operand = self._prefix()
+            return self._from_token(UnaryOp(tok.value, operand), tok, operand.end)
+        handler = _ATOMS.get(tok.type)
+        if handler is None:
+            raise self._error()
+        return handler(self)
+
+    def _expr_list(self, first=None):
+        """Comma separated expressions, possibly none, as the grammar's expr_list."""
+        items = []
+        if first is not None:
+            items.append(first)
+        elif self.tok.type in _EXPR_START:
+            items.append(self._expression())
+        elif self.tok.type != 'COMMA':
+            return items
+        while self.tok.type == 'COMMA':
+            self._advance()
+            items.append(self._expression())
+        return items
+
+    def _number(self):
+        tok = self._advance()
+        return self._leaf(Number(tok.value), tok)
+
+    def _string(self):
+        tok = self._advance()
+        return self._leaf(String(tok.value), tok)
+
+    def _boolean(self):
+        tok = self._advance()
+        return self._leaf(Boolean(tok.type == 'TRUE'), tok)
+
+    def _name(self):
+        tok = self._advance()
+        name = self._leaf(Identifier(tok.value), tok)
+        following = self.tok.type
+        if following == 'LPAREN':
+            self._advance()
+            args = self._expr_list()
+            end = self._token_end(self._expect('RPAREN'))
+            return self._from_token(FunctionCall(name, args), tok, end)
+        if following == 'LBRACKET':
+            self._advance()
+            index = self._expression()
+            end = self._token_end(self._expect('RBRACKET'))
+            return self._from_token(IndexNode(name, index), tok, end)
+        if following == 'DOT':
+            self._advance()
+            method = self._expect('IDENTIFIER').value
+            self._expect('LPAREN')
+            args = self._expr_list()
+            end = self._token_end(self._expect('RPAREN'))
+            return self._from_token(StringMethod(name, method, args), tok, end)
+        return name
+
+    def _list(self):
+        tok = self._advance()
+        elements = self._expr_list()
+        end = self._token_end(self._expect('RBRACKET'))
+        return self._from_token(ListNode(elements), tok, end)
+
+    def _parenthesized(self):
+        tok = self._advance()
+        value = self._expression()
+        # The span takes in the parentheses, as in myparser.p_factor
+        return self._from_token(value, tok, self._token_end(self._expect('RPAREN')))
+
+    def _len(self):
+        tok = self._advance()
+        self._expect('LPAREN')
+        value = self._expression()
+        end = self._token_end(self._expect('RPAREN'))
+        return self._from_token(LenFunction(value), tok, end)
+
+    def _range(self):
+        tok = self._advance()
+        self._expect('LPAREN')
+        args = self._expr_list()
+        end = self._token_end(self._expect('RPAREN'))
+        # Missing arguments are None, extra ones are dropped, as in myparser.p_range_call
+        args += [None] * (3 - len(args))
+        return self._from_token(RangeCall(args[0], args[1], args[2]), tok, end)
+
+
+# Parse methods by the type of the first token
+_STATEMENTS = {
+    'NEWLINE': PrattParser._newline,
+    'PRINT': PrattParser._print,
+    'IDENTIFIER': PrattParser._identifier,
+    'IF': PrattParser._if,
+    'WHILE': PrattParser._while,
+    'FOR': PrattParser._for,
+    'DEF': PrattParser._def,
+    'RETURN': PrattParser._return,
+    'BREAK': PrattParser._break,
+    'CONTINUE': PrattParser._continue,
+    'TRY': PrattParser._try,
+}
+
+_ATOMS = {
+    'NUMBER': PrattParser._number,
+    'STRING': PrattParser._string,
+    'TRUE': PrattParser._boolean,
+    'FALSE': PrattParser._boolean,
+    'IDENTIFIER': PrattParser._name,
+    'LBRACKET': PrattParser._list,
+    'LPAREN': PrattParser._parenthesized,
+    'LEN': PrattParser._len,
+    'RANGE': PrattParser._range,
+}
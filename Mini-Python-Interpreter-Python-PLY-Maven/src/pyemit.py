@@ -0,0 +1,360 @@
+"""Native engine: translate the AST to Python source and run it as CPython bytecode.
+
+Mini-Python names are prefixed so they can never clash with Python keywords
+or the helpers: variables become ``v_<name>``, functions ``f_<name>`` and
+helpers are ``_mp_*``. Every FunctionDef is hoisted to a module-level
+``_mp_def_<n>`` that is bound to its ``f_<name>`` when the def statement
+runs, so nested functions see globals exactly as in the other engines.
+
+Programs outside the subset that translates faithfully (dynamic arity,
+functions used as values, unknown nodes, ...) are run by the closure engine.
+"""
+import hashlib
+import re
+
+from .ast_nodes import *
+from . import closure_compiler
+from .resolver import assigned_names
+from .runtime import (divide, modulo, logical_and, logical_or, index_value,
+                      length_of, string_method, check_iterable)
+
+_HELPERS = {
+    '_mp_div': divide,
+    '_mp_mod': modulo,
+    '_mp_and': logical_and,
+    '_mp_or': logical_or,
+    '_mp_index': index_value,
+    '_mp_len': length_of,
+    '_mp_method': string_method,
+    '_mp_range': range,
+    '_mp_iter': check_iterable,
+    '_mp_Exception': Exception,
+}
+
+_INLINE_BINARY = {'+', '-', '*', '==', '!=', '<', '>', '<=', '>='}
+_HELPER_BINARY = {'/': '_mp_div', '%': '_mp_mod', 'and': '_mp_and', 'or': '_mp_or'}
+
+_NAME_IN_MESSAGE = re.compile(r"'(\w+)'")
+
+
+class Unsupported(Exception):
+    """Raised while emitting a program the native engine cannot run faithfully."""
+
+
+def _function_name(node):
+    return node.name.name if hasattr(node.name, 'name') else node.name
+
+
+def _param_name(param):
+    return param.name if hasattr(param, 'name') else param
+
+
+def _walk(ast):
+    """Yield every node in the tree."""
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, Node):
+            yield node
+            stack.extend(iter_child_nodes(node))
+
+
+class PythonEmitter:
+    """Generate Python source for a program."""
+    def __init__(self, ast):
+        self.lines = []
+        self.indent = 0
+        self.definitions = []
+        self.nodes = []
+        self.arity = {}
+        self.read_names = set()
+        for node in _walk(ast):
+            if isinstance(node, FunctionDef):
+                if self.arity.setdefault(node.name, len(node.params)) != len(node.params):
+                    raise Unsupported(f"{node.name} is defined with different arities")
+
+    def emit_program(self, ast):
+        main = self.block_lines(ast, globals_=assigned_names(ast))
+        lines = self.definitions + ["def _mp_main():"] + main
+        return "\n".join(lines) + "\n"
+
+    def line(self, text):
+        self.lines.append("    " * self.indent + text)
+
+    def block_lines(self, statements, globals_=()):
+        """Emit a function body and return its lines, indented one level."""
+        saved = self.lines, self.indent
+        self.lines, self.indent = [], 1
+        names = sorted({'v_' + name for name in globals_})
+        if names:
+            self.line("global " + ", ".join(names))
+        self.body(statements)
+        lines = self.lines
+        self.lines, self.indent = saved
+        return lines
+
+    # Statements
+    def body(self, statements):
+        if not isinstance(statements, list):
+            statements = [statements]
+        start = len(self.lines)
+        for statement in statements:
+            if statement is not None:
+                self.statement(statement)
+        if len(self.lines) == start:
+            self.line("pass")
+
+    def indented(self, statements):
+        self.indent += 1
+        self.body(statements)
+        self.indent -= 1
+
+    def statement(self, node):
+        method = getattr(self, f'emit_{node.__class__.__name__}', None)
+        if method is not None:
+            method(node)
+        else:
+            self.line(self.expr(node))
+
+    def emit_Assign(self, node):
+        self.line(f"v_{node.name.name} = {self.expr(node.expr)}")
+
+    def emit_Print(self, node):
+        if isinstance(node.expr, ListNode):
+            args = ", ".join(self.expr(e) for e in node.expr.elements)
+        else:
+            args = self.expr(node.expr)
+        self.line(f"_mp_print({args})")
+
+    def emit_IfElse(self, node):
+        self.line(f"if {self.expr(node.condition)}:")
+        self.indented(node.if_body)
+        if node.else_body:
+            self.line("else:")
+            self.indented(node.else_body)
+
+    def emit_WhileLoop(self, node):
+        self.line(f"while {self.expr(node.condition)}:")
+        self.indented(node.body)
+
+    def emit_ForLoop(self, node):
+        self.line(f"for v_{node.var.name} in _mp_iter({self.expr(node.iterable)}):")
+        self.indented(node.body)
+
+    def emit_FunctionDef(self, node):
+        index = len(self.nodes)
+        self.nodes.append(node)
+        params = ", ".join('v_' + _param_name(p) for p in node.params)
+        body = self.block_lines(node.body)
+        # Hoisted to module level; the def statement only binds it
+        self.definitions.append(f"def _mp_def_{index}({params}):")
+        self.definitions.extend(body)
+        self.line(f"_mp_define({index})")
+
+    def emit_Return(self, node):
+        self.line(f"return {self.expr(node.expr)}")
+
+    def emit_Break(self, node):
+        self.line("break")
+
+    def emit_Continue(self, node):
+        self.line("continue")
+
+    def emit_TryExcept(self, node):
+        self.line("try:")
+        self.indented(node.try_body)
+        self.line("except _mp_Exception:")
+        self.indented(node.except_body)
+
+    # Expressions
+    def expr(self, node):
+        if node is None:
+            return "None"
+        method = getattr(self, f'expr_{node.__class__.__name__}', None)
+        if method is None:
+            raise Unsupported(f"No evaluate_{node.__class__.__name__} method")
+        return method(node)
+
+    def expr_Number(self, node):
+        if not isinstance(node.value, (int, str, bool)):
+            raise Unsupported(f"Literal {node.value!r}")
+        return repr(node.value)
+
+    expr_String = expr_Boolean = expr_Number
+
+    def expr_Identifier(self, node):
+        if node.name in self.arity:
+            # Reading a function as a value falls back to the functions table
+            raise Unsupported(f"Function {node.name} used as a value")
+        self.read_names.add(node.name)
+        return 'v_' + node.name
+
+    def expr_BinaryOp(self, node):
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        if node.op in _INLINE_BINARY:
+            return f"({left} {node.op} {right})"
+        if node.op in _HELPER_BINARY:
+            return f"{_HELPER_BINARY[node.op]}({left}, {right})"
+        raise Unsupported(f"Unknown operator: {node.op}")
+
+    def expr_UnaryOp(self, node):
+        if node.op == '-':
+            return f"(-{self.expr(node.expr)})"
+        elif node.op == 'not':
+            return f"(not {self.expr(node.expr)})"
+        raise Unsupported(f"Unknown unary operator: {node.op}")
+
+    def expr_FunctionCall(self, node):
+        name = _function_name(node)
+        if self.arity.get(name) != len(node.args):
+            # Undefined here or called with extra/missing arguments
+            raise Unsupported(f"Call to {name} with {len(node.args)} arguments")
+        args = ", ".join(self.expr(arg) for arg in node.args)
+        return f"f_{name}({args})"
+
+    def expr_ListNode(self, node):
+        return "[" + ", ".join(self.expr(e) for e in node.elements) + "]"
+
+    def expr_IndexNode(self, node):
+        return f"_mp_index({self.expr(node.expr)}, {self.expr(node.index)})"
+
+    def expr_LenFunction(self, node):
+        return f"_mp_len({self.expr(node.expr)})"
+
+    def expr_StringMethod(self, node):
+        args = ", ".join(self.expr(arg) for arg in node.args)
+        return f"_mp_method({self.expr(node.expr)}, {node.method!r}, [{args}])"
+
+    def expr_RangeCall(self, node):
+        if node.stop is None:
+            start, stop = "0", self.expr(node.start)
+        else:
+            start = self.expr(node.start) if node.start is not None else "0"
+            stop = self.expr(node.stop)
+        step = self.expr(node.step) if node.step is not None else "1"
+        return f"_mp_range({start}, {stop}, {step})"
+
+
+def _undefined_error(error):
+    """Translate a Python NameError into the Interpreter's error message."""
+    name = getattr(error, 'name', None)
+    if name is None:
+        match = _NAME_IN_MESSAGE.search(str(error))
+        name = match.group(1) if match else ''
+    if name.startswith('f_'):
+        return Exception(f"Undefined function: {name[2:]}")
+    return Exception(f"Undefined variable or function: {name[2:]}")
+
+
+class NativeProgram:
+    """A program compiled to a Python code object; run() may be called any number of times."""
+    def __init__(self, source, code, nodes, read_names):
+        self.source = source
+        self.code = code
+        self.nodes = nodes
+        self.read_names = read_names
+        self.index_of = {id(node): i for i, node in enumerate(nodes)}
+        self.function_names = {node.name for node in nodes}
+
+    def supports(self, interpreter):
+        """Check the functions left by earlier runs against what the program expects."""
+        for name, func in interpreter.functions.items():
+            if name in self.read_names:
+                return False
+            if name in self.function_names and id(func) not in self.index_of:
+                # Calls before the def would reach a function from another program
+                return False
+        return True
+
+    def run(self, interpreter):
+        """Run against an Interpreter's state and return a top-level return value."""
+        functions = interpreter.functions
+        namespace = dict(_HELPERS)
+        namespace['__builtins__'] = {}
+        exec(self.code, namespace)
+
+        for name, func in functions.items():
+            index = self.index_of.get(id(func))
+            if index is not None:
+                namespace['f_' + name] = namespace[f'_mp_def_{index}']
+        for name, value in interpreter.environment.items():
+            namespace['v_' + name] = value
+
+        nodes = self.nodes
+
+        def define(index):
+            node = nodes[index]
+            namespace['f_' + node.name] = namespace[f'_mp_def_{index}']
+            functions[node.name] = node
+
+        namespace['_mp_define'] = define
+        namespace['_mp_print'] = interpreter._print
+        try:
+            return namespace['_mp_main']()
+        except NameError as e:
+            raise _undefined_error(e) from None
+        finally:
+            env = interpreter.environment
+            for name, value in namespace.items():
+                if name.startswith('v_'):
+                    env[name[2:]] = value
+
+
+# Code objects keyed by a hash of the generated source
+_code_cache = {}
+_CODE_CACHE_SIZE = 64
+
+# Translated programs keyed by AST identity; None marks an unsupported program
+_program_cache = {}
+_PROGRAM_CACHE_SIZE = 32
+
+
+def _cache_put(cache, size, key, value):
+    if len(cache) >= size:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+def compile_source(source):
+    """Compile generated source, reusing the code object for identical source."""
+    key = hashlib.sha256(source.encode()).hexdigest()
+    code = _code_cache.get(key)
+    if code is None:
+        code = compile(source, '<mini-python>', 'exec')
+        _cache_put(_code_cache, _CODE_CACHE_SIZE, key, code)
+    return code
+
+
+def translate(ast):
+    """Return the Python source for a program, or raise Unsupported."""
+    return PythonEmitter(ast).emit_program(ast)
+
+
+def compile_program(ast):
+    """Compile a parsed program to a NativeProgram, or None if it is unsupported."""
+    entry = _program_cache.get(id(ast))
+    if entry is not None and entry[0] is ast:
+        return entry[1]
+    program = None
+    try:
+        emitter = PythonEmitter(ast)
+        source = emitter.emit_program(ast)
+        code = compile_source(source)
+    except (Unsupported, SyntaxError, RecursionError, MemoryError):
+        # e.g. break outside a loop or nesting deeper than CPython's parser allows
+        pass
+    else:
+        program = NativeProgram(source, code, emitter.nodes, emitter.read_names)
+    _cache_put(_program_cache, _PROGRAM_CACHE_SIZE, id(ast), (ast, program))
+    return program
+
+
+def run(ast, interpreter):
+    """Run a program natively, or with the closure engine when it is unsupported."""
+    program = compile_program(ast)
+    if program is None or not program.supports(interpreter):
+        return closure_compiler.compile_program(ast).run(interpreter)
+    return program.run(interpreter)
@@ -0,0 +1,215 @@
+"""Quickening of operator sites for the adaptive tree-walker.
+
+An Interpreter made with adaptive=True counts the runs of each BinaryOp,
+UnaryOp and IndexNode in the node's site slot. After WARMUP runs the
+site is rewritten in place: site becomes a handler picked for the
+operator and for the operand types of that run, along with the evaluate
+function of each operand node, and later runs call these directly
+instead of going through the generic dispatch and code.
+
+A handler made for particular types starts with a cheap guard and
+returns MISS when the operands are of other types; the site then runs
+the generic code. After MISS_LIMIT misses the site goes back to counting,
+to be specialized for the types it sees then, and after DEOPT_LIMIT such
+rounds it keeps the handler of its operator that takes any types.
+
+Python checks the operand types of its own operators, so for most of the
+language the fastest handler is the operator function itself, with no
+guard: it gives the result or the error of the generic code whatever the
+types, and a guard in Python code costs more than the if/elif chain it
+would save. benchmarks/bench_quicken.py times guarded handlers of ints
+against the operator functions, operator by operator, and the guard
+loses a few percent or ties on each. Guards pay off where the generic
+code makes checks of its own that the types settle, as when a list is
+indexed with an int. The hit rate is over the runs of guarded handlers
+alone, as a handler without a guard cannot miss.
+
+Parsed trees are shared between Interpreters, so what a site keeps does
+not depend on the Interpreter: evaluate functions are taken from its
+class and called with the Interpreter as their first argument.
+"""
+from collections import Counter
+
+from .ast_nodes import BinaryOp, IndexNode, UnaryOp
+from .runtime import binary_function, index_value, unary_function
+
+WARMUP = 8
+MISS_LIMIT = 16
+DEOPT_LIMIT = 4
+
+# Returned by a handler whose guard fails
+MISS = object()
+
+
+def index_list(seq, idx):
+    if type(seq) is list and type(idx) is int and 0 <= idx < len(seq):
+        return seq[idx]
+    return MISS
+
+
+def index_str(seq, idx):
+    if type(seq) is str and type(idx) is int and 0 <= idx < len(seq):
+        return seq[idx]
+    return MISS
+
+
+# Handlers for particular operand types, by (operator, *types); '[]'
+# stands for IndexNode
+SPECIALIZED = {
+    ('[]', list, int): index_list,
+    ('[]', str, int): index_str,
+}
+
+# How handlers are named in the report
+LABELS = {index_list: "list[int]", index_str: "str[int]", index_value: "[] any types"}
+
+
+def label(handler, op):
+    return LABELS.get(handler) or f"{op} any types"
+
+
+def evaluator(interpreter, node):
+    """The function that evaluates node, called as f(interpreter, node)."""
+    kind = type(node)
+    if kind in QUICKENED:
+        return QUICKENED[kind]
+    cls = type(interpreter)
+    return getattr(cls, f'evaluate_{kind.__name__}', cls.evaluate)
+
+
+def evaluate_BinaryOp(interpreter, node):
+    site = node.site
+    if site.__class__ is int:
+        left = interpreter.evaluate(node.left)
+        right = interpreter.evaluate(node.right)
+        return interpreter.quickener.warm(interpreter, node, node.op, binary_function(node.op),
+                                          (node.left, node.right), (left, right))
+    handler, guarded, left, right = site
+    left = left(interpreter, node.left)
+    right = right(interpreter, node.right)
+    quickener = interpreter.quickener
+    if guarded:
+        quickener.guarded_runs += 1
+        result = handler(left, right)
+        if result is MISS:
+            return quickener.miss(node, binary_function(node.op), left, right)
+        return result
+    quickener.generic_runs += 1
+    return handler(left, right)
+
+
+def evaluate_UnaryOp(interpreter, node):
+    site = node.site
+    if site.__class__ is int:
+        operand = interpreter.evaluate(node.expr)
+        return interpreter.quickener.warm(interpreter, node, node.op, unary_function(node.op),
+                                          (node.expr,), (operand,))
+    handler, guarded, operand = site
+    operand = operand(interpreter, node.expr)
+    quickener = interpreter.quickener
+    if guarded:
+        quickener.guarded_runs += 1
+        result = handler(operand)
+        if result is MISS:
+            return quickener.miss(node, unary_function(node.op), operand)
+        return result
+    quickener.generic_runs += 1
+    return handler(operand)
+
+
+def evaluate_IndexNode(interpreter, node):
+    site = node.site
+    if site.__class__ is int:
+        seq = interpreter.evaluate(node.expr)
+        idx = interpreter.evaluate(node.index)
+        return interpreter.quickener.warm(interpreter, node, '[]', index_value,
+                                          (node.expr, node.index), (seq, idx))
+    handler, guarded, seq, idx = site
+    seq = seq(interpreter, node.expr)
+    idx = idx(interpreter, node.index)
+    quickener = interpreter.quickener
+    if guarded:
+        quickener.guarded_runs += 1
+        result = handler(seq, idx)
+        if result is MISS:
+            return quickener.miss(node, index_value, seq, idx)
+        return result
+    quickener.generic_runs += 1
+    return handler(seq, idx)
+
+
+QUICKENED = {BinaryOp: evaluate_BinaryOp, UnaryOp: evaluate_UnaryOp, IndexNode: evaluate_IndexNode}
+
+
+class Quickener:
+    """What the adaptive tree-walker of one Interpreter did at its sites.
+
+    guarded_runs counts the runs of quickened sites whose handler has a
+    type guard, misses those the guard turned the operands down, and
+    generic_runs the runs of sites with a handler that takes any types;
+    specialized counts site rewrites by the label of the handler
+    installed.
+    """
+    def __init__(self):
+        self.guarded_runs = 0
+        self.generic_runs = 0
+        self.misses = 0
+        self.warmup_runs = 0
+        self.deoptimized = 0
+        self.specialized = Counter()
+        self._miss_counts = {}
+        self._deopt_counts = {}
+
+    def warm(self, interpreter, node, op, generic, children, operands):
+        """Run a site that is not quickened yet, counting the run."""
+        self.warmup_runs += 1
+        count = node.site
+        if count.__class__ is not int:
+            # A recursive call quickened the site while its operands ran
+            return generic(*operands)
+        if count + 1 < WARMUP:
+            node.site = count + 1
+        else:
+            handler = generic
+            if self._deopt_counts.get(id(node), 0) < DEOPT_LIMIT:
+                handler = SPECIALIZED.get((op, *map(type, operands)), generic)
+            node.site = (handler, handler is not generic,
+                         *(evaluator(interpreter, child) for child in children))
+            self.specialized[label(handler, op)] += 1
+        return generic(*operands)
+
+    def miss(self, node, generic, *operands):
+        """Run the generic code for operands a site's guard turned down."""
+        self.misses += 1
+        key = id(node)
+        misses = self._miss_counts.get(key, 0) + 1
+        if misses >= MISS_LIMIT:
+            # Back to counting, to specialize for the types seen now
+            node.site = 0
+            misses = 0
+            self.deoptimized += 1
+            self._deopt_counts[key] = self._deopt_counts.get(key, 0) + 1
+        self._miss_counts[key] = misses
+        return generic(*operands)
+
+    @property
+    def runs(self):
+        return self.guarded_runs + self.generic_runs
+
+    @property
+    def hits(self):
+        return self.guarded_runs - self.misses
+
+    @property
+    def hit_rate(self):
+        """The share of the runs of guarded handlers that passed the guard."""
+        return self.hits / self.guarded_runs if self.guarded_runs else 0.0
+
+    def report(self):
+        lines = [f"quickened runs: {self.runs}, guarded: {self.guarded_runs}, "
+                 f"hits: {self.hits} ({self.hit_rate:.1%}), misses: {self.misses}, "
+                 f"generic: {self.generic_runs}, warm-up runs: {self.warmup_runs}, "
+                 f"deoptimized: {self.deoptimized}"]
+        for name, count in self.specialized.most_common():
+            lines.append(f"  {name}: {count} site{'s' if count != 1 else ''}")
+        return "\n".join(lines)
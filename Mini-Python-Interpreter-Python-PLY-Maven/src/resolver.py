@@ -0,0 +1,60 @@
+from .ast_nodes import *
+
+
+def assigned_names(body):
+    """Names bound by a function body, excluding nested function bodies."""
+    names = []
+    stack = [body]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, Assign):
+            names.append(node.name.name)
+        elif isinstance(node, ForLoop):
+            names.append(node.var.name)
+            stack.append(node.body)
+        elif isinstance(node, WhileLoop):
+            stack.append(node.body)
+        elif isinstance(node, IfElse):
+            stack.append(node.else_body or [])
+            stack.append(node.if_body)
+        elif isinstance(node, TryExcept):
+            stack.append(node.except_body)
+            stack.append(node.try_body)
+    return names
+
+
+def resolve_function(node):
+    """Give every parameter and local of a FunctionDef a frame slot.
+
+    Sets node.varnames to the slot layout (parameters first) and the slot
+    attribute of each Identifier in the body that refers to a local.
+    Identifiers left with slot None are read from the global table.
+    Resolution happens once per FunctionDef; the layout is returned.
+    """
+    if node.varnames is not None:
+        return node.varnames
+    varnames = [param.name if hasattr(param, 'name') else param for param in node.params]
+    for name in assigned_names(node.body):
+        if name not in varnames:
+            varnames.append(name)
+    slots = {name: i for i, name in enumerate(varnames)}
+
+    for param in node.params:
+        if isinstance(param, Identifier):
+            param.slot = slots[param.name]
+    stack = [node.body]
+    while stack:
+        child = stack.pop()
+        if isinstance(child, list):
+            stack.extend(child)
+        elif isinstance(child, Identifier):
+            child.slot = slots.get(child.name)
+        elif isinstance(child, FunctionDef):
+            # Nested functions get their own frames when they are defined
+            continue
+        elif isinstance(child, Node):
+            stack.extend(iter_child_nodes(child))
+    node.varnames = varnames
+    return varnames
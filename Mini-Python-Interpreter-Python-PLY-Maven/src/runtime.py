@@ -0,0 +1,158 @@
+"""Runtime helpers shared by the alternative execution engines.
+
+Each helper mirrors the checks and error messages of the corresponding
+``Interpreter.evaluate_*`` method so every engine fails the same way.
+"""
+import itertools
+import operator
+
+
+def divide(left, right):
+    if right == 0:
+        raise Exception("Division by zero")
+    return left / right
+
+def modulo(left, right):
+    if right == 0:
+        raise Exception("Modulo by zero")
+    return left % right
+
+def logical_and(left, right):
+    return left and right
+
+def logical_or(left, right):
+    return left or right
+
+# Binary operators in the order used by the bytecode's BINARY_OP argument
+BINARY_OPERATORS = (
+    ('+', operator.add),
+    ('-', operator.sub),
+    ('*', operator.mul),
+    ('/', divide),
+    ('%', modulo),
+    ('==', operator.eq),
+    ('!=', operator.ne),
+    ('<', operator.lt),
+    ('>', operator.gt),
+    ('<=', operator.le),
+    ('>=', operator.ge),
+    ('and', logical_and),
+    ('or', logical_or),
+)
+
+BINARY_OP_INDEX = {op: i for i, (op, _) in enumerate(BINARY_OPERATORS)}
+BINARY_FUNCTIONS = tuple(func for _, func in BINARY_OPERATORS)
+BINARY_OP_FUNCS = dict(BINARY_OPERATORS)
+
+UNARY_OP_FUNCS = {
+    '-': operator.neg,
+    'not': operator.not_,
+}
+
+def binary_function(op):
+    func = BINARY_OP_FUNCS.get(op)
+    if func is None:
+        raise Exception(f"Unknown operator: {op}")
+    return func
+
+def unary_function(op):
+    func = UNARY_OP_FUNCS.get(op)
+    if func is None:
+        raise Exception(f"Unknown unary operator: {op}")
+    return func
+
+def index_value(lst, idx):
+    if not isinstance(lst, (list, tuple, str)):
+        raise Exception(f"Cannot index {type(lst)}")
+    if not isinstance(idx, int):
+        raise Exception("Index must be an integer")
+    if idx < 0 or idx >= len(lst):
+        raise Exception("Index out of range")
+    return lst[idx]
+
+def length_of(expr):
+    if not isinstance(expr, (list, tuple, str)):
+        raise Exception(f"Cannot get length of {type(expr)}")
+    return len(expr)
+
+def string_method(string_obj, method, args):
+    if not isinstance(string_obj, str):
+        raise Exception(f"Cannot call string method on {type(string_obj)}")
+    if method == 'upper':
+        return string_obj.upper()
+    elif method == 'lower':
+        return string_obj.lower()
+    elif method == 'strip':
+        return string_obj.strip()
+    elif method == 'replace' and len(args) == 2:
+        return string_obj.replace(args[0], args[1])
+    else:
+        raise Exception(f"Unknown string method: {method}")
+
+def make_range(start, stop, step):
+    return range(start, stop, step)
+
+def check_iterable(iterable):
+    if isinstance(iterable, (range, list, tuple)):
+        return iterable
+    raise Exception(f"Cannot iterate over {type(iterable)}")
+
+def format_print(values):
+    return " ".join(map(str, values))
+
+
+# Versions are drawn from one counter, so no two tables ever share one
+_versions = itertools.count()
+
+class FunctionTable(dict):
+    """The functions of a program by name, with a version for inline caches.
+
+    version changes whenever a function is defined, redefined or removed,
+    and is never the version of another table, so a cache that recorded
+    the version along with what a lookup found is still valid while the
+    two are equal. Reads are those of a plain dict.
+    """
+    __slots__ = ('version',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    def _changed(self):
+        self.version = next(_versions)
+
+    def __setitem__(self, name, func):
+        super().__setitem__(name, func)
+        self._changed()
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._changed()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, name, default=None):
+        result = super().setdefault(name, default)
+        self._changed()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def clear(self):
+        super().clear()
+        self._changed()
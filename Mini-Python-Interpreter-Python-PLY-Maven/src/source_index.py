@@ -0,0 +1,49 @@
+"""Mapping between source offsets and line/column positions.
+
+A SourceIndex holds the offset at which each line starts, so a lookup is
+a bisect instead of a scan of the source. index_for(source) keeps the
+indexes of the last few sources, so the lexers, parser errors and other
+diagnostics of one source all share a single index.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+
+class SourceIndex:
+    """Line-start offsets of a source. Lines and columns count from 1."""
+    __slots__ = ('source', 'line_starts')
+
+    def __init__(self, source):
+        self.source = source
+        self.line_starts = array('i', [0])
+        self.line_starts.extend(m.end() for m in re.finditer('\n', source))
+
+    def __len__(self):
+        """Number of lines."""
+        return len(self.line_starts)
+
+    def line_of(self, offset):
+        return bisect_right(self.line_starts, offset)
+
+    def position(self, offset):
+        """(line, column) of an offset."""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def offset(self, line, column=1):
+        """Offset of a line and column, the inverse of position."""
+        return self.line_starts[line - 1] + column - 1
+
+    def line_text(self, line):
+        """Text of a line, without its newline."""
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.source)
+        return self.source[start:end]
+
+
+@lru_cache(maxsize=8)
+def index_for(source):
+    """The shared SourceIndex of a source."""
+    return SourceIndex(source)
@@ -0,0 +1,82 @@
+"""Build the PLY lexer and parser from the shipped lextab/parsetab modules.
+
+Both table modules end with a _grammar_version stamp: a hash of the rules
+that generated them. When the stamp matches the calling module's rules the
+tables are loaded in optimize mode, skipping PLY's reflection checks.
+Otherwise the rules are validated, the tables regenerated and stamped once.
+No parser.out debug file is ever written.
+"""
+import hashlib
+import importlib
+import os
+import sys
+
+import ply
+from ply import lex, yacc
+
+
+def grammar_version(module, prefix):
+    """Hash of the rules (names starting with prefix) and settings of a module."""
+    namespace = vars(module)
+    rules = [value for name, value in namespace.items()
+             if name.startswith(prefix) and callable(value)]
+    rules.sort(key=lambda func: func.__code__.co_firstlineno)
+    parts = [ply.__version__]
+    parts += [f"{func.__name__}:{getattr(func, 'regex', func.__doc__)}" for func in rules]
+    parts += [f"{name}:{value!r}" for name, value in sorted(namespace.items())
+              if name.startswith(prefix) and not callable(value)]
+    for name in ('tokens', 'literals', 'states', 'precedence', 'start'):
+        parts.append(f"{name}:{namespace.get(name)!r}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _table_module(module, tabname):
+    return f"{module.__package__}.{tabname}" if module.__package__ else tabname
+
+
+def table_version(module, tabname):
+    """The stamp of a table module next to module, or None if missing or unstamped."""
+    try:
+        table = importlib.import_module(_table_module(module, tabname))
+    except ImportError:
+        return None
+    return getattr(table, '_grammar_version', None)
+
+
+def _stamp(module, tabname, version):
+    path = os.path.join(os.path.dirname(module.__file__), tabname + '.py')
+    try:
+        with open(path, 'a') as f:
+            f.write(f"_grammar_version = {version!r}\n")
+    except OSError:
+        # Read-only install: the tables are rebuilt in memory on each start
+        pass
+
+
+def build_lexer(module, lextab='lextab'):
+    version = grammar_version(module, 't_')
+    if table_version(module, lextab) == version:
+        return lex.lex(module=module, optimize=True, lextab=lextab)
+    lexer = lex.lex(module=module)
+    try:
+        lexer.writetab(lextab, os.path.dirname(module.__file__))
+    except OSError:
+        return lexer
+    _stamp(module, lextab, version)
+    return lexer
+
+
+def build_parser(module, tabmodule='parsetab'):
+    version = grammar_version(module, 'p_')
+    if table_version(module, tabmodule) == version:
+        return yacc.yacc(module=module, optimize=True, debug=False,
+                         write_tables=False, tabmodule=tabmodule)
+    table = os.path.join(os.path.dirname(module.__file__), tabmodule + '.py')
+    # PLY would reuse a table whose signature still matches; force a rewrite
+    sys.modules.pop(_table_module(module, tabmodule), None)
+    if os.path.exists(table):
+        os.remove(table)
+    parser = yacc.yacc(module=module, debug=False, tabmodule=tabmodule)
+    if os.path.exists(table):
+        _stamp(module, tabmodule, version)
+    return parser
@@ -0,0 +1,110 @@
+"""Turn an AST back into Mini-Python source.
+
+Binary operations are always parenthesized: the grammar gives every
+operator the same precedence, so the parentheses are what keeps the
+tree's grouping when the output is parsed again.
+"""
+from .ast_nodes import *
+from .visitor import NodeVisitor
+
+INDENT = "    "
+
+
+class Unparser(NodeVisitor):
+    def generic_visit(self, node):
+        return ""
+
+    def visit_list(self, node):
+        return "\n".join(self.visit(stmt) for stmt in node)
+
+    def block(self, header, body):
+        lines = [header]
+        for stmt in body:
+            lines += [INDENT + line if line else line for line in self.visit(stmt).split("\n")]
+        if not body:
+            # The grammar takes an indented blank line for an empty block
+            lines.append(INDENT)
+        return "\n".join(lines)
+
+    def visit_Assign(self, node):
+        return f"{self.visit(node.name)} = {self.visit(node.expr)}"
+
+    def visit_ListAssign(self, node):
+        return f"{self.visit(node.name)}[{self.visit(node.index)}] = {self.visit(node.value)}"
+
+    def visit_BinaryOp(self, node):
+        return f"({self.visit(node.left)} {node.op} {self.visit(node.right)})"
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.expr)
+        return f"not {operand}" if node.op == 'not' else f"{node.op}{operand}"
+
+    def visit_Number(self, node):
+        return str(node.value)
+
+    visit_Boolean = visit_Number
+
+    def visit_String(self, node):
+        return repr(node.value)
+
+    def visit_Identifier(self, node):
+        return node.name
+
+    def visit_Print(self, node):
+        if isinstance(node.expr, ListNode):
+            # The arguments of print(a, b)
+            return f"print({', '.join(self.visit(elem) for elem in node.expr.elements)})"
+        return f"print({self.visit(node.expr)})"
+
+    def visit_IfElse(self, node):
+        code = self.block(f"if {self.visit(node.condition)}:", node.if_body)
+        if node.else_body:
+            code += "\n" + self.block("else:", node.else_body)
+        return code
+
+    def visit_WhileLoop(self, node):
+        return self.block(f"while {self.visit(node.condition)}:", node.body)
+
+    def visit_ForLoop(self, node):
+        return self.block(f"for {self.visit(node.var)} in {self.visit(node.iterable)}:", node.body)
+
+    def visit_FunctionDef(self, node):
+        # Parameters might be Identifier objects or strings
+        params = [param.name if isinstance(param, Identifier) else str(param) for param in node.params]
+        return self.block(f"def {node.name}({', '.join(params)}):", node.body)
+
+    def visit_FunctionCall(self, node):
+        return f"{self.visit(node.name)}({', '.join(self.visit(arg) for arg in node.args)})"
+
+    def visit_ListNode(self, node):
+        return f"[{', '.join(self.visit(elem) for elem in node.elements)}]"
+
+    def visit_IndexNode(self, node):
+        return f"{self.visit(node.expr)}[{self.visit(node.index)}]"
+
+    def visit_StringMethod(self, node):
+        return f"{self.visit(node.expr)}.{node.method}({', '.join(self.visit(arg) for arg in node.args)})"
+
+    def visit_LenFunction(self, node):
+        return f"len({self.visit(node.expr)})"
+
+    def visit_RangeCall(self, node):
+        args = [self.visit(arg) for arg in (node.start, node.stop, node.step) if arg is not None]
+        return f"range({', '.join(args)})"
+
+    def visit_Return(self, node):
+        return "return" if node.expr is None else f"return {self.visit(node.expr)}"
+
+    def visit_Break(self, node):
+        return "break"
+
+    def visit_Continue(self, node):
+        return "continue"
+
+    def visit_TryExcept(self, node):
+        return self.block("try:", node.try_body) + "\n" + self.block("except:", node.except_body)
+
+
+def unparse(node):
+    """Source for a node or a list of statements."""
+    return Unparser().visit(node)
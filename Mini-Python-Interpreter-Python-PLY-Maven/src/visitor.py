@@ -0,0 +1,132 @@
+"""Visitor and transformer base classes for the AST.
+
+A NodeVisitor subclass defines visit_<Class> methods. Which method
+handles which class is worked out once per visitor class and kept in
+its dispatch table, so visit() is a dict lookup and a call: no chain of
+class-name tests, and no getattr of a formatted method name per node as
+ast.NodeVisitor does. The lookup follows the MRO, so visit_Expression
+handles every expression without a method of its own. Lists and None go
+through the same table, as visit_list and visit_NoneType.
+
+The child fields of each node class, those that hold nodes or lists of
+them rather than the plain values named by _values, are computed once
+too, in CHILD_FIELDS.
+
+visit and generic_visit recurse, like the passes they serve. walk and
+walk_postorder iterate with an explicit stack instead, for trees deeper
+than Python's recursion limit.
+"""
+from .ast_nodes import Node
+
+
+class _ChildFields(dict):
+    def __missing__(self, cls):
+        fields = self[cls] = tuple(name for name in getattr(cls, '_fields', ())
+                                   if name not in cls._values)
+        return fields
+
+
+# Node class -> names of its fields that hold child nodes
+CHILD_FIELDS = _ChildFields()
+
+
+def walk(node):
+    """Yield every node of a tree, or of a list of them, in preorder."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, Node):
+            yield node
+            stack.extend(reversed([getattr(node, name) for name in CHILD_FIELDS[type(node)]]))
+
+
+def walk_postorder(node):
+    """Yield every node of a tree, or of a list of them, children first."""
+    stack = [(node, False)]
+    while stack:
+        node, ready = stack.pop()
+        if ready:
+            yield node
+        elif isinstance(node, list):
+            stack.extend((item, False) for item in reversed(node))
+        elif isinstance(node, Node):
+            stack.append((node, True))
+            stack.extend((getattr(node, name), False) for name in reversed(CHILD_FIELDS[type(node)]))
+
+
+class _Dispatch(dict):
+    """Type -> visit function of one visitor class, filled in on first use."""
+    def __init__(self, visitor):
+        super().__init__()
+        self.visitor = visitor
+
+    def __missing__(self, cls):
+        for base in cls.__mro__:
+            method = getattr(self.visitor, f"visit_{base.__name__}", None)
+            if method is not None:
+                break
+        else:
+            method = self.visitor.generic_visit
+        self[cls] = method
+        return method
+
+
+class NodeVisitor:
+    """Base class of passes over a tree.
+
+    visit(node) calls the visit_<Class> method for the node's class, or
+    generic_visit, which visits the children, and returns its result.
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _Dispatch(cls)
+
+    def visit(self, node):
+        return self._dispatch[type(node)](self, node)
+
+    def generic_visit(self, node):
+        if isinstance(node, list):
+            for item in node:
+                self.visit(item)
+        elif isinstance(node, Node):
+            for name in CHILD_FIELDS[type(node)]:
+                value = getattr(node, name)
+                if isinstance(value, (Node, list)):
+                    self.visit(value)
+        return None
+
+
+NodeVisitor._dispatch = _Dispatch(NodeVisitor)
+
+
+class NodeTransformer(NodeVisitor):
+    """A NodeVisitor that replaces each node with what its visit returns.
+
+    Returning the node keeps it and None removes it; inside a list, a list
+    result is spliced in its place. As with ast.NodeTransformer the tree is
+    changed in place, so transform a copy of a tree that is shared, such
+    as one from the parser's cache.
+    """
+    def generic_visit(self, node):
+        if isinstance(node, list):
+            node[:] = self._visit_list(node)
+        elif isinstance(node, Node):
+            for name in CHILD_FIELDS[type(node)]:
+                value = getattr(node, name)
+                if isinstance(value, list):
+                    value[:] = self._visit_list(value)
+                elif isinstance(value, Node):
+                    setattr(node, name, self.visit(value))
+        return node
+
+    def _visit_list(self, items):
+        result = []
+        for item in items:
+            item = self.visit(item)
+            if isinstance(item, list):
+                result.extend(item)
+            elif item is not None:
+                result.append(item)
+        return result
@@ -0,0 +1,225 @@
+from .ast_nodes import FunctionDef
+from .compiler import *
+from .runtime import (BINARY_FUNCTIONS, index_value, length_of, string_method,
+                      check_iterable)
+
+# Marks a local slot that has not been assigned yet
+_UNBOUND = object()
+
+# Estimated size of a frame: the Frame object, its stack and block lists
+# and the slot list header, plus one pointer per local slot
+FRAME_OVERHEAD = 256
+SLOT_SIZE = 8
+
+DEFAULT_STACK_BUDGET = 64 * 1024 * 1024
+
+
+class Frame:
+    """Activation record of one CodeObject on the VM's own call stack."""
+    __slots__ = ('code', 'fast', 'stack', 'blocks', 'pc', 'size')
+
+    def __init__(self, code, fast):
+        self.code = code
+        self.fast = fast
+        self.stack = []
+        self.blocks = []
+        self.pc = 0
+        self.size = FRAME_OVERHEAD + SLOT_SIZE * code.nlocals
+
+    def registers(self):
+        """Everything the dispatch loop caches in locals while this frame runs."""
+        code = self.code
+        stack = self.stack
+        return (code, code.code, code.consts, code.names, self.fast,
+                stack, stack.append, stack.pop, self.blocks, self.pc)
+
+
+class VirtualMachine:
+    """Stack machine that runs the CodeObjects produced by compiler.py.
+
+    Mini-Python calls push Frames onto the VM's own call stack instead of
+    recursing in Python, so recursion depth is bounded by stack_budget
+    (an estimate in bytes of the memory held by live frames) rather than
+    by the host recursion limit. Calls in tail position reuse the frame.
+
+    Globals, functions and output are shared with the owning Interpreter,
+    so both engines observe the same program state.
+    """
+    def __init__(self, interpreter, stack_budget=DEFAULT_STACK_BUDGET):
+        self.interpreter = interpreter
+        self.globals = interpreter.environment
+        self.functions = interpreter.functions
+        self.code_objects = {}
+        self.stack_budget = stack_budget
+        self.max_depth = 0
+
+    def run(self, code):
+        """Run a module CodeObject and return the value of a top-level return."""
+        return self.execute(code, None)
+
+    def function_code(self, name):
+        if name not in self.functions:
+            raise Exception(f"Undefined function: {name}")
+        func = self.functions[name]
+        if not isinstance(func, FunctionDef):
+            raise Exception(f"{name} is not a function")
+        code = self.code_objects.get(name)
+        if code is None or code.node is not func:
+            # Defined by another engine run; compile it on first use
+            code = self.code_objects[name] = Compiler().compile_function(func)
+        return code
+
+    def load_function(self, name):
+        if name in self.functions:
+            return self.functions[name]
+        raise Exception(f"Undefined variable or function: {name}")
+
+    def budget_exceeded(self, depth):
+        return Exception(f"Maximum recursion depth exceeded at depth {depth} "
+                         f"(stack budget of {self.stack_budget} bytes)")
+
+    def execute(self, code, fast):
+        """Execute a CodeObject with the given local slots until it returns."""
+        env = self.globals
+        functions = self.functions
+        binary = BINARY_FUNCTIONS
+        budget = self.stack_budget
+        callers = []
+        frame = Frame(code, fast)
+        used = frame.size
+        (code, instructions, consts, names, fast,
+         stack, push, pop, blocks, pc) = frame.registers()
+
+        while True:
+            try:
+                while True:
+                    op = instructions[pc]
+                    arg = instructions[pc + 1]
+                    pc += 2
+                    if op == LOAD_FAST:
+                        value = fast[arg]
+                        if value is _UNBOUND:
+                            value = self.load_function(code.varnames[arg])
+                        push(value)
+                    elif op == LOAD_GLOBAL:
+                        value = env.get(names[arg], _UNBOUND)
+                        if value is _UNBOUND:
+                            value = self.load_function(names[arg])
+                        push(value)
+                    elif op == LOAD_CONST:
+                        push(consts[arg])
+                    elif op == BINARY_OP:
+                        right = pop()
+                        stack[-1] = binary[arg](stack[-1], right)
+                    elif op == STORE_FAST:
+                        fast[arg] = pop()
+                    elif op == STORE_GLOBAL:
+                        env[names[arg]] = pop()
+                    elif op == POP_JUMP_IF_FALSE:
+                        if not pop():
+                            pc = arg
+                    elif op == JUMP:
+                        pc = arg
+                    elif op == FOR_ITER:
+                        value = next(stack[-1], _UNBOUND)
+                        if value is _UNBOUND:
+                            pop()
+                            pc = arg
+                        else:
+                            push(value)
+                    elif op == CALL or op == TAIL_CALL:
+                        name, nargs = consts[arg]
+                        callee = self.function_code(name)
+                        if nargs:
+                            args = stack[-nargs:]
+                            del stack[-nargs:]
+                        else:
+                            args = []
+                        # Extra arguments are dropped and missing ones left unbound, like zip()
+                        del args[callee.nparams:]
+                        if callee.nlocals > len(args):
+                            args.extend([_UNBOUND] * (callee.nlocals - len(args)))
+                        if op == CALL:
+                            frame.pc = pc
+                            callers.append(frame)
+                        else:
+                            used -= frame.size
+                        frame = Frame(callee, args)
+                        used += frame.size
+                        if used > budget:
+                            raise self.budget_exceeded(len(callers) + 1)
+                        if len(callers) > self.max_depth:
+                            self.max_depth = len(callers)
+                        (code, instructions, consts, names, fast,
+                         stack, push, pop, blocks, pc) = frame.registers()
+                    elif op == RETURN_VALUE:
+                        value = pop()
+                        if not callers:
+                            return value
+                        used -= frame.size
+                        frame = callers.pop()
+                        (code, instructions, consts, names, fast,
+                         stack, push, pop, blocks, pc) = frame.registers()
+                        push(value)
+                    elif op == POP_TOP:
+                        pop()
+                    elif op == PRINT:
+                        if arg:
+                            values = stack[-arg:]
+                            del stack[-arg:]
+                        else:
+                            values = []
+                        self.interpreter._print(*values)
+                    elif op == INDEX:
+                        idx = pop()
+                        stack[-1] = index_value(stack[-1], idx)
+                    elif op == UNARY_NEG:
+                        stack[-1] = -stack[-1]
+                    elif op == UNARY_NOT:
+                        stack[-1] = not stack[-1]
+                    elif op == GET_ITER:
+                        stack[-1] = iter(check_iterable(stack[-1]))
+                    elif op == BUILD_LIST:
+                        if arg:
+                            values = stack[-arg:]
+                            del stack[-arg:]
+                        else:
+                            values = []
+                        push(values)
+                    elif op == LEN:
+                        stack[-1] = length_of(stack[-1])
+                    elif op == STRING_METHOD:
+                        method, nargs = consts[arg]
+                        if nargs:
+                            args = stack[-nargs:]
+                            del stack[-nargs:]
+                        else:
+                            args = []
+                        stack[-1] = string_method(stack[-1], method, args)
+                    elif op == MAKE_RANGE:
+                        step = pop()
+                        stop = pop()
+                        stack[-1] = range(stack[-1], stop, step)
+                    elif op == MAKE_FUNCTION:
+                        func_code = consts[arg]
+                        functions[func_code.name] = func_code.node
+                        self.code_objects[func_code.name] = func_code
+                    elif op == SETUP_EXCEPT:
+                        blocks.append((arg, len(stack)))
+                    elif op == POP_BLOCK:
+                        blocks.pop()
+                    elif op == RAISE:
+                        raise Exception(consts[arg])
+                    else:
+                        raise Exception(f"Unknown opcode: {op}")
+            except Exception:
+                # Unwind frames until one has an active try block
+                while not blocks:
+                    if not callers:
+                        raise
+                    used -= frame.size
+                    frame = callers.pop()
+                    (code, instructions, consts, names, fast,
+                     stack, push, pop, blocks, pc) = frame.registers()
+                pc, depth = blocks.pop()
+                del stack[depth:]
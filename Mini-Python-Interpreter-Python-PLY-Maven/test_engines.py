@@ -0,0 +1,211 @@
+import glob
+import io
+import os
+
+import pytest
+
+from src.interpreter import Interpreter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ENGINES = ["vm", "closure", "native"]
+
+SAMPLES = sorted(glob.glob(os.path.join(ROOT, "samples", "*.py"))) + [
+    os.path.join(ROOT, name)
+    for name in ("example.py", "simple_example.py", "hello.py", "input.py")
+]
+
+PROGRAMS = {
+    "recursion": """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+print(fib(12))
+""",
+    "lists and strings": """
+x = [1, 2, 3]
+print(x, len(x), x[2])
+s = "  Hi There "
+print(s.strip(), s.upper(), s.lower(), s.replace("Hi", "Yo"))
+print([])
+print(1, [2, 3])
+""",
+    "operators": """
+print(not True, -5, 7 % 3, 7 / 2, 3 == 3, 1 != 2, 2 <= 3, 4 >= 5, "a" + "b")
+print(True and False, True or False, 1 + 2 * 3)
+""",
+    "loops": """
+i = 0
+while i < 10:
+    i = i + 1
+    if i == 5:
+        break
+print(i)
+total = 0
+for k in range(1, 10, 2):
+    total = total + k
+for k in range(3):
+    total = total + k
+print(total)
+""",
+    "try except": """
+x = [1]
+try:
+    print(x[5])
+except:
+    print("caught index")
+try:
+    y = 10 / 0
+except:
+    print("caught division")
+""",
+    "nested functions": """
+def outer(a):
+    def inner(b):
+        return b * 2
+    return inner(a) + 1
+print(outer(4))
+print(inner(10))
+""",
+    "global reads": """
+scale = 3
+def f(x):
+    y = x * scale
+    return y
+print(f(2))
+def h():
+    print(unset)
+    unset = 1
+try:
+    h()
+except:
+    print("unbound local")
+""",
+    "undefined name": """
+def f(a):
+    return q
+print(f(1))
+""",
+    "bad index": "x = 5\nprint(x[0])\n",
+    "bad iterable": "for c in \"abc\":\n    print(c)\n",
+    "undefined function": "print(nofunc(3))\n",
+    "top level return": "x = 3\nreturn x\nprint(\"unreachable\")\n",
+}
+
+
+def run(code, engine):
+    buf = io.StringIO()
+    try:
+        Interpreter(output_buffer=buf).execute(code, engine=engine)
+    except Exception as e:
+        return buf.getvalue(), f"Error: {e}"
+    return buf.getvalue(), None
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_samples_match_tree_walker(path, engine):
+    with open(path) as f:
+        code = f.read()
+    assert run(code, engine) == run(code, "tree")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_programs_match_tree_walker(name, engine):
+    code = PROGRAMS[name]
+    assert run(code, engine) == run(code, "tree")
+
+
+def test_closure_program_is_reused_for_the_same_ast():
+    from src import closure_compiler
+    from src.myparser import parser
+    ast = parser.parse(PROGRAMS["recursion"])
+    assert closure_compiler.compile_program(ast) is closure_compiler.compile_program(ast)
+    buf = io.StringIO()
+    interp = Interpreter(output_buffer=buf, engine="closure")
+    interp.run(ast)
+    interp.run(ast)
+    assert buf.getvalue() == "144\n144\n"
+
+
+def test_functions_read_globals_and_keep_locals_private():
+    buf = io.StringIO()
+    interp = Interpreter(output_buffer=buf)
+    interp.execute("limit = 2\ndef f(n):\n    limit = n + limit\n    return limit\n")
+    with pytest.raises(Exception, match="Undefined variable or function: limit"):
+        interp.execute("print(f(1))")
+    interp.execute("def g(n):\n    return n + limit\nprint(g(1))\nprint(limit)")
+    assert buf.getvalue() == "3\n2\n"
+
+
+DEEP_RECURSION = """
+def depth(n):
+    if n == 0:
+        return 0
+    return 1 + depth(n - 1)
+def count(n, acc):
+    if n == 0:
+        return acc
+    return count(n - 1, acc + n)
+print(depth(20000))
+print(count(50000, 0))
+"""
+
+
+def test_vm_recursion_is_not_bounded_by_python_stack():
+    buf = io.StringIO()
+    Interpreter(output_buffer=buf, engine="vm").execute(DEEP_RECURSION)
+    assert buf.getvalue() == "20000\n1250025000\n"
+
+
+def test_vm_tail_calls_reuse_the_frame():
+    from src.compiler import compile_program
+    from src.myparser import parser
+    from src.vm import VirtualMachine
+    vm = VirtualMachine(Interpreter(output_buffer=io.StringIO()), stack_budget=4096)
+    vm.run(compile_program(parser.parse(DEEP_RECURSION.replace("print(depth(20000))", ""))))
+    assert vm.max_depth == 1
+
+
+def test_vm_stack_budget_is_catchable():
+    buf = io.StringIO()
+    interp = Interpreter(output_buffer=buf, engine="vm", stack_budget=100000)
+    interp.execute(DEEP_RECURSION.replace("print(depth(20000))", "try:\n    print(depth(20000))\nexcept:\n    print(\"too deep\")"))
+    assert buf.getvalue() == "too deep\n1250025000\n"
+    with pytest.raises(Exception, match="Maximum recursion depth exceeded"):
+        interp.execute(DEEP_RECURSION)
+
+
+def test_vm_constants_equal_in_python_stay_apart():
+    # Folding makes float constants, and 0.0 == -0.0
+    code = "def g(c):\n    if c:\n        return 0 / 5\n    return -(0 / 5)\nprint(g(True))\nprint(g(False))\n"
+    for engine in ["tree"] + ENGINES:
+        buf = io.StringIO()
+        Interpreter(output_buffer=buf).execute(code, engine=engine, optimize=True)
+        assert buf.getvalue() == "0.0\n-0.0\n", engine
+
+
+def test_unknown_engine():
+    with pytest.raises(Exception, match="Unknown engine"):
+        Interpreter().execute("x = 1", engine="nope")
+
+
+def test_native_code_is_cached_by_source_hash():
+    from src import pyemit
+    from src.myparser import CustomParser
+    parser = CustomParser(cache_size=0)
+    first = pyemit.compile_program(parser.parse(PROGRAMS["recursion"]))
+    second = pyemit.compile_program(parser.parse(PROGRAMS["recursion"]))
+    assert first is not second and first.code is second.code
+    assert pyemit.compile_program(parser.parse(PROGRAMS["undefined function"])) is None
+
+
+def test_native_shares_state_with_the_interpreter():
+    buf = io.StringIO()
+    interp = Interpreter(output_buffer=buf, engine="native")
+    interp.execute("x = 5\ndef double(n):\n    return n * 2\n")
+    interp.execute("print(double(x))", engine="tree")
+    interp.execute("y = x + 1\nprint(y)")
+    assert interp.environment == {"x": 5, "y": 6}
+    assert buf.getvalue() == "10\n6\n"
@@ -0,0 +1,66 @@
+import glob
+import os
+
+import pytest
+
+from src.fastlexer import FastLexer
+from src.lexer import IndentLexer, outer_lexer
+from src.myparser import CustomParser
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = sorted(glob.glob(os.path.join(ROOT, "samples", "*.py"))) + [
+    os.path.join(ROOT, name)
+    for name in ("example.py", "simple_example.py", "hello.py", "input.py")
+]
+
+CASES = {
+    "nested blocks": "def f(x):\n    if x:\n        return 1\n    else:\n\treturn 2\nprint(f(0))\n",
+    "blank and comment lines": "x = 1\n\n  \n# note\nwhile x < 3:   # loop\n\n    x = x + 1\n",
+    "unclosed blocks at eof": "for i in range(3):\n    if i:\n        print(i)",
+    "bad dedent": "if x:\n        a = 1\n    b = 2\n",
+    "strings": "s = 'it\\'s' + \"a\\tb\" + \"open\nprint(s)\n",
+    "operators": "a = b >= 1 != 2 <= 3 == 4 > 5 < 6 ! 7 % 8 / 9\n",
+    "stray characters": "x = 1 $ 2 \r\n  y = x @ 3\n",
+    "leading indentation": "   x = 1\n   y = 2\n",
+    "non-ascii digits": "x = \u0663\u0664 + 1\n",
+    "empty": "",
+}
+
+
+def token_stream(lexer, code, capsys):
+    lexer.input(code)
+    stream = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        stream.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return stream, capsys.readouterr().out
+
+
+@pytest.mark.parametrize("code", list(CASES.values()) + [open(path).read() for path in SAMPLES],
+                         ids=list(CASES) + [os.path.basename(path) for path in SAMPLES])
+def test_fastlexer_matches_ply_lexer(code, capsys):
+    expected = token_stream(IndentLexer(outer_lexer.clone()), code, capsys)
+    assert token_stream(FastLexer(), code, capsys) == expected
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_parser_accepts_fastlexer(path):
+    code = open(path).read()
+    fast = CustomParser(cache_size=0, lexer_factory=FastLexer).parse(code)
+    ply = CustomParser(cache_size=0).parse(code)
+    assert repr_tree(fast) == repr_tree(ply)
+
+
+def test_fastlexer_syntax_errors_report_the_line():
+    with pytest.raises(SyntaxError, match="line 2, column 9"):
+        CustomParser(cache_size=0, lexer_factory=FastLexer).parse("x = 1\nprint(1 2)\n")
+
+
+def repr_tree(node):
+    if isinstance(node, list):
+        return [repr_tree(item) for item in node]
+    if hasattr(node, "_fields"):
+        return (type(node).__name__,) + tuple(repr_tree(getattr(node, name)) for name in node._fields)
+    return node
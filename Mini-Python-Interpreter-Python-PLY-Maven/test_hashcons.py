@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from src import mpyc
+from src.ast_nodes import (BinaryOp, Boolean, Identifier, Number, String, iter_child_nodes,
+                           structural_hash)
+from src.interpreter import Interpreter
+from src.myparser import CustomParser, estimate_size
+from test_engines import ENGINES, PROGRAMS, SAMPLES
+
+
+def nodes(ast):
+    """The distinct nodes of a tree."""
+    found = {}
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if id(node) not in found:
+            found[id(node)] = node
+            stack.extend(iter_child_nodes(node))
+    return found
+
+
+def test_structural_hash_depends_on_structure_only():
+    parser = CustomParser()
+    first, second = parser.parse("x = a * (1 + 2)\ny =   a * (1 + 2)\n")
+    assert first.expr.lineno != second.expr.lineno
+    assert structural_hash(first.expr) == structural_hash(second.expr)
+    assert structural_hash(first) != structural_hash(second)
+    distinct = [Number(1), Number(1.0), Boolean(True), String("1"), Identifier("1"),
+                BinaryOp(Number(1), "+", Number(2)), BinaryOp(Number(1), "-", Number(2)),
+                BinaryOp(Number(2), "+", Number(1))]
+    assert len({structural_hash(node) for node in distinct}) == len(distinct)
+
+
+def test_structural_hash_of_deep_trees():
+    ast = CustomParser().parse("x = " + " + ".join(["1"] * 5000) + "\n")
+    assert len(structural_hash(ast[0])) == 16
+
+
+def test_equal_expressions_are_shared_within_a_scope():
+    code = ("x = 1\ny = x + 1\nz = x + 1\n"
+            "def f(x):\n    return x + 1\n"
+            "def g(x):\n    return x + 1\n")
+    ast = CustomParser(hash_cons=True).parse(code)
+    one = ast[0].expr
+    assert ast[1].expr.right is one and ast[3].body[0].expr.right is one
+    assert ast[1].expr is ast[2].expr and ast[1].expr.left is ast[0].name
+    # Each function resolves x to a slot of its own frame
+    f, g = ast[3], ast[4]
+    assert f.params[0] is f.body[0].expr.left
+    assert f.body[0].expr is not g.body[0].expr is not ast[1].expr
+
+
+def test_shared_trees_are_smaller_and_survive_the_disk_cache(tmp_path):
+    code = "".join(f"x{i % 5} = (n + 1) * {i % 3} - len(\"ab\")\n" for i in range(200))
+    plain = CustomParser().parse(code)
+    shared = CustomParser(hash_cons=True).parse(code)
+    assert estimate_size(shared) < estimate_size(plain) / 2
+    assert [structural_hash(s) for s in shared] == [structural_hash(s) for s in plain]
+
+    cache = mpyc.MpycCache(str(tmp_path))
+    CustomParser(disk_cache=cache, hash_cons=True).parse(code)
+    loaded = cache.load(code)
+    assert len(nodes(loaded)) == len(nodes(shared)) < len(nodes(plain))
+
+
+@pytest.mark.parametrize("engine", ["tree"] + ENGINES)
+def test_engines_run_shared_trees(engine):
+    sources = [open(path).read() for path in SAMPLES] + list(PROGRAMS.values())
+    for code in sources:
+        outputs = []
+        for parser in (CustomParser(), CustomParser(hash_cons=True)):
+            buf = io.StringIO()
+            try:
+                Interpreter(output_buffer=buf).run(parser.parse(code), engine)
+            except Exception as e:
+                buf.write(f"Error: {e}")
+            outputs.append(buf.getvalue())
+        assert outputs[0] == outputs[1], code
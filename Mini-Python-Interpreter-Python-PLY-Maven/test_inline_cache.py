@@ -0,0 +1,115 @@
+import io
+
+import pytest
+
+from src.ast_nodes import FunctionCall, Identifier
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from src.optimizer import clone
+from src.runtime import FunctionTable
+from src.visitor import walk
+from test_engines import ENGINES
+
+
+def parse(code):
+    return CustomParser().parse(code)
+
+
+def run(interpreter, ast, engine="tree"):
+    try:
+        interpreter.run(ast, engine)
+    except Exception as e:
+        return f"Error: {e}"
+    return interpreter.output_buffer.getvalue()
+
+
+def calls(ast):
+    return [node for node in walk(ast) if isinstance(node, FunctionCall)]
+
+
+def test_every_change_gives_a_new_version():
+    table = FunctionTable(f=1)
+    versions = [table.version, FunctionTable().version]
+    for change in [lambda: table.__setitem__("g", 2), lambda: table.update(h=3),
+                   lambda: table.__ior__({"k": 4}), lambda: table.setdefault("f"),
+                   lambda: table.pop("g"), lambda: table.__delitem__("h"),
+                   lambda: table.popitem(), lambda: table.clear()]:
+        change()
+        versions.append(table.version)
+    assert len(set(versions)) == len(versions)
+    assert table == {}
+
+
+def test_redefinition_invalidates_call_sites():
+    code = """
+def g():
+    return 1
+def call():
+    return g()
+print(call())
+def g():
+    return 2
+print(call())
+"""
+    for engine in ["tree"] + ENGINES:
+        assert run(Interpreter(output_buffer=io.StringIO()), parse(code), engine) == "1\n2\n"
+
+
+def test_calls_are_cached_until_a_function_is_defined():
+    ast = parse("def f(a):\n    return a\nfor i in range(3):\n    print(f(i, 9))\n")
+    interpreter = Interpreter(output_buffer=io.StringIO())
+    assert run(interpreter, ast) == "0\n1\n2\n"
+    call, = calls(ast)
+    assert call.cache == (interpreter.functions.version, interpreter.functions["f"], 1, 1)
+    interpreter.execute("def g():\n    return 0\n")
+    assert call.cache[0] != interpreter.functions.version
+
+
+def test_shared_trees_follow_each_interpreter():
+    ast = parse("print(f(), f)\n")
+    outputs = []
+    for value in [1, 2, 1]:
+        interpreter = Interpreter(output_buffer=io.StringIO())
+        interpreter.execute(f"def f():\n    return {value}\n")
+        output = run(interpreter, ast)
+        assert output.endswith(f"{interpreter.functions['f']}\n")
+        outputs.append(output.split()[0])
+    assert outputs == ["1", "2", "1"]
+
+
+def test_function_reads_are_cached():
+    interpreter = Interpreter(output_buffer=io.StringIO())
+    interpreter.execute("def f():\n    return 0\n")
+    name = Identifier("f")
+    assert interpreter.evaluate(name) is interpreter.functions["f"]
+    assert name.cache == (interpreter.functions.version, interpreter.functions["f"])
+    interpreter.execute("def f():\n    return 1\n")
+    assert interpreter.evaluate(name) is interpreter.functions["f"]
+    # Globals take precedence over functions of the same name
+    interpreter.environment["f"] = 5
+    assert interpreter.evaluate(name) == 5
+
+
+@pytest.mark.parametrize("code, removed, replaced", [
+    ("print(h(1))\n", "Error: Undefined function: h", "Error: h is not a function"),
+    ("print(h)\n", "Error: Undefined variable or function: h", "3\n"),
+])
+def test_cached_sites_fail_as_before(code, removed, replaced):
+    interpreter = Interpreter(output_buffer=io.StringIO())
+    interpreter.execute("def h(x):\n    return x\n")
+    ast = parse(code)
+    run(interpreter, ast)
+    interpreter.functions.pop("h")
+    assert run(interpreter, ast).endswith(removed)
+    interpreter.functions["h"] = 3
+    assert run(interpreter, ast).endswith(replaced)
+
+
+def test_cached_trees_run_on_every_engine():
+    code = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\nprint(fib(10))\n"
+    ast = parse(code)
+    run(Interpreter(output_buffer=io.StringIO()), ast)
+    assert all(call.cache is not None for call in calls(ast))
+    for engine in ["tree"] + ENGINES:
+        assert run(Interpreter(output_buffer=io.StringIO()), ast, engine) == "55\n"
+    assert all(call.cache is None for call in calls(clone(ast)))
@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+
+from src.lexer import Token, TokenTable, format_token_output, iter_tokens, tokenize
+
+PROGRAM = """
+def square(n):
+    return n * n  # comment
+print(square(1 if 007 else 2), "a\\tb")
+"""
+
+
+def test_iter_tokens_matches_tokenize():
+    records = list(iter_tokens(PROGRAM))
+    assert [tok._asdict() for tok in records] == tokenize(PROGRAM)
+    assert records[1] == Token("DEF", "def", 2, 1)
+    assert [tok.type for tok in records].count("DEDENT") == 1
+
+
+def test_iter_tokens_is_lazy_and_independent():
+    first = iter_tokens(PROGRAM)
+    assert next(first).type == "NEWLINE"
+    # A second stream does not disturb the first one
+    assert len(tokenize("x = 1\n")) == 4
+    assert [tok.type for tok in itertools.islice(first, 3)] == ["DEF", "IDENTIFIER", "LPAREN"]
+
+
+def test_iter_tokens_reads_paths(tmp_path):
+    path = tmp_path / "prog.py"
+    path.write_text(PROGRAM)
+    assert list(iter_tokens(path)) == list(iter_tokens(PROGRAM))
+    empty = tmp_path / "empty.py"
+    empty.write_text("")
+    assert list(iter_tokens(empty)) == []
+
+
+def test_format_token_output_accepts_a_stream():
+    assert format_token_output(iter_tokens(PROGRAM)) == format_token_output(tokenize(PROGRAM))
+    assert format_token_output(iter(())) == "No tokens found in the input code."
+    assert "- Keywords: 5 tokens" in format_token_output(iter_tokens(PROGRAM))
+
+
+def test_token_table_matches_tokenize():
+    table = TokenTable.from_source(PROGRAM)
+    assert len(table) == len(tokenize(PROGRAM))
+    assert [tok._asdict() for tok in table] == tokenize(PROGRAM)
+    assert table[-1] == Token("NEWLINE", "\n", 4, len(PROGRAM) - 1)
+    assert table.type_counts()["IDENTIFIER"] == 5
+    assert table.positions.itemsize == 4
+
+
+def test_token_table_csv_and_frame():
+    pd = pytest.importorskip("pandas")
+    table = TokenTable.from_source(PROGRAM)
+    expected = pd.DataFrame(tokenize(PROGRAM))
+    assert table.to_csv() == expected.to_csv(index=False)
+    assert "".join(table.iter_csv(chunk_size=1)) == table.to_csv()
+    frame = table.to_frame()
+    assert frame.astype({"type": str}).to_dict("records") == expected.to_dict("records")
+    assert TokenTable("").to_csv() == "type,value,line,lexpos\n"
+
+
+def columns(table):
+    return [list(table.types), list(table.lines), list(table.positions), list(table.lengths)]
+
+
+@pytest.mark.parametrize("old, new", [
+    (PROGRAM, PROGRAM.replace("n * n", "n * n * n")),
+    (PROGRAM, PROGRAM.replace("    return", "    x = 1\n    return")),
+    (PROGRAM, PROGRAM.replace("def square(n):\n    ", "def square(n): ")),
+    (PROGRAM, PROGRAM.replace("print(", 'print("', 1)),
+    ('x = "a\nprint(x)\ny = 1\n', 'x = "a\nprint(x)\ny = 1"\n'),
+    (PROGRAM, ""),
+])
+def test_incremental_lexer_matches_full_lex(old, new):
+    from src.incremental_lexer import IncrementalLexer
+    lexer = IncrementalLexer(old)
+    assert columns(lexer.update(new)) == columns(TokenTable.from_source(new))
+    assert columns(lexer.update(old)) == columns(TokenTable.from_source(old))
+
+
+def test_incremental_lexer_relexes_only_the_edited_line():
+    from src.incremental_lexer import IncrementalLexer
+    code = "".join(f"x{i} = {i}\nif x{i}:\n    print(x{i})\n" for i in range(200))
+    lexer = IncrementalLexer(code)
+    pos = code.index("x100 = 100") + 5
+    table = lexer.edit(pos, pos, "1")
+    assert lexer.last_relexed < 10
+    assert columns(table) == columns(TokenTable.from_source(lexer.source))
@@ -0,0 +1,92 @@
+import io
+import time
+
+import pytest
+
+from src.interpreter import Interpreter
+from src.limits import (AllocationLimitExceeded, Limits, OutputLimitExceeded, ResourceLimitExceeded,
+                        StepLimitExceeded, TimeLimitExceeded)
+from test_engines import PROGRAMS, SAMPLES
+from test_optimizer import program
+
+GENEROUS = dict(steps=10 ** 7, seconds=60, output_bytes=10 ** 7, allocation=10 ** 8)
+
+
+def run(code, limits):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, limits=limits)
+    try:
+        interpreter.execute(code)
+    except Exception as e:
+        return (buf.getvalue(), f"Error: {e}"), e
+    return (buf.getvalue(), None), None
+
+
+@pytest.mark.parametrize("code, limits, error", [
+    ("while True:\n    x = 1\n", Limits(steps=1000), StepLimitExceeded),
+    ("def f(n):\n    if n > 0:\n        return f(n - 1)\n    return 0\nf(100)\n", Limits(steps=50), StepLimitExceeded),
+    ("while True:\n    x = 1\n", Limits(seconds=0.05), TimeLimitExceeded),
+    ("x = 3\nwhile True:\n    x = x * x\n", Limits(seconds=1), TimeLimitExceeded),
+    ("for i in range(1000):\n    print(\"line\", i)\n", Limits(output_bytes=100), OutputLimitExceeded),
+    ("s = \"ab\" * 1000000000\n", Limits(allocation=10 ** 6), AllocationLimitExceeded),
+    ("xs = [0]\nwhile True:\n    xs = xs + xs\n", Limits(allocation=10 ** 6), AllocationLimitExceeded),
+    ("s = \"x\" * 1000\nt = s.replace(\"\", s)\n", Limits(allocation=10 ** 5), AllocationLimitExceeded),
+    ("x = 3\nwhile True:\n    x = x * x\n", Limits(allocation=10 ** 6), AllocationLimitExceeded),
+    ("x = 3\nwhile True:\n    x = -(x + x * x)\n", Limits(allocation=10 ** 6), AllocationLimitExceeded),
+])
+def test_each_limit_raises_its_own_error(code, limits, error):
+    start = time.perf_counter()
+    _, e = run(code, limits)
+    assert type(e) is error and isinstance(e, ResourceLimitExceeded)
+    assert time.perf_counter() - start < 5
+
+
+def test_errors_name_the_budget():
+    limits = Limits(steps=10, output_bytes=11)
+    (output, message), e = run("for i in range(20):\n    x = i\n", limits)
+    assert message == "Error: Step limit exceeded: more than 10 steps"
+    assert (e.limit, e.value, limits.steps) == ("steps", 10, 11)
+    (output, message), e = run("print(\"hello\")\nprint(\"world\")\n", limits)
+    assert output == "hello\n" and e.limit == "output_bytes"
+    # Output is counted in UTF-8 bytes, with the newline
+    with pytest.raises(OutputLimitExceeded):
+        Limits(output_bytes=6).write("h\u00e9llo")
+
+
+def test_programs_cannot_catch_them():
+    code = "i = 0\nwhile True:\n    try:\n        i = i + 1\n        print(i)\n    except:\n        print(\"caught\")\n"
+    (output, _), e = run(code, Limits(output_bytes=20))
+    assert isinstance(e, OutputLimitExceeded) and "caught" not in output
+
+
+def test_every_run_gets_the_whole_budget():
+    limits = Limits(steps=15)
+    interpreter = Interpreter(output_buffer=io.StringIO(), limits=limits)
+    for _ in range(3):
+        interpreter.execute("for i in range(10):\n    x = i\n")
+        assert limits.steps == 10
+
+
+@pytest.mark.parametrize("allocation, readings", [(None, 1001), (10 ** 6, 4)])
+def test_an_allocation_budget_spares_clock_readings(allocation, readings, monkeypatch):
+    limits = Limits(seconds=60, allocation=allocation)
+    calls = []
+    monkeypatch.setattr(time, "monotonic", lambda: calls.append(None) or 0.0)
+    run("for i in range(1000):\n    x = i\n", limits)
+    # One reading starts the clock of the run
+    assert len(calls) == readings
+
+
+def test_generous_limits_change_nothing():
+    sources = [open(path).read() for path in SAMPLES] + list(PROGRAMS.values())
+    sources += map(program, range(80))
+    for code in sources:
+        assert run(code, Limits(**GENEROUS))[0] == run(code, None)[0], code
+
+
+def test_only_the_tree_engine_enforces_limits():
+    interpreter = Interpreter(output_buffer=io.StringIO(), limits=Limits(steps=10))
+    with pytest.raises(Exception, match="only enforced by the tree engine, not vm"):
+        interpreter.execute("print(1)\n", engine="vm")
+    with pytest.raises(Exception, match="adaptive cannot be combined with limits"):
+        Interpreter(adaptive=True, limits=Limits())
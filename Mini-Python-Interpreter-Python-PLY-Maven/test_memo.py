@@ -0,0 +1,141 @@
+import io
+
+from src.interpreter import Interpreter
+from src.memo import MemoTable, pure_functions
+from src.myparser import CustomParser
+from test_engines import PROGRAMS, SAMPLES
+from test_optimizer import program
+
+
+def run(code, memoize=True, **options):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, memoize=memoize, **options)
+    try:
+        interpreter.run(CustomParser().parse(code), "tree")
+    except Exception as e:
+        return (buf.getvalue(), f"Error: {e}"), interpreter
+    return (buf.getvalue(), None), interpreter
+
+
+FIB = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\n"
+
+
+def test_finds_the_pure_functions():
+    code = FIB + """
+def even(n):
+    if n == 0:
+        return True
+    return odd(n - 1)
+def odd(n):
+    if n == 0:
+        return False
+    return even(n - 1)
+def total(xs):
+    t = 0
+    ys = [0]
+    for x in xs:
+        t = t + x
+        ys[0] = t
+    return len(ys) + t
+def shout(s):
+    print(s)
+    return s
+def loud(s):
+    t = shout(s)
+    return t.upper()
+def scaled(n):
+    return n * factor
+def store(n):
+    seen[0] = n
+    return n
+def guarded(n):
+    try:
+        return fib(n)
+    except:
+        return 0
+def maker():
+    def inner():
+        return 1
+    return 0
+def calls_missing(n):
+    return missing(n)
+"""
+    assert run(code)[0] == ("", None)
+    _, interpreter = run(code)
+    assert pure_functions(interpreter.functions) == {"fib", "even", "odd", "total"}
+
+
+def test_fib_calls_each_argument_once():
+    (output, _), interpreter = run(FIB + "print(fib(30))\n")
+    assert output == "832040\n"
+    table = interpreter.memo.tables["fib"]
+    assert (table.misses, table.hits) == (31, 28)
+    assert "fib: 28 hits, 31 misses (47.5%), 31 entries, 0 evicted" in interpreter.report()
+
+
+def test_same_output_as_without_memoization():
+    sources = [open(path).read() for path in SAMPLES] + list(PROGRAMS.values())
+    sources += map(program, range(80))
+    for code in sources:
+        assert run(code)[0] == run(code, memoize=False)[0], code
+        assert run(code, adaptive=True)[0] == run(code, memoize=False)[0], code
+
+
+def test_tables_evict_the_least_recently_used():
+    table = MemoTable(2)
+    table.put("a", 1)
+    table.put("b", 2)
+    assert table.get("a") == 1
+    table.put("c", 3)
+    assert list(table.results) == ["a", "c"] and table.evictions == 1
+    (output, _), interpreter = run(FIB + "print(fib(25))\n", memoize=4)
+    assert output == "75025\n"
+    assert len(interpreter.memo.tables["fib"].results) == 4
+
+
+def test_keys_and_results_that_are_not_kept():
+    code = """
+def same(x):
+    return x
+def wrap(n):
+    return [n]
+def first(xs):
+    return xs[0]
+print(same(1), same(True), same(2 / 2), same(1))
+print(wrap(1), wrap(1), first([1]), first([2]))
+"""
+    (output, _), interpreter = run(code)
+    assert output == "1 True 1.0 1\n[1] [1] 1 2\n"
+    tables = interpreter.memo.tables
+    assert (tables["same"].hits, tables["wrap"].hits, tables["wrap"].misses) == (1, 0, 2)
+    assert "first" not in tables
+
+
+def test_zeros_of_both_signs_are_different_arguments():
+    code = "def f(x):\n    return x * 1\nz = 0 / 5\nprint(f(z))\nprint(f(-z))\nprint(f(z))\n"
+    (output, _), interpreter = run(code)
+    assert output == "0.0\n-0.0\n0.0\n"
+    assert interpreter.memo.tables["f"].hits == 1
+
+
+def test_redefining_a_callee_empties_the_tables():
+    code = """
+def g():
+    return 1
+def f(n):
+    return g() + n
+print(f(1), f(1))
+def g():
+    return 2
+print(f(1), f(1))
+"""
+    (output, _), interpreter = run(code)
+    assert output == "2 2\n3 3\n"
+    assert interpreter.memo.tables["f"].hits == 2
+
+
+def test_errors_are_not_memoized():
+    code = "def inv(n):\n    return 1 / n\nfor i in [2, 0, 0]:\n    try:\n        print(inv(i))\n    except:\n        print(\"caught\")\n"
+    (output, _), interpreter = run(code)
+    assert output == "0.5\ncaught\ncaught\n"
+    assert interpreter.memo.tables["inv"].misses == 3
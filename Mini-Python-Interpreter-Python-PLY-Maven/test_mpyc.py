@@ -0,0 +1,133 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from src import mpyc
+from src.compiler import compile_program
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from test_pratt import SAMPLES, generated, positioned
+
+
+def run(ast, engine, capsys):
+    Interpreter().run(ast, engine)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_entries_round_trip_trees_and_code(path, capsys):
+    ast = CustomParser().parse(open(path).read())
+    code = compile_program(ast)
+    loaded, loaded_code = mpyc.loads(mpyc.dumps(ast, code))
+    assert positioned(loaded) == positioned(ast)
+    assert loaded_code.disassemble() == code.disassemble()
+    capsys.readouterr()
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_generated_programs_round_trip(capsys):
+    parser = CustomParser()
+    for code in map(generated, range(0, 200, 2)):
+        try:
+            ast = parser.parse(code)
+        except SyntaxError:
+            continue
+        assert positioned(mpyc.loads(mpyc.dumps(ast))[0]) == positioned(ast)
+    capsys.readouterr()
+
+
+def test_deep_trees_round_trip():
+    # Deeper than marshal can nest, so only a flat encoding stores it
+    ast = CustomParser().parse("x = " + " + ".join(["1"] * 5000) + "\n")
+    data = mpyc.dumps(ast)
+    assert mpyc.dumps(mpyc.loads(data)[0]) == data
+
+
+def test_warm_load_skips_the_parser_and_the_compiler(tmp_path, capsys, monkeypatch):
+    code = "def f(n):\n    return n * 2\nprint(f(21), 'x')\n"
+    cache = mpyc.MpycCache(str(tmp_path))
+    cold = CustomParser(disk_cache=cache).parse(code)
+    expected = run(cold, "vm", capsys)
+
+    monkeypatch.setattr("src.myparser.CompilerContext.parse", None)
+    monkeypatch.setattr("src.compiler.Compiler.compile_module", None)
+    warm = CustomParser(disk_cache=cache).parse(code)
+    assert warm is not cold and positioned(warm) == positioned(cold)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert run(warm, "vm", capsys) == expected == "42 x\n"
+    assert run(warm, "tree", capsys) == expected
+
+
+def test_changed_sources_and_compilers_miss(tmp_path, monkeypatch):
+    cache = mpyc.MpycCache(str(tmp_path))
+    ast = CustomParser().parse("x = 1\n")
+    cache.store("x = 1\n", ast)
+    assert cache.load("x = 2\n") is None
+    assert cache.load("x = 1\n") is not None
+
+    monkeypatch.setattr(mpyc, "compiler_version", lambda: "next")
+    assert cache.load("x = 1\n") is None
+
+
+def test_compiler_version_depends_on_the_sources_alone(tmp_path, monkeypatch):
+    mpyc.compiler_version.cache_clear()
+    imported = mpyc.compiler_version()
+    # As in a fresh process that has parsed nothing, run from elsewhere
+    for name in mpyc._COMPILER_MODULES:
+        monkeypatch.delitem(sys.modules, f"src.{name}", raising=False)
+    monkeypatch.chdir(tmp_path)
+    mpyc.compiler_version.cache_clear()
+    try:
+        assert mpyc.compiler_version() == imported
+    finally:
+        mpyc.compiler_version.cache_clear()
+
+
+def test_unreadable_entries_are_misses_and_removed(tmp_path):
+    cache = mpyc.MpycCache(str(tmp_path))
+    cache.store("x = 1\n", CustomParser().parse("x = 1\n"))
+    path = cache.path(mpyc.source_key("x = 1\n"))
+    data = open(path, "rb").read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    assert cache.load("x = 1\n") is None
+    assert not os.path.exists(path)
+
+
+def test_the_directory_is_capped_evicting_the_least_recently_used(tmp_path):
+    sources = [f"x = {i}\nprint(x + {i})\n" for i in range(8)]
+    parser = CustomParser()
+    probe = mpyc.MpycCache(str(tmp_path / "probe"))
+    probe.store(sources[0], parser.parse(sources[0]))
+    cache = mpyc.MpycCache(str(tmp_path / "cache"), max_bytes=probe.size() * 9 // 2)
+    for i, code in enumerate(sources):
+        cache.store(code, parser.parse(code))
+        path = cache.path(mpyc.source_key(code))
+        os.utime(path, (i, i))
+        # Keep the first source in use
+        cache.load(sources[0])
+    assert cache.size() <= cache.max_bytes
+    assert cache.evictions == 4
+    assert cache.load(sources[0]) is not None and cache.load(sources[-1]) is not None
+    assert cache.load(sources[1]) is None
+
+
+def test_scripts_are_cached_beside_them(tmp_path, capsys):
+    script = tmp_path / "job.py"
+    shutil.copy(SAMPLES[0], script)
+    interpreter = Interpreter()
+    interpreter.execute_file(str(script), "vm")
+    first = capsys.readouterr().out
+    entries = os.listdir(tmp_path / mpyc.CACHE_DIR)
+    assert len(entries) == 1 and entries[0].startswith("job.")
+
+    interpreter.execute_file(str(script), "vm")
+    assert capsys.readouterr().out == first
+
+    script.write_text(script.read_text() + "print(1)\n")
+    interpreter.execute_file(str(script), "vm")
+    assert capsys.readouterr().out == first + "1\n"
+    # The entry of the edited script replaced the stale one
+    assert len(os.listdir(tmp_path / mpyc.CACHE_DIR)) == 1
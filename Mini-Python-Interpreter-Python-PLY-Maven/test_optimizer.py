@@ -0,0 +1,232 @@
+import io
+import random
+
+import pytest
+
+from src.ast_nodes import structural_hash
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from src.optimizer import fold_constants, optimize, optimize_program
+from src.unparse import unparse
+from test_engines import ENGINES, PROGRAMS, SAMPLES
+
+
+def parse(code, **options):
+    return CustomParser(**options).parse(code)
+
+
+def optimized(code):
+    return unparse(optimize(parse(code)))
+
+
+def run(ast, engine):
+    buf = io.StringIO()
+    try:
+        Interpreter(output_buffer=buf).run(ast, engine)
+    except Exception as e:
+        return buf.getvalue(), f"Error: {e}"
+    return buf.getvalue(), None
+
+
+def test_propagates_and_folds_constants():
+    code = "x = 2\nt = \"ab\"\ny = x * 3 + len(t)\nprint(y, x % 0, -x, t.upper())\n"
+    assert optimized(code) == "x = 2\nt = 'ab'\ny = 8\nprint(8, (2 % 0), -2, 'AB')"
+
+
+def test_propagates_copies():
+    assert optimized("a = n\nb = a\nprint(b + a)\n") == "a = n\nb = n\nprint((n + n))"
+    assert optimized("a = n\nb = a\na = 1\nprint(b)\n") == "a = n\nb = n\na = 1\nprint(n)"
+    # A copy is forgotten once the original changes
+    assert optimized("a = n\nb = a\nn = 1\nprint(b)\n") == "a = n\nb = n\nn = 1\nprint(b)"
+
+
+def test_drops_dead_branches_and_unreachable_code():
+    code = """
+if 1 < 2:
+    print("yes")
+else:
+    print("no")
+while 1 > 2:
+    print(1)
+for i in range(3):
+    if i:
+        continue
+        print(i)
+    break
+    print(i)
+"""
+    assert optimized(code) == ("print('yes')\nfor i in range(3):\n    if i:\n        continue\n    break")
+
+
+def test_knowledge_survives_loops_only_where_unchanged():
+    code = "k = 0\nn = 5\nwhile k < n:\n    k = k + 1\nprint(k, n)\n"
+    assert optimized(code) == "k = 0\nn = 5\nwhile (k < 5):\n    k = (k + 1)\nprint(k, 5)"
+
+
+def test_removes_unused_functions_and_dead_stores():
+    code = """
+def unused():
+    return 1
+def g(n):
+    return n
+def f(n):
+    t = len(n)
+    u = t * 2
+    return g(t)
+print(f("ab"))
+"""
+    assert optimized(code) == ("def g(n):\n    return n\ndef f(n):\n    t = len(n)\n    return g(t)\n"
+                               "print(f('ab'))")
+
+
+def test_keeps_stores_that_can_raise():
+    code = "def f(n):\n    t = n * 2\n    return 1\nprint(f(3))\n"
+    assert "t = (n * 2)" in optimized(code)
+
+
+def test_hoists_loop_invariants():
+    code = "x = len(s)\nfor i in range(n):\n    y = x * x + i\n    print(y, len(s))\n"
+    assert optimized(code) == ("x = len(s)\n_inv0 = (x * x)\nfor i in range(n):\n"
+                               "    y = (_inv0 + i)\n    print(y, len(s))")
+    # len(s) could raise before the loop runs, and _inv0 is taken
+    code = "_inv0 = 1\nwhile k < n:\n    k = k + 1\n    print(len(s), k * 2, _inv0 + 1)\n"
+    assert optimized(code) == code.replace("_inv0 + 1", "2").replace("k + 1", "(k + 1)") \
+        .replace("k < n", "(k < n)").replace("k * 2", "(k * 2)").rstrip("\n")
+
+
+def test_functions_keep_their_locals():
+    code = "s = 1\ndef f():\n    if 1:\n        print(s)\n    else:\n        s = 2\n    return 0\nf()\n"
+    assert optimized(code) == ("s = 1\ndef f():\n    print(s)\n    return 0\n    if False:\n        s = 0\nf()")
+    assert unparse(fold_constants(parse(code))).endswith("    if False:\n        s = 0\nf()")
+    for engine in ["tree"] + ENGINES:
+        assert run(optimize(parse(code)), engine) == ("", "Error: Undefined variable or function: s")
+
+
+def test_input_is_left_alone():
+    ast = parse(PROGRAMS["recursion"] + "x = 2 * 3\nprint(x)\n")
+    before = [structural_hash(node) for node in ast]
+    optimize(ast)
+    fold_constants(ast)
+    assert [structural_hash(node) for node in ast] == before
+
+
+def test_shared_subtrees_are_rewritten_apart():
+    code = "def f(n):\n    return n + 1\ni = 0\nwhile i < 3:\n    i = i + 1\n    print(n + 1)\nn = 1\nprint(n + 1, f(2))\n"
+    ast = parse(code, hash_cons=True)
+    for engine in ENGINES:
+        assert run(optimize(ast), engine) == run(ast, engine)
+
+
+def test_execute_with_optimize():
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf)
+    interpreter.execute("x = 6\nfor i in range(2):\n    print(x * 7 + i)\n", optimize=True)
+    assert buf.getvalue() == "42\n43\n"
+    ast = parse("print(1 + 1)\n")
+    assert optimize_program(ast) is optimize_program(ast)
+
+
+def test_execute_keeps_functions_for_later_programs():
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf)
+    interpreter.execute("def f(n):\n    return n + 1\n", optimize=True)
+    interpreter.execute("print(f(2))\n", optimize=True)
+    assert buf.getvalue() == "3\n"
+    assert "def f" not in optimized("def f(n):\n    return n + 1\n")
+
+
+@pytest.mark.parametrize("engine", ["tree"] + ENGINES)
+def test_samples_and_programs_keep_their_output(engine):
+    sources = [open(path).read() for path in SAMPLES] + list(PROGRAMS.values())
+    for code in sources:
+        ast = parse(code)
+        assert run(optimize(ast), engine) == run(ast, engine)
+
+
+def program(seed):
+    """A random program that terminates, now and then with a type error."""
+    rng = random.Random(seed)
+    functions = []
+    counters = iter(range(1000))
+
+    def num(names, depth=0):
+        roll = rng.random()
+        if depth > 2 or roll < 0.35:
+            return rng.choice(names * 2 + ["0", "1", "2", "7", "z", "len(s)", "len(xs)", "True"])
+        if roll < 0.6:
+            op = rng.choice("+-*+-*/%")
+            right = str(rng.randint(1, 4)) if op in "/%" and rng.random() < 0.9 else num(names, depth + 1)
+            return f"({num(names, depth + 1)} {op} {right})"
+        if roll < 0.7:
+            op = rng.choice(["<", ">", "<=", ">=", "==", "!=", "and", "or"])
+            return f"({num(names, depth + 1)} {op} {num(names, depth + 1)})"
+        if roll < 0.75:
+            return rng.choice(["-", "not "]) + num(names, depth + 1)
+        if roll < 0.83 and functions:
+            name, arity = rng.choice(functions)
+            return f"{name}({', '.join(num(names, depth + 1) for _ in range(arity))})"
+        if roll < 0.9:
+            return rng.choice(["xs[0]", "xs[1]", "xs[len(xs) - 1]", "len(s.upper())", "len(s + \"ab\")"])
+        if roll < 0.92:
+            return rng.choice(["(s + 1)", "len(a)", "undefined", "(1 / 0)"])
+        return f"len({rng.choice(['xs', '[1, 2]', '(xs + [a])'])})"
+
+    def block(names, indent, depth, in_loop, in_function):
+        lines = []
+        for _ in range(rng.randint(1, 4)):
+            roll = rng.random() if depth < 3 else rng.random() * 0.55
+            if roll < 0.3:
+                target = rng.choice("abcabcsx")
+                value = {"s": lambda names: rng.choice(["s.lower()", "(s + \"ab\")", "s[0]", "\"Hi\""]),
+                         "x": lambda names: rng.choice(["xs", "[1, 2]", f"(xs + [{num(names)}])"])
+                         }.get(target, num)(names)
+                lines.append(f"{indent}{'xs' if target == 'x' else target} = {value}")
+            elif roll < 0.42:
+                lines.append(f"{indent}print({', '.join(num(names) for _ in range(rng.randint(1, 2)))})")
+            elif roll < 0.46 and in_loop:
+                lines += [f"{indent}if {num(names)}:", f"{indent}    {rng.choice(['break', 'continue'])}"]
+            elif roll < 0.5 and in_function:
+                lines.append(f"{indent}return {num(names)}")
+            elif roll < 0.67:
+                lines.append(f"{indent}if {num(names)}:")
+                lines += block(names, indent + "    ", depth + 1, in_loop, in_function)
+                if rng.random() < 0.5:
+                    lines.append(f"{indent}else:")
+                    lines += block(names, indent + "    ", depth + 1, in_loop, in_function)
+            elif roll < 0.77:
+                counter = f"w{next(counters)}"
+                lines += [f"{indent}{counter} = 0", f"{indent}while {counter} < {rng.choice('024')}:",
+                          f"{indent}    {counter} = {counter} + 1"]
+                lines += block(names + [counter], indent + "    ", depth + 1, True, in_function)
+            elif roll < 0.87:
+                var = rng.choice("ij")
+                iterable = rng.choice([f"range({rng.randint(0, 4)})", "xs", "[1, 2, 3]", "range(len(xs))"])
+                lines.append(f"{indent}for {var} in {iterable}:")
+                lines += block(names + [var], indent + "    ", depth + 1, True, in_function)
+            elif roll < 0.94:
+                lines.append(f"{indent}try:")
+                lines += block(names, indent + "    ", depth + 1, in_loop, in_function)
+                lines.append(f"{indent}except:")
+                lines += block(names, indent + "    ", depth + 1, in_loop, in_function)
+            elif not in_function and not in_loop:
+                name = f"f{len(functions)}"
+                params = rng.sample(["p", "q", "a"], rng.randint(0, 2))
+                lines.append(f"{indent}def {name}({', '.join(params)}):")
+                lines += block(["a", "b", "c"] + params, indent + "    ", depth + 1, False, True)
+                lines.append(f"{indent}    return {num(['a', 'b', 'c'] + params)}")
+                functions.append((name, len(params)))
+        return lines or [f"{indent}a = 1"]
+
+    # z is a float zero, so that -z is the other zero
+    lines = ["a = 1", "b = 2", "c = 3", "z = 0 / 5", "s = \"Hello\"", "xs = [4, 5, 6]"]
+    return "\n".join(lines + block(["a", "b", "c"], "", 0, False, False)) + "\n"
+
+
+# The tree engine lets loop state outlive a loop (see src/optimizer.py),
+# so the generated programs are checked on the other engines
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("seed", range(0, 120, 40))
+def test_generated_programs_keep_their_output(engine, seed):
+    for code in map(program, range(seed, seed + 40)):
+        ast = parse(code)
+        assert run(optimize(ast), engine) == run(ast, engine), code
@@ -0,0 +1,179 @@
+import io
+
+import pytest
+
+from src.interpreter import Interpreter
+from src.myparser import CustomParser, estimate_size
+
+PROGRAM = """
+def square(n):
+    return n * n
+for i in range(3):
+    print(square(i))
+"""
+
+
+def test_parse_cache_hits_and_misses():
+    parser = CustomParser(cache_size=4)
+    first = parser.parse(PROGRAM)
+    assert parser.parse(PROGRAM) is first
+    assert parser.parse("x = 1\n") is not first
+    info = parser.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+    assert info.nbytes == estimate_size(first) + estimate_size(parser.parse("x = 1\n"))
+
+
+def test_parse_cache_evicts_least_recently_used():
+    parser = CustomParser(cache_size=2)
+    a = parser.parse("a = 1\n")
+    parser.parse("b = 2\n")
+    parser.parse("a = 1\n")
+    parser.parse("c = 3\n")
+    assert parser.parse("a = 1\n") is a
+    assert parser.cache_info().currsize == 2
+    assert parser.cache_info().misses == 3
+    parser.parse("b = 2\n")
+    assert parser.cache_info().misses == 4
+
+
+def test_parse_cache_is_bounded_by_memory():
+    small = estimate_size(CustomParser(cache_size=0).parse("a = 1\n"))
+    parser = CustomParser(cache_bytes=small * 2)
+    parser.parse("a = 1\n")
+    parser.parse("b = 2\n")
+    parser.parse("c = 3\n")
+    info = parser.cache_info()
+    assert info.currsize == 2 and info.nbytes <= info.maxbytes
+    parser.parse(PROGRAM)
+    assert parser.cache_info().nbytes <= small * 2
+
+
+def test_parse_errors_are_not_cached():
+    parser = CustomParser()
+    for _ in range(2):
+        with pytest.raises(Exception):
+            parser.parse("x = = 1\n")
+    assert parser.cache_info().currsize == 0
+
+
+def test_interpreter_runs_a_pre_parsed_ast():
+    parser = CustomParser()
+    ast = parser.parse(PROGRAM)
+    buf = io.StringIO()
+    Interpreter(output_buffer=buf).run(ast)
+    Interpreter(output_buffer=buf).run(parser.parse(PROGRAM))
+    assert buf.getvalue() == "0\n1\n4\n" * 2
+    assert parser.cache_info().misses == 1
+
+
+def test_shipped_tables_match_the_grammar():
+    from src import lexer, myparser, tables
+    assert tables.table_version(lexer, "lextab") == tables.grammar_version(lexer, "t_")
+    assert tables.table_version(myparser, "parsetab") == tables.grammar_version(myparser, "p_")
+
+
+def test_ast_nodes_are_slotted_with_declared_fields():
+    from src.ast_nodes import FunctionDef, Node, copy_location, iter_child_nodes
+    ast = CustomParser().parse(PROGRAM)
+    func = ast[0]
+    assert isinstance(func, FunctionDef)
+    assert not hasattr(func, "__dict__")
+    assert func._fields == ("name", "params", "body")
+    assert (func.lineno, func.col_offset) == (2, 0)
+    copy = FunctionDef("f", [], [])
+    assert not hasattr(copy, "lineno")
+    assert copy_location(copy, func).end == func.end
+    assert all(isinstance(child, Node) for child in iter_child_nodes(func))
+
+
+def dump(node):
+    if isinstance(node, list):
+        return [dump(item) for item in node]
+    if hasattr(node, "_fields"):
+        return (type(node).__name__,) + tuple(dump(getattr(node, name)) for name in node._fields)
+    return node
+
+
+def test_concurrent_parses_match_serial_results():
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from src.fastlexer import FastLexer
+
+    def program(i):
+        if i % 50 == 49:
+            return f"x = = {i}\n"
+        return "".join(f"def f{j}(a):\n    if a > {i}:\n        return a * {j}\n"
+                       f"    return [a, {i}]\nprint(f{j}({i}))\n" for j in range(i % 7 + 1))
+
+    def parse_all(parser, programs, workers=None):
+        def run(code):
+            try:
+                return dump(parser.parse(code))
+            except SyntaxError as e:
+                return str(e)
+        if workers is None:
+            return [run(code) for code in programs]
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(run, programs))
+
+    # Switch threads often so that parses interleave token by token
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        programs = [program(i) for i in range(300)] * 2
+        expected = parse_all(CustomParser(cache_size=0), programs)
+        for parser in (CustomParser(cache_size=0), CustomParser(cache_size=64),
+                       CustomParser(cache_size=0, lexer_factory=FastLexer)):
+            assert parse_all(parser, programs, workers=16) == expected
+    finally:
+        sys.setswitchinterval(old_interval)
+
+
+def test_source_index_maps_offsets_to_lines_and_columns():
+    from src.source_index import SourceIndex, index_for
+    source = "a = 1\n\nif a:\n    print(a)"
+    index = SourceIndex(source)
+    assert len(index) == 4
+    for offset in range(len(source) + 1):
+        line, col = index.position(offset)
+        assert line == source.count("\n", 0, offset) + 1
+        assert col == offset - (source.rfind("\n", 0, offset) + 1) + 1
+        assert index.offset(line, col) == offset
+    assert [index.line_text(n) for n in range(1, 5)] == source.split("\n")
+    assert index_for(source) is index_for(source)
+
+
+def test_syntax_errors_point_at_the_offending_token():
+    with pytest.raises(SyntaxError) as info:
+        CustomParser().parse("x = 1\nif x:\n    y = (1 2)\n")
+    assert str(info.value).startswith("Syntax error at line 3, column 12:\n    y = (1 2)\n           ^\n")
+
+
+def test_nodes_carry_the_source_span_of_their_tokens():
+    from src.ast_nodes import Node, iter_child_nodes
+    from src.fastlexer import FastLexer
+    from src.source_index import SourceIndex
+    source = 'def f(a, b):\n    x = (a + b) * 2\n    return x\nprint("sum", f(1, 2))\n'
+    index = SourceIndex(source)
+
+    def text(node):
+        return source[index.offset(node.lineno, node.col_offset + 1):node.end]
+
+    for parser in (CustomParser(cache_size=0), CustomParser(cache_size=0, lexer_factory=FastLexer)):
+        func, call = parser.parse(source)
+        assign, ret = func.body
+        assert text(func) == source[:source.index("\nprint")]
+        assert [text(param) for param in func.params] == ["a", "b"]
+        assert text(assign) == "x = (a + b) * 2"
+        assert text(assign.expr) == "(a + b) * 2"
+        assert text(assign.expr.left) == "(a + b)"
+        assert text(ret) == "return x"
+        assert text(call) == 'print("sum", f(1, 2))'
+        assert [text(arg) for arg in call.expr.elements] == ['"sum"', "f(1, 2)"]
+        empty, = parser.parse("print()\n")
+        assert empty.expr.elements == [] and (empty.expr.col_offset, empty.expr.end) == (5, 7)
+        stack = [func, call]
+        while stack:
+            node = stack.pop()
+            assert isinstance(node.lineno, int) and isinstance(node.end, int)
+            stack.extend(iter_child_nodes(node))
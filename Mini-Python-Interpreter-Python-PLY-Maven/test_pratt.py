@@ -0,0 +1,146 @@
+import glob
+import os
+import random
+
+import pytest
+
+from src.fastlexer import FastLexer
+from src.myparser import CompilerContext, CustomParser
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = sorted(glob.glob(os.path.join(ROOT, "samples", "*.py"))) + [
+    os.path.join(ROOT, name)
+    for name in ("example.py", "simple_example.py", "hello.py", "input.py")
+]
+
+# Corners of the grammar, most of them decided by PLY shifting on a conflict
+CASES = {
+    "flat precedence": "x = 1 + 2 * 3 - -4 == not y\n",
+    "minus runs on": "x = 1\ny = 2 - 3 -4\nreturn -5\n",
+    "print forms": "print()\nprint(1)\nprint(1, 'a')\nprint(1) + 2\nprint(1, 2) - 3\nprint -x\n",
+    "empty list heads": "print(,1)\nx = [,1]\nf(,2)\ndef g(, a):\n    return\n",
+    "indexing": "a[1] = a[2] + 3\na[1] * 2\nx = [1, 2][0]\n",
+    "calls": "s.upper()\nx = len(s.split(',')) + range() + range(1, 2, 3, 4)\nf()\n",
+    "statements without separators": "x = 1 y = 2 print(x) return break continue\n",
+    "blocks": ("def f(n):\n    try:\n        while n:\n            n = n - 1\n    except:\n"
+               "        pass\n    for i in range(n):\n        if i:\n            continue\n"
+               "        else:\n            break\n    return n\n"),
+    "blank lines": "\n",
+}
+
+ERRORS = ["", "x = (1 2)\n", "if x\n    y = 1\n", "def f(:\n", "print(1,)\n", "x = [1\n",
+          "for in y:\n", "try:\n    x = 1\ny = 2\n", "  x = 1\n    y = 2\n", "else:\n", "a.b\n"]
+
+
+def positioned(node):
+    """The tree with the source span of every node."""
+    if isinstance(node, list):
+        return [positioned(item) for item in node]
+    if hasattr(node, "_fields"):
+        return ((type(node).__name__, node.lineno, node.col_offset, node.end)
+                + tuple(positioned(getattr(node, name)) for name in node._fields))
+    return node
+
+
+def both(code, lexer_factory=None):
+    context = CompilerContext(lexer_factory)
+    results = []
+    for backend in ("lalr", "pratt"):
+        try:
+            results.append(positioned(context.parse(code, backend=backend)))
+        except SyntaxError as error:
+            results.append(("SyntaxError", str(error)))
+    return results
+
+
+ATOMS = ["1", "007", '"s"', "'it\\'s'", "True", "x", "len(x)", "range(1, 2)", "f()",
+         "s.upper()", "[]", "a[0]"]
+OPS = ["+", "-", "*", "/", "%", ">", "<=", "==", "!=", "and", "or"]
+
+
+def expression(rng, depth=0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.35:
+        return rng.choice(ATOMS)
+    if roll < 0.65:
+        return f"{expression(rng, depth + 1)} {rng.choice(OPS)} {expression(rng, depth + 1)}"
+    if roll < 0.75:
+        return rng.choice(["-", "not "]) + expression(rng, depth + 1)
+    if roll < 0.85:
+        return f"({expression(rng, depth + 1)})"
+    items = ", ".join(expression(rng, depth + 1) for _ in range(rng.randint(0, 3)))
+    return rng.choice(["f({})", "[{}]", "print({})"]).format(items)
+
+
+def statements(rng, indent="", depth=0):
+    lines = []
+    for _ in range(rng.randint(1, 3)):
+        roll = rng.random() if depth < 3 else rng.random() * 0.5
+        if roll < 0.15:
+            lines.append(f"{indent}x = {expression(rng)}")
+        elif roll < 0.2:
+            lines.append(f"{indent}a[{expression(rng)}] = {expression(rng)}")
+        elif roll < 0.3:
+            lines.append(f"{indent}{expression(rng)}")
+        elif roll < 0.4:
+            lines.append(f"{indent}return {expression(rng)}")
+        elif roll < 0.5:
+            lines.append(f"{indent}{rng.choice(['break', 'continue', '', '# note'])}")
+        else:
+            header = rng.choice([f"if {expression(rng)}:", f"while {expression(rng)}:",
+                                 f"for i in {expression(rng)}:", "def g(a, b):", "try:"])
+            lines.append(indent + header)
+            lines += statements(rng, indent + "    ", depth + 1)
+            if header == "try:":
+                lines.append(indent + "except:")
+                lines += statements(rng, indent + "    ", depth + 1)
+            elif header.startswith("if") and rng.random() < 0.5:
+                lines.append(indent + "else:")
+                lines += statements(rng, indent + "    ", depth + 1)
+    return lines
+
+
+def generated(seed):
+    rng = random.Random(seed)
+    code = "\n".join(statements(rng)) + "\n"
+    if seed % 2:
+        # Drop a character to exercise the error paths as well
+        cut = rng.randrange(len(code))
+        code = code[:cut] + code[cut + 1:]
+    return code
+
+
+@pytest.mark.parametrize("code", list(CASES.values()) + [open(path).read() for path in SAMPLES],
+                         ids=list(CASES) + [os.path.basename(path) for path in SAMPLES])
+def test_pratt_matches_lalr(code):
+    lalr, pratt = both(code)
+    assert "SyntaxError" not in lalr[:1]
+    assert pratt == lalr
+
+
+@pytest.mark.parametrize("code", ERRORS)
+def test_pratt_reports_the_same_syntax_errors(code):
+    lalr, pratt = both(code)
+    assert lalr[0] == "SyntaxError"
+    assert pratt == lalr
+
+
+# A dropped character can leave an invalid escape such as '\s' in a string
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("seed", range(0, 400, 40))
+def test_pratt_matches_lalr_on_generated_programs(capsys, seed):
+    for code in map(generated, range(seed, seed + 40)):
+        lalr, pratt = both(code, FastLexer if seed % 80 else None)
+        assert pratt == lalr, code
+    capsys.readouterr()
+
+
+def test_backend_is_selected_per_parse():
+    parser = CustomParser()
+    code = "x = 1 + 2\nprint(x)\n"
+    pratt = parser.parse(code, backend="pratt")
+    assert parser.parse(code, backend="pratt") is pratt
+    assert parser.parse(code) is not pratt
+    assert positioned(parser.parse(code)) == positioned(pratt)
+    with pytest.raises(ValueError, match="unknown parser backend"):
+        parser.parse(code, backend="earley")
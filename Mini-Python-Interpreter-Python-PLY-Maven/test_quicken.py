@@ -0,0 +1,116 @@
+import io
+import operator
+
+import pytest
+
+from src import quicken
+from src.interpreter import Interpreter
+from src.myparser import CustomParser
+from src.optimizer import clone
+from test_engines import PROGRAMS, SAMPLES
+from test_optimizer import program
+
+
+def run(ast, adaptive):
+    buf = io.StringIO()
+    interpreter = Interpreter(output_buffer=buf, adaptive=adaptive)
+    try:
+        interpreter.run(ast, "tree")
+    except Exception as e:
+        return (buf.getvalue(), f"Error: {e}"), interpreter.quickener
+    return (buf.getvalue(), None), interpreter.quickener
+
+
+def parse(code):
+    return CustomParser().parse(code)
+
+
+def test_matches_the_tree_walker():
+    sources = [open(path).read() for path in SAMPLES] + list(PROGRAMS.values())
+    sources += map(program, range(40))
+    for code in sources:
+        ast = parse(code)
+        expected = run(clone(ast), False)[0]
+        assert run(ast, True)[0] == expected
+        # Again with the sites quickened by the first run
+        assert run(ast, True)[0] == expected
+
+
+def test_hot_sites_are_specialized():
+    ast = parse("xs = [1, 2, 3]\ni = 0\nt = 0\nwhile i < 100:\n    t = t + xs[i % 3]\n    i = i + 1\nprint(-t)\n")
+    output, quickener = run(ast, True)
+    assert output == ("-199\n", None)
+    loop = ast[3]
+    assert loop.condition.site[0] is operator.lt
+    assert loop.body[0].expr.right.site[0] is quicken.index_list
+    assert ast[4].expr.site == 1
+    assert quickener.specialized == {"list[int]": 1, "< any types": 1, "+ any types": 2,
+                                     "% any types": 1}
+    assert quickener.misses == 0 and quickener.hit_rate == 1.0
+    # Only the index site has a guard, so only its runs make the hit rate
+    assert (quickener.guarded_runs, quickener.generic_runs) == (100 - quicken.WARMUP, 369)
+    assert quickener.warmup_runs == 5 * quicken.WARMUP + 1
+    assert "hits: " in quickener.report() and "list[int]: 1 site" in quickener.report()
+
+
+def test_recursive_calls_quicken_a_site_once():
+    output, quickener = run(parse(PROGRAMS["recursion"]), True)
+    assert output == ("144\n", None)
+    assert quickener.specialized == {"< any types": 1, "- any types": 2, "+ any types": 1}
+
+
+def test_guards_fall_back_and_sites_respecialize():
+    code = """
+def get(s, i):
+    return s[i]
+for i in range(10):
+    print(get([1, 2, 3], 1))
+for i in range(30):
+    print(get("abc", 1))
+try:
+    print(get([1], 5))
+except:
+    print("caught")
+"""
+    ast = parse(code)
+    expected = run(clone(ast), False)[0]
+    output, quickener = run(ast, True)
+    assert output == expected
+    assert quickener.misses == quicken.MISS_LIMIT + 1
+    assert quickener.hit_rate == quickener.hits / quickener.guarded_runs < 1
+    assert quickener.deoptimized == 1
+    assert quickener.specialized == {"list[int]": 1, "str[int]": 1}
+    assert ast[0].body[0].expr.site[0] is quicken.index_str
+
+
+def test_sites_give_up_on_specializing():
+    code = "def get(s):\n    return s[0]\nfor i in range(200):\n    print(get([1, 2]))\n    print(get(\"ab\"))\n"
+    output, quickener = run(parse(code), True)
+    assert output[0] == "1\na\n" * 200
+    assert quickener.deoptimized == quicken.DEOPT_LIMIT
+    assert quickener.specialized["[] any types"] == 1
+
+
+@pytest.mark.parametrize("code, error", [
+    ("i = 0\nwhile i < 20:\n    x = 10 / (5 - i)\n    i = i + 1\n", "Division by zero"),
+    ("xs = [1]\nfor i in range(20):\n    print(xs[i - 10])\n", "Index out of range"),
+    ("for i in range(20):\n    x = -i\nx = -\"a\"\n", "bad operand type for unary -: 'str'"),
+])
+def test_errors_stay_the_same(code, error):
+    ast = parse(code)
+    expected = run(clone(ast), False)[0]
+    assert expected[1] == f"Error: {error}"
+    assert run(ast, True)[0] == expected
+
+
+def test_quickened_trees_run_on_every_engine():
+    code = PROGRAMS["recursion"]
+    ast = parse(code)
+    expected, _ = run(clone(ast), False)
+    run(ast, True)
+    for engine in ["tree", "vm", "closure", "native"]:
+        buf = io.StringIO()
+        Interpreter(output_buffer=buf).run(ast, engine)
+        assert buf.getvalue() == expected[0]
+    assert ast[0].body[0].condition.site != 0
+    assert clone(ast)[0].body[0].condition.site == 0
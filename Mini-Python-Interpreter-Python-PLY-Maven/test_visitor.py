@@ -0,0 +1,132 @@
+import copy
+
+import pytest
+
+from src.ast_nodes import (Assign, BinaryOp, FunctionCall, Identifier, Number, UnaryOp,
+                           structural_hash)
+from src.icg_generator import generate_icg
+from src.myparser import CustomParser
+from src.optimizer import fold_constants
+from src.semantic_analyzer import semantic_analysis
+from src.unparse import unparse
+from src.visitor import CHILD_FIELDS, NodeTransformer, NodeVisitor, walk, walk_postorder
+from test_pratt import CASES, SAMPLES, generated
+
+
+def parse(code):
+    return CustomParser().parse(code)
+
+
+def test_child_fields_leave_out_plain_values():
+    assert CHILD_FIELDS[BinaryOp] == ('left', 'right')
+    assert CHILD_FIELDS[UnaryOp] == ('expr',)
+    assert CHILD_FIELDS[Number] == ()
+    assert CHILD_FIELDS[Identifier] == ()
+    assert CHILD_FIELDS[FunctionCall] == ('name', 'args')
+
+
+def test_dispatch_follows_the_mro():
+    class Names(NodeVisitor):
+        def __init__(self):
+            self.seen = []
+
+        def visit_Expression(self, node):
+            self.seen.append(type(node).__name__)
+            self.generic_visit(node)
+
+        def visit_Number(self, node):
+            self.seen.append(node.value)
+
+        def visit_NoneType(self, node):
+            self.seen.append(None)
+
+    names = Names()
+    names.visit(parse("x = -(1 + y)\n"))
+    names.visit(None)
+    assert names.seen == ['Identifier', 'UnaryOp', 'BinaryOp', 1, 'Identifier', None]
+    # Each visitor class has a table of its own
+    assert Names._dispatch[Number] is not NodeVisitor._dispatch[Number]
+    assert NodeVisitor._dispatch[Number] is NodeVisitor.generic_visit
+
+
+def test_walks_visit_every_node_of_deep_trees():
+    ast = parse("x = " + " + ".join(["1"] * 5000) + "\n")
+    preorder = list(walk(ast))
+    postorder = list(walk_postorder(ast))
+    assert len(preorder) == len(postorder) == 2 + 4999 + 5000
+    assert isinstance(preorder[0], Assign) and isinstance(preorder[1], Identifier)
+    assert postorder[-1] is preorder[0]
+    assert {id(node) for node in preorder} == {id(node) for node in postorder}
+
+
+def test_transformer_removes_and_splices_statements():
+    class Unroll(NodeTransformer):
+        def visit_Print(self, node):
+            return None
+
+        def visit_WhileLoop(self, node):
+            self.generic_visit(node)
+            return node.body + node.body
+
+    ast = parse("while c:\n    print(1)\n    x = 1\n    print(2)\ny = 2\n")
+    ast = Unroll().visit(ast)
+    assert [type(node).__name__ for node in ast] == ['Assign', 'Assign', 'Assign']
+    assert ast[0] is ast[1]
+
+
+def test_passes_keep_their_output():
+    ok, report = semantic_analysis(parse("x = 1\ny = x + \"a\"\nprint(z)\n"))
+    assert not ok
+    assert "Type mismatch in arithmetic operation '+': int and str" in report
+    assert "Undeclared variable: 'z'" in report
+    icg = generate_icg(parse("while n > 0:\n    n = n - 1\n"))
+    assert " 1 | L1:" in icg and "goto L1" in icg and "if t3 == False goto L2" in icg
+
+
+def test_icg_names_variables():
+    icg = generate_icg(parse("def f(n):\n    for i in n:\n        n[i] = i\nf(1)\n"))
+    assert "param n\n" in icg and "| i = t1\n" in icg
+    assert "t3 = n\n" in icg and "t3[t4] = t5\n" in icg
+    assert "= call f(t6)\n" in icg and "object at" not in icg
+    ok, report = semantic_analysis(parse("def f(n):\n    return n\n"))
+    assert ok and "  n: parameter" in report
+
+
+def sources():
+    yield from (open(path).read() for path in SAMPLES)
+    yield from CASES.values()
+    yield from (generated(seed) for seed in range(100))
+
+
+def test_unparse_round_trips():
+    for code in sources():
+        try:
+            ast = parse(code)
+        except SyntaxError:
+            continue
+        again = parse(unparse(ast) + "\n")
+        assert [structural_hash(node) for node in again] == [structural_hash(node) for node in ast]
+
+
+def test_unparse_indents_nested_blocks():
+    code = "def f(n):\n    for i in range(n):\n        if not i:\n            return\n"
+    assert unparse(parse(code)) == code.rstrip("\n")
+
+
+def test_fold_constants():
+    ast = parse("x = 2 * (3 + 4)\ny = -(1 + 1) / 0\nif True:\n    print(x)\nelse:\n    print(y)\n")
+    original = copy.deepcopy(ast)
+    folded = fold_constants(ast)
+    assert unparse(folded) == "x = 14\ny = (-2 / 0)\nprint(x)"
+    assert folded[0].expr.lineno == 1
+    assert [structural_hash(node) for node in ast] == [structural_hash(node) for node in original]
+
+
+def test_visualizer_draws_every_node():
+    pytest.importorskip("graphviz")
+    from src.utils import ASTVisualizer
+
+    ast = parse(CASES[sorted(CASES)[0]])
+    visualizer = ASTVisualizer()
+    visualizer.visualize(ast)
+    assert visualizer.dot.source.count("label=") >= sum(1 for _ in walk(ast))